@@ -0,0 +1,120 @@
+"""
+Requests per second and tail latency of a Flask route that logs an
+event and an access line per request, with no logging, with print() and
+with the queue pipeline of requestlog, while stdout drains slowly.
+
+python3 bench_logging.py
+"""
+import argparse
+import json
+import os
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+
+from flask import Flask, g, request
+
+from requestlog import setup_logging
+
+
+class SlowSink:
+    """
+    a pipe read `chunk` bytes at a time every `delay` seconds, like a
+    terminal or log shipper that cannot keep up
+    """
+    def __init__(self, chunk, delay):
+        read_fd, write_fd = os.pipe()
+        self.stream = os.fdopen(write_fd, "w", buffering=1)
+        self._reader = os.fdopen(read_fd, "rb", buffering=0)
+        self.received = 0
+        self._thread = threading.Thread(target=self._drain, args=(chunk, delay), daemon=True)
+        self._thread.start()
+
+    def _drain(self, chunk, delay):
+        while True:
+            data = self._reader.read(chunk)
+            if not data:
+                return
+            self.received += len(data)
+            time.sleep(delay)
+
+    def close(self):
+        self.stream.close()
+        self._thread.join()
+        self._reader.close()
+
+
+def make_app(mode, sink, queue_size):
+    app = Flask("bench_{}".format(mode))
+
+    if mode == "print":
+        @app.before_request
+        def start_timer():
+            g.request_started = time.perf_counter()
+
+        @app.after_request
+        def log_access(response):
+            print(json.dumps({"time": time.time(), "path": request.path, "status": response.status_code,
+                              "duration_ms": (time.perf_counter() - g.request_started) * 1000}))
+            return response
+    elif mode == "queue":
+        app.request_log = setup_logging(app, queue_size=queue_size, stream=sink.stream)
+
+    @app.route("/hello")
+    def hello_world():
+        if mode == "print":
+            print("Received a request on /hello!")
+        elif mode == "queue":
+            app.logger.info("Received a request on /hello!")
+        return "Hello World !"
+
+    return app
+
+
+def run(app, threads, requests):
+    local = threading.local()
+
+    def request_once(_):
+        if not hasattr(local, "client"):
+            local.client = app.test_client()
+        start = time.perf_counter()
+        local.client.get("/hello")
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        start = time.perf_counter()
+        latencies = sorted(executor.map(request_once, range(requests)))
+        elapsed = time.perf_counter() - start
+    return requests / elapsed, statistics.median(latencies) * 1000, latencies[int(len(latencies) * 0.99) - 1] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--queue-size", type=int, default=10000)
+    parser.add_argument("--chunk", type=int, default=4096, help="bytes stdout drains at a time")
+    parser.add_argument("--delay", type=float, default=0.002, help="seconds between drains")
+    options = parser.parse_args()
+
+    print("{} requests on {} threads, stdout drains {} bytes every {} s".format(
+        options.requests, options.threads, options.chunk, options.delay))
+    for mode in ("none", "print", "queue"):
+        sink = SlowSink(options.chunk, options.delay)
+        app = make_app(mode, sink, options.queue_size)
+        with redirect_stdout(sink.stream):
+            rate, median, p99 = run(app, options.threads, options.requests)
+        line = "{:<6} {:10.1f} req/s p50 {:7.3f} ms p99 {:7.3f} ms".format(mode, rate, median, p99)
+        if mode == "queue":
+            stats = app.request_log.stats()
+            line += " dropped {} queued {}".format(stats["dropped"], stats["queued"])
+            # writes out the backlog before the pipe closes
+            app.request_log.close()
+        print(line)
+        sink.close()
+
+
+if __name__ == "__main__":
+    main()
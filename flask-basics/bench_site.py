@@ -0,0 +1,77 @@
+"""
+Startup time of the /docs/ site by document count, rendered on one
+process and on the process pool, the time to pick up one edited file,
+and requests per second on a page.
+
+python3 bench_site.py
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+import content
+from bench_wow import load_app
+
+WORDS = ("flask route template markdown render cache request response header "
+         "python server process worker thread deploy").split()
+
+
+def write_tree(root, count, size):
+    random.seed(count)
+    for number in range(count):
+        directory = os.path.join(root, "section{}".format(number % 20))
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, "page{}.md".format(number)), "w", encoding="utf-8") as page:
+            page.write("## Page {}\n\n".format(number))
+            while page.tell() < size:
+                page.write(" ".join(random.choice(WORDS) for _ in range(40)) + "\n\n")
+                page.write("```python\nprint({})\n```\n\n- one\n- two\n\n".format(number))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--counts", default="100,1000,5000", help="document counts to build")
+    parser.add_argument("--size", type=int, default=4096, help="bytes per document")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="processes in the pool")
+    parser.add_argument("--requests", type=int, default=2000)
+    options = parser.parse_args()
+
+    print("{:>7} {:>12} {:>12} {:>14}".format("docs", "1 process s", "pool s", "1 edit ms"))
+    for count in map(int, options.counts.split(",")):
+        with tempfile.TemporaryDirectory() as root:
+            write_tree(root, count, options.size)
+            timings = []
+            for workers in (1, options.workers):
+                site = content.Site(root, workers=workers)
+                start = time.perf_counter()
+                site.build()
+                timings.append(time.perf_counter() - start)
+            path = os.path.join(root, "section0", "page0.md")
+            with open(path, "a", encoding="utf-8") as page:
+                page.write("\nedited\n")
+            start = time.perf_counter()
+            rendered, _ = site.refresh()
+            refresh = time.perf_counter() - start
+            if rendered != 1 or "edited" not in site.get("section0/page0").html:
+                raise SystemExit("the edit was not picked up")
+            print("{:>7} {:>12.2f} {:>12.2f} {:>14.2f}".format(count, timings[0], timings[1], refresh * 1000))
+
+    # the page route against a fresh tree
+    hello = load_app()
+    with tempfile.TemporaryDirectory() as root:
+        write_tree(root, 100, options.size)
+        hello.site = content.Site(root, workers=options.workers)
+        hello.site.build()
+        client = hello.app.test_client()
+        for label, url in (("page", "/docs/section3/page3"), ("missing", "/docs/section3/nope")):
+            start = time.perf_counter()
+            for _ in range(options.requests):
+                status = client.get(url).status_code
+            elapsed = time.perf_counter() - start
+            print("{:<8} {:10.1f} req/s status {}".format(label, options.requests / elapsed, status))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Requests per second on /wow with a 1 MB markdown file, rendered on every
+request as before, served from the rendered-document cache and
+revalidated with If-None-Match.
+
+python3 bench_wow.py
+"""
+import argparse
+import importlib.util
+import os
+import statistics
+import tempfile
+import time
+
+import markdown
+
+
+def load_app():
+    # hello-world.py is not importable by name
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "hello-world.py")
+    spec = importlib.util.spec_from_file_location("hello_world", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def write_document(path, size):
+    section = (
+        "## Section {0}\n\n"
+        "Some *emphasis*, some **strong** text and a [link](https://example.com/{0}) "
+        "in a paragraph long enough to wrap a few times in the browser window.\n\n"
+        "- first item\n- second item\n- third item\n\n"
+        "```python\ndef section_{0}():\n    return {0}\n```\n\n"
+    )
+    with open(path, "w", encoding="utf-8") as document:
+        number = 0
+        while document.tell() < size:
+            document.write(section.format(number))
+            number += 1
+
+
+def run(client, url, headers, seconds):
+    latencies = []
+    status = None
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds or len(latencies) < 3:
+        request_start = time.perf_counter()
+        response = client.get(url, headers=headers)
+        latencies.append(time.perf_counter() - request_start)
+        status = response.status_code
+    return len(latencies) / (time.perf_counter() - start), statistics.median(latencies) * 1000, status
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=1024 * 1024, help="bytes of markdown")
+    parser.add_argument("--seconds", type=float, default=5, help="seconds per mode")
+    options = parser.parse_args()
+
+    hello = load_app()
+    app = hello.app
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "README.md")
+        write_document(path, options.size)
+        app.config["WOW_DOCUMENT"] = path
+
+        @app.route("/wow-before")
+        def before():
+            with open(path, encoding="utf-8") as readme_file:
+                return markdown.markdown(readme_file.read(), extensions=["fenced_code"])
+
+        client = app.test_client()
+        etag = client.get("/wow").headers["ETag"]
+        print("{} bytes of markdown".format(os.path.getsize(path)))
+        for label, url, headers in (("before", "/wow-before", {}),
+                                    ("cached", "/wow", {}),
+                                    ("revalidate", "/wow", {"If-None-Match": etag})):
+            rate, median, status = run(client, url, headers, options.seconds)
+            print("{:<11} {:10.1f} req/s p50 {:8.3f} ms status {}".format(label, rate, median, status))
+
+        # an edit shows up once the stat interval has passed
+        with open(path, "a", encoding="utf-8") as document:
+            document.write("\n## Added\n")
+        time.sleep(app.config["MARKDOWN_STAT_INTERVAL"])
+        response = client.get("/wow", headers={"If-None-Match": etag})
+        if response.status_code != 200 or b"Added" not in response.data:
+            raise SystemExit("an edited document was not rendered again")
+        print("edited document rendered again after {} s".format(app.config["MARKDOWN_STAT_INTERVAL"]))
+
+
+if __name__ == "__main__":
+    main()
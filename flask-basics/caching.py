@@ -0,0 +1,105 @@
+"""
+Module: Response cache
+
+response_cache() keeps the 200 responses of a view in memory for `ttl`
+seconds, at most `max_size` of them with the least recently used going
+first. Responses are keyed on the path, the query string and the request
+headers named in `vary`. Every cache is listed in `caches` by view name
+with its hit and miss counts.
+"""
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, request
+
+# view name -> ResponseCache
+caches = {}
+
+
+class ResponseCache:
+    """
+    a ttl and size bounded lru of (body, status, headers)
+    """
+    def __init__(self, ttl, max_size):
+        self.ttl = ttl
+        self.max_size = max_size
+        # key -> (time.monotonic() it expires at, value), least recently used first
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evicted = 0
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= now:
+                del self._entries[key]
+                self.expired += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evicted += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "expired": self.expired,
+                "evicted": self.evicted,
+            }
+
+
+def response_cache(ttl=60, max_size=128, vary=()):
+    """
+    caches the GET and HEAD responses of the view it decorates, put it
+    below @app.route
+    """
+    def decorator(view):
+        cache = caches[view.__name__] = ResponseCache(ttl, max_size)
+
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return view(*args, **kwargs)
+            key = (request.path, request.query_string) + tuple(request.headers.get(header) for header in vary)
+            cached = cache.get(key)
+            state = "HIT"
+            if cached is None:
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code != 200 or response.is_streamed:
+                    return response
+                cached = (response.get_data(), response.status_code, list(response.headers.items()))
+                cache.set(key, cached)
+                state = "MISS"
+            body, status, headers = cached
+            # a response object is changed on the way out, every request gets its own
+            response = current_app.response_class(body, status=status, headers=headers)
+            response.headers["X-Cache"] = state
+            if vary:
+                response.vary.update(vary)
+            return response
+        wrapper.cache = cache
+        return wrapper
+    return decorator
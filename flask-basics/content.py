@@ -0,0 +1,151 @@
+"""
+Module: Markdown content engine
+
+Renders markdown files to html once and keeps the html in memory. Site
+pre-renders every .md file under a directory on a process pool, serves
+them by url from a dict, and a polling thread renders again only the
+files whose mtime or size changed.
+"""
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import markdown
+import markdown.extensions.fenced_code
+
+log = logging.getLogger("content")
+
+
+def render_file(path):
+    with open(path, encoding="utf-8") as markdown_file:
+        return markdown.markdown(markdown_file.read(), extensions=["fenced_code"])
+
+
+class RenderedDocument:
+    """
+    the html of a markdown file as of the file's mtime and size
+    """
+    def __init__(self, html, stat, checked=None):
+        self.html = html
+        self.mtime_ns = stat.st_mtime_ns
+        self.size = stat.st_size
+        self.etag = "{:x}-{:x}".format(stat.st_mtime_ns, stat.st_size)
+        self.last_modified = stat.st_mtime
+        # time.monotonic() the file was last stat'ed at
+        self.checked = checked
+
+    def matches(self, stat):
+        return (self.mtime_ns, self.size) == (stat.st_mtime_ns, stat.st_size)
+
+
+def url_name(relative_path):
+    """
+    the url of a markdown file relative to the site root, guide/intro.md
+    is served at guide/intro and guide/index.md at guide/
+    """
+    name = relative_path[:-len(".md")].replace(os.sep, "/")
+    if name == "index" or name.endswith("/index"):
+        return name[:-len("index")]
+    return name
+
+
+class Site:
+    """
+    every .md file under `root`, rendered to html, by url
+    """
+    def __init__(self, root, workers=None):
+        self.root = root
+        self.workers = workers or os.cpu_count() or 1
+        # url -> RenderedDocument, replaced as a whole so readers never lock
+        self.pages = {}
+        # relative path -> RenderedDocument
+        self._documents = {}
+        self._refresh_lock = threading.Lock()
+
+    def get(self, url):
+        return self.pages.get(url)
+
+    def scan(self):
+        """
+        relative path -> os.stat_result of every .md file under the root
+        """
+        found = {}
+        for directory, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                if filename.endswith(".md"):
+                    path = os.path.join(directory, filename)
+                    try:
+                        found[os.path.relpath(path, self.root)] = os.stat(path)
+                    except FileNotFoundError:
+                        # deleted while walking
+                        pass
+        return found
+
+    def render(self, relative_paths):
+        """
+        relative path -> html, on the process pool when there is more than
+        one file and more than one worker
+        """
+        paths = [os.path.join(self.root, relative_path) for relative_path in relative_paths]
+        if self.workers > 1 and len(paths) > 1:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(paths))) as pool:
+                chunksize = max(1, len(paths) // (self.workers * 4))
+                rendered = list(pool.map(render_file, paths, chunksize=chunksize))
+        else:
+            rendered = [render_file(path) for path in paths]
+        return dict(zip(relative_paths, rendered))
+
+    def refresh(self):
+        """
+        renders the new and changed files and drops the deleted ones,
+        returns (rendered, removed) counts
+        """
+        with self._refresh_lock:
+            found = self.scan()
+            changed = [relative_path for relative_path, stat in found.items()
+                       if relative_path not in self._documents or not self._documents[relative_path].matches(stat)]
+            removed = [relative_path for relative_path in self._documents if relative_path not in found]
+            if not changed and not removed:
+                return 0, 0
+            documents = dict(self._documents)
+            for relative_path in removed:
+                del documents[relative_path]
+            # stat'ed before reading, an edit made while rendering is picked up by the next refresh
+            for relative_path, html in self.render(changed).items():
+                documents[relative_path] = RenderedDocument(html, found[relative_path])
+            self._documents = documents
+            self.pages = {url_name(relative_path): document for relative_path, document in documents.items()}
+            return len(changed), len(removed)
+
+    def build(self):
+        """
+        renders the whole tree, returns a line reporting how long it took
+        """
+        start = time.perf_counter()
+        rendered, _ = self.refresh()
+        elapsed = time.perf_counter() - start
+        size = sum(document.size for document in self._documents.values())
+        return "rendered {} documents ({:.1f} MB) from {} in {:.2f} s, {:.2f} ms per document, {} workers".format(
+            rendered, size / 1e6, self.root, elapsed, elapsed * 1000 / max(rendered, 1), self.workers)
+
+    def poll(self, interval):
+        """
+        refreshes every `interval` seconds on a daemon thread
+        """
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    rendered, removed = self.refresh()
+                except Exception:
+                    # a half written file, the next poll tries again
+                    log.exception("refresh failed", extra={"root": self.root})
+                    continue
+                if rendered or removed:
+                    log.info("rendered changed documents",
+                             extra={"root": self.root, "rendered": rendered, "removed": removed})
+        thread = threading.Thread(target=run, name="site-poll", daemon=True)
+        thread.start()
+        return thread
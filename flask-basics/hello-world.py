@@ -1,23 +1,93 @@
-from flask import Flask, make_response, render_template
+from flask import Flask, abort, jsonify, make_response, render_template, request
 import os
-import markdown.extensions.fenced_code
-
-app = Flask(__name__)
+import threading
+import time
+import content
+from caching import caches, response_cache
+from requestlog import setup_logging
+
+app = Flask(__name__, template_folder="template")
+# the markdown file /wow serves
+app.config.setdefault("WOW_DOCUMENT", os.path.join(os.path.dirname(os.path.abspath(__file__)), "README.md"))
+# seconds a rendered document is served before its file is checked for changes again
+app.config.setdefault("MARKDOWN_STAT_INTERVAL", 1.0)
+# the tree of markdown files served under /docs/, rendered at startup on
+# DOCS_WORKERS processes (one per cpu by default) and checked for changes
+# every DOCS_POLL_INTERVAL seconds
+app.config.setdefault("DOCS_ROOT", os.path.join(os.path.dirname(os.path.abspath(__file__)), "docs"))
+app.config.setdefault("DOCS_WORKERS", None)
+app.config.setdefault("DOCS_POLL_INTERVAL", 2.0)
+# log records waiting for the log thread, past this they are dropped and counted
+app.config.setdefault("LOG_QUEUE_SIZE", 10000)
+
+request_log = setup_logging(app, queue_size=app.config["LOG_QUEUE_SIZE"], loggers=["content"])
 
 """
 Module: Return Markdown
 """
 
+_rendered = {}
+_render_lock = threading.Lock()
+
+
+def render_markdown(path):
+    """
+    the RenderedDocument of the markdown file at `path`, rendered again
+    only when the file's mtime or size changed, which is looked at no
+    more than every MARKDOWN_STAT_INTERVAL seconds
+    """
+    now = time.monotonic()
+    document = _rendered.get(path)
+    if document is not None and now - document.checked < app.config["MARKDOWN_STAT_INTERVAL"]:
+        return document
+    stat = os.stat(path)
+    if document is not None and document.matches(stat):
+        document.checked = now
+        return document
+    # one thread renders a changed file, the others wait for its result
+    with _render_lock:
+        document = _rendered.get(path)
+        if document is None or not document.matches(stat):
+            document = _rendered[path] = content.RenderedDocument(content.render_file(path), stat, now)
+        return document
+
+
+def document_response(document):
+    response = make_response(document.html)
+    response.set_etag(document.etag)
+    response.last_modified = document.last_modified
+    # browsers revalidate every time and get a 304 while the file is unchanged
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
 @app.route("/wow")
 def mark_my_words():
-    readme_file= open(os.path.join("README.md"), "r")
-    md_template_string = markdown.markdown(readme_file.read(), extensions=["fenced_code"])
-    return md_template_string
+    return document_response(render_markdown(app.config["WOW_DOCUMENT"]))
+
+
+"""
+Module: Markdown site
+"""
+
+site = content.Site(app.config["DOCS_ROOT"], workers=app.config["DOCS_WORKERS"])
+app.logger.info(site.build())
+site.poll(app.config["DOCS_POLL_INTERVAL"])
+
+
+@app.route("/docs/", defaults={"name": ""})
+@app.route("/docs/<path:name>")
+def docs(name):
+    document = site.get(name)
+    if document is None:
+        abort(404)
+    return document_response(document)
 
 
 @app.route("/hello")
+@response_cache(ttl=60)
 def hello_world():
-    print("Received a request on /hello!")
+    app.logger.info("Received a request on /hello!")
     return "Hello World !"
 
 
@@ -27,14 +97,16 @@ Module: Adding different routes
 
 
 @app.route("/goodbye")
+@response_cache(ttl=60)
 def goodbye():
-    print("Received a request on /goodbye")
+    app.logger.info("Received a request on /goodbye")
     return "Good Bye"
 
 """
 Module returning data
 """
 @app.route("/mdr")
+@response_cache(ttl=60)
 def made_up_response():
     user = {"id": "102522", "name": "Hashit"}
     response = make_response(
@@ -50,6 +122,7 @@ Module: responding with templates
 """    
 
 @app.route("/article-1")
+@response_cache(ttl=300)
 def article1():
     return render_template(
         'article.html',
@@ -63,17 +136,36 @@ Module: Implement Catch All Route
 """    
 
 
+# path -> view, the paths the catch all route hands on
+CATCH_ALL = {
+    "hello": hello_world,
+    "wow": mark_my_words,
+    "mdr": made_up_response,
+    "goodbye": goodbye,
+    "article-1": article1,
+}
+
+
 @app.route('/', defaults={"path": ""})
 @app.route('/<path:path>')
 def handle_request(path):
-    if path == 'hello':
-        return hello_world
-    elif path == 'wow':
-        return mark_my_words
-    elif path == 'mdr':
-        return made_up_response
-    elif path == 'goodbye':
-        return goodbye
-    else:
-        print(f'developer is looking for {path}, ended in catch all route')
-        return 'Welcome to Forest Unknown, Check your routes for any typos'
\ No newline at end of file
+    view = CATCH_ALL.get(path.strip("/"))
+    if view is None:
+        app.logger.debug("no route for %r, ended in catch all route", path)
+        return 'Welcome to Forest Unknown, Check your routes for any typos'
+    return view()
+
+
+"""
+Module: Cache hit rates
+"""
+
+
+@app.route("/cache-stats")
+def cache_stats():
+    return jsonify({name: cache.stats() for name, cache in caches.items()})
+
+
+@app.route("/log-stats")
+def log_stats():
+    return jsonify(request_log.stats())
@@ -0,0 +1,151 @@
+"""
+Module: Request logging
+
+JSON access and event logs written out by a background thread. Request
+threads only put records on a bounded queue, when the queue is full the
+record is dropped and counted instead of the request waiting on a slow
+stdout.
+"""
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+
+from flask import g, request
+from flask.logging import default_handler
+
+# attributes every LogRecord has, anything else was passed in extra=
+STANDARD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    one json object per record with the fields passed in extra=
+    """
+    def format(self, record):
+        entry = {
+            "time": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update((name, value) for name, value in vars(record).items() if name not in STANDARD_ATTRIBUTES)
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class JsonLinesHandler(logging.StreamHandler):
+    """
+    writes the records the listener takes off `log_queue` in batches, one
+    write for everything that was queued instead of one per record
+    """
+    def __init__(self, stream, log_queue, batch=1000):
+        super().__init__(stream)
+        self.setFormatter(JsonFormatter())
+        self.log_queue = log_queue
+        self.batch = batch
+        self._pending = []
+
+    def emit(self, record):
+        try:
+            self._pending.append(self.format(record))
+        except Exception:
+            self.handleError(record)
+        if len(self._pending) >= self.batch or self.log_queue.empty():
+            self.flush()
+
+    def flush(self):
+        self.acquire()
+        try:
+            if self._pending and self.stream is not None:
+                self.stream.write("\n".join(self._pending) + "\n")
+                self._pending.clear()
+            super().flush()
+        finally:
+            self.release()
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    a QueueHandler that never blocks, records that find the queue full
+    are counted in `dropped`
+    """
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+        # the QueueListener writing the records out, stopped on close
+        self.listener = None
+
+    def prepare(self, record):
+        # the queue stays in this process, the listener thread formats the
+        # record instead of the request thread copying and formatting it here
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+    def close(self):
+        # logging.shutdown() closes handlers at exit, what is still queued is written out first
+        listener, self.listener = self.listener, None
+        if listener is not None:
+            listener.stop()
+            for output in listener.handlers:
+                output.flush()
+        super().close()
+
+    def stats(self):
+        return {"queued": self.queue.qsize(), "max_size": self.queue.maxsize, "dropped": self.dropped}
+
+
+class QueueListener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self):
+        # the queue may be full, wait for room instead of failing to stop
+        self.queue.put(self._sentinel)
+
+
+def setup_logging(app, queue_size=10000, stream=None, loggers=()):
+    """
+    sends app.logger, its access child logger and `loggers` through a
+    queue of `queue_size` records to a thread writing json lines to
+    `stream` (stdout), logs every request with its timing, returns the
+    DroppingQueueHandler
+    """
+    log_queue = queue.Queue(maxsize=queue_size)
+    handler = DroppingQueueHandler(log_queue)
+    output = JsonLinesHandler(stream or sys.stdout, log_queue)
+    handler.listener = QueueListener(log_queue, output)
+    handler.listener.start()
+
+    # flask's own handler writes to stderr on the request thread
+    app.logger.removeHandler(default_handler)
+    for logger in [app.logger] + [logging.getLogger(name) for name in loggers]:
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    access = app.logger.getChild("access")
+
+    @app.before_request
+    def start_timer():
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def log_access(response):
+        access.info("request", extra={
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "bytes": response.content_length,
+            "duration_ms": round((time.perf_counter() - g.request_started) * 1000, 3),
+        })
+        return response
+
+    return handler
@@ -1,5 +1,6 @@
 from django.shortcuts import render
 from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+from portfolio.asyncdb import asgi_view
 from .forms import opportunityForm
 from .models import opportunity
 
@@ -19,13 +20,14 @@ def oppos(request):
         return render(request, 'opportunity/opportunity.html', {'opportunityForm': form})
 
 
-def conversation(request):
+def _conversation(request):
     convos = opportunity.objects.get_queryset().order_by('id')
     
     paginator = Paginator(convos, 5) 
     page_number = request.GET.get('page')
     paged_convos = paginator.get_page(page_number)
 
-    print(paginator)
+    return render(request, 'opportunity/conversation.html', {'convos': paged_convos})
 
-    return render(request, 'opportunity/conversation.html', {'convos': paged_convos})
\ No newline at end of file
+
+conversation = asgi_view(_conversation)
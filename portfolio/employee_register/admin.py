@@ -1,5 +1,8 @@
 from django.contrib import admin
 
+from portfolio.asyncdb import streaming_response
+
+from .bulk import export_rows
 from .models import Position, Employee
 
 # Register your models here.
@@ -11,3 +14,10 @@ class PositionAdmin(admin.ModelAdmin):
 @admin.register(Employee)
 class Employee(admin.ModelAdmin):
     list_display = ['fullname','emp_code','mobile','position']
+    actions = ['export_csv']
+
+    @admin.action(description='Export selected employees to CSV')
+    def export_csv(self, request, queryset):
+        response = streaming_response(request, export_rows(queryset), content_type='text/csv')
+        response['Content-Disposition'] = 'attachment; filename="employees.csv"'
+        return response
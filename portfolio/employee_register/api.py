@@ -0,0 +1,97 @@
+import json
+
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+
+from portfolio.asyncdb import streaming_response
+from portfolio.params import BadRequest, int_param, limit_param
+
+from .models import Employee, Position
+
+STREAM_CHUNK_SIZE = 2000
+
+# api field name -> queryset lookup
+EMPLOYEE_FIELDS = {
+    'id': 'id',
+    'fullname': 'fullname',
+    'emp_code': 'emp_code',
+    'mobile': 'mobile',
+    'position': 'position_id',
+    'position_name': 'position__position',
+}
+POSITION_FIELDS = {
+    'id': 'id',
+    'position': 'position',
+}
+
+
+def _selected_fields(request, fields):
+    names = [name for name in request.GET.get('fields', '').split(',') if name]
+    unknown = set(names) - set(fields)
+    if unknown:
+        raise BadRequest('unknown fields: {}'.format(', '.join(sorted(unknown))))
+    return names or list(fields)
+
+
+def _rows(queryset, names, fields):
+    """
+    plain dicts keyed by api field name, straight from values() so no
+    model instances are built
+    """
+    lookups = [fields[name] for name in names]
+    for row in queryset:
+        yield {name: row[lookup] for name, lookup in zip(names, lookups)}
+
+
+def _list(request, queryset, fields):
+    """
+    keyset paginated listing ordered by id, `after` is the last id of the
+    previous page so every page costs the same index range scan however
+    deep it is, with ?stream=1 the whole result goes out as ndjson
+    """
+    try:
+        names = _selected_fields(request, fields)
+        after = int_param(request, 'after')
+        limit = limit_param(request)
+    except BadRequest as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
+    if after is not None:
+        queryset = queryset.filter(id__gt=after)
+    # id is always read so the next page can be keyed on it
+    lookups = set(fields[name] for name in names) | {'id'}
+    queryset = queryset.order_by('id').values(*lookups)
+
+    if request.GET.get('stream') == '1':
+        lines = (json.dumps(row) + '\n'
+                 for row in _rows(queryset.iterator(chunk_size=STREAM_CHUNK_SIZE), names, fields))
+        return streaming_response(request, lines, content_type='application/x-ndjson')
+
+    page = list(queryset[:limit + 1])
+    next_url = None
+    if len(page) > limit:
+        page = page[:limit]
+        params = request.GET.copy()
+        params['after'] = page[-1]['id']
+        next_url = '{}?{}'.format(request.path, params.urlencode())
+    return JsonResponse({'results': list(_rows(page, names, fields)), 'next': next_url})
+
+
+@require_GET
+def employee_list(request):
+    employees = Employee.objects.all()
+    try:
+        position = int_param(request, 'position')
+    except BadRequest as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
+    if position is not None:
+        employees = employees.filter(position_id=position)
+    if request.GET.get('position_name'):
+        employees = employees.filter(position__position=request.GET['position_name'])
+    if request.GET.get('emp_code'):
+        employees = employees.filter(emp_code=request.GET['emp_code'])
+    return _list(request, employees, EMPLOYEE_FIELDS)
+
+
+@require_GET
+def position_list(request):
+    return _list(request, Position.objects.all(), POSITION_FIELDS)
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class EmployeeRegisterConfig(AppConfig):
     name = 'employee_register'
+
+    def ready(self):
+        from . import signals
@@ -0,0 +1,174 @@
+import csv
+
+from django.core.exceptions import ValidationError
+from django.db import connections, transaction
+
+from .choices import bump_version
+from .forms import EmployeeForm
+from .models import Employee, Position
+
+CSV_FIELDS = ['fullname', 'emp_code', 'mobile', 'position']
+BATCH_SIZE = 5000
+# columns an import rewrites on a known emp_code
+UPDATE_FIELDS = ['fullname', 'mobile', 'position_id']
+
+
+class PositionCache:
+    """
+    maps position names to ids, loaded once and filled in bulk so a
+    whole import never looks up a position row by row
+    """
+    def __init__(self):
+        self.ids = dict(Position.objects.values_list('position', 'id'))
+
+    def resolve(self, names):
+        missing = {name for name in names if name not in self.ids}
+        if missing:
+            Position.objects.bulk_create([Position(position=name) for name in missing])
+            self.ids.update(Position.objects.filter(position__in=missing)
+                            .values_list('position', 'id'))
+            # bulk_create skips the post_save signal
+            transaction.on_commit(bump_version)
+        return self.ids
+
+
+def clean_row(row):
+    """
+    runs the EmployeeForm field validation for a csv row, the position
+    is only checked for presence since it is resolved by name in bulk
+    """
+    fields = EmployeeForm.base_fields
+    errors = {}
+    cleaned = {}
+    for name in ('fullname', 'emp_code', 'mobile'):
+        try:
+            cleaned[name] = fields[name].clean((row.get(name) or '').strip())
+        except ValidationError as exc:
+            errors[name] = exc.messages
+    if not cleaned.get('emp_code') and 'emp_code' not in errors:
+        errors['emp_code'] = ['Employee code is required to import a row.']
+    position = (row.get('position') or '').strip()
+    if not position:
+        errors['position'] = ['This field is required.']
+    cleaned['position'] = position
+    return cleaned, errors
+
+
+def update_employees(employees):
+    """
+    writes UPDATE_FIELDS of `employees` by id, on SQLite as one
+    UPDATE ... FROM a VALUES list per BATCH_SIZE rows since bulk_update's
+    CASE expression per row and column is far too slow there at import
+    sizes, everywhere else, PostgreSQL included, with bulk_update
+    """
+    connection = connections[Employee.objects.db]
+    if connection.vendor != 'sqlite':
+        Employee.objects.bulk_update(employees, UPDATE_FIELDS, batch_size=BATCH_SIZE)
+        return
+    quote = connection.ops.quote_name
+    columns = ['id'] + UPDATE_FIELDS
+    sql = 'WITH v ({}) AS (VALUES {{}}) UPDATE {} SET {} FROM v WHERE {}.id = v.id'.format(
+        ', '.join(map(quote, columns)), quote(Employee._meta.db_table),
+        ', '.join('{0} = v.{0}'.format(quote(column)) for column in UPDATE_FIELDS),
+        quote(Employee._meta.db_table))
+    row = '({})'.format(', '.join(['%s'] * len(columns)))
+    with connection.cursor() as cursor:
+        for start in range(0, len(employees), BATCH_SIZE):
+            chunk = employees[start:start + BATCH_SIZE]
+            cursor.execute(sql.format(', '.join([row] * len(chunk))),
+                           [getattr(employee, column) for employee in chunk for column in columns])
+
+
+@transaction.atomic
+def _write_batch(rows, positions):
+    """
+    rows are (line number, cleaned row) tuples, returns (created, updated,
+    errors), a code more than one stored employee has is not unique to
+    update by so its rows are errors
+    """
+    position_ids = positions.resolve({row['position'] for _, row in rows})
+    existing = {}
+    duplicated = set()
+    for emp_code, *values in (Employee.objects.filter(emp_code__in=[row['emp_code'] for _, row in rows])
+                              .values_list('emp_code', 'id', *UPDATE_FIELDS)):
+        if emp_code in existing:
+            duplicated.add(emp_code)
+        existing[emp_code] = values
+    to_create = {}
+    to_update = {}
+    errors = []
+    for line, row in rows:
+        if row['emp_code'] in duplicated:
+            errors.append((line, {'emp_code': ['More than one employee has this code, '
+                                               'remove the duplicates before importing it.']}))
+            continue
+        employee = Employee(fullname=row['fullname'], emp_code=row['emp_code'],
+                            mobile=row['mobile'], position_id=position_ids[row['position']])
+        if row['emp_code'] in existing:
+            employee.pk, *stored = existing[row['emp_code']]
+            # a row the file repeats unchanged is not written again
+            if stored != [getattr(employee, field) for field in UPDATE_FIELDS]:
+                to_update[row['emp_code']] = employee
+            else:
+                to_update.pop(row['emp_code'], None)
+        else:
+            to_create[row['emp_code']] = employee
+    # updated in place, delete signals and on_delete cascades never run
+    update_employees(list(to_update.values()))
+    Employee.objects.bulk_create(list(to_create.values()), batch_size=BATCH_SIZE)
+    return len(to_create), len(to_update), errors
+
+
+def import_employees(csv_file, batch_size=BATCH_SIZE):
+    """
+    streams employees from a csv file, rows are keyed on emp_code so a
+    known code updates the existing employee instead of adding another
+    and a row matching what is stored is skipped, a code shared by several
+    stored employees is reported instead of updating one of them,
+    returns (created, updated, errors) where errors is a list of
+    (line number, error dict) tuples
+    """
+    positions = PositionCache()
+    created = updated = 0
+    errors = []
+    batch = []
+    for line, row in enumerate(csv.DictReader(csv_file), start=2):
+        cleaned, row_errors = clean_row(row)
+        if row_errors:
+            errors.append((line, row_errors))
+            continue
+        batch.append((line, cleaned))
+        if len(batch) >= batch_size:
+            c, u, e = _write_batch(batch, positions)
+            created, updated = created + c, updated + u
+            errors.extend(e)
+            batch = []
+    if batch:
+        c, u, e = _write_batch(batch, positions)
+        created, updated = created + c, updated + u
+        errors.extend(e)
+    errors.sort(key=lambda error: error[0])
+    return created, updated, errors
+
+
+class Echo:
+    """
+    pseudo buffer for csv.writer, hands each row back instead of storing it
+    """
+    def write(self, value):
+        return value
+
+
+def export_rows(queryset=None):
+    """
+    yields csv lines for employees, a header first, reading the table
+    through an iterator so memory stays flat on large tables
+    """
+    if queryset is None:
+        queryset = Employee.objects.all()
+    writer = csv.writer(Echo())
+    yield writer.writerow(CSV_FIELDS)
+    rows = queryset.order_by('id').values_list('fullname', 'emp_code', 'mobile',
+                                               'position__position')
+    for row in rows.iterator(chunk_size=BATCH_SIZE):
+        yield writer.writerow(row)
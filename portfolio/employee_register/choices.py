@@ -0,0 +1,22 @@
+from portfolio.versioning import ProcessCache, Version
+
+from .models import Position
+
+version = Version('employee_register:positions:version')
+# marks every worker's copy of the position choices stale
+bump_version = version.bump
+
+
+def load():
+    return list(Position.objects.order_by('pk').values_list('pk', 'position'))
+
+
+_choices = ProcessCache(version, load)
+
+
+def position_choices():
+    """
+    (id, name) pairs for the position select, rebuilt from the table only
+    when the shared version has moved since this process last read it
+    """
+    return _choices.get()
@@ -1,8 +1,12 @@
 from django import forms
 
+from .choices import position_choices
 from .models import Employee
 
 class EmployeeForm(forms.ModelForm):
+    # render the position select from the cached choices instead of
+    # querying the whole Position table on every render
+    use_cached_choices = True
 
     class Meta:
         model = Employee
@@ -16,3 +20,5 @@ class EmployeeForm(forms.ModelForm):
         super(EmployeeForm, self).__init__(*args, **kwargs)
         self.fields['position'].empty_label = "Select Position"
         self.fields['emp_code'].required = False
+        if self.use_cached_choices:
+            self.fields['position'].choices = [('', "Select Position")] + position_choices()
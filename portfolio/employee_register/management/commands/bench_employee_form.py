@@ -0,0 +1,33 @@
+import time
+
+from django.core.management import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from employee_register.forms import EmployeeForm
+
+
+class Command(BaseCommand):
+    # Show this when the user types help
+    help = "Times EmployeeForm rendering with and without the cached position choices"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--renders', type=int, default=500)
+
+    def render(self, renders):
+        EmployeeForm().as_p()
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            for _ in range(renders):
+                EmployeeForm().as_p()
+            elapsed = time.perf_counter() - start
+        return elapsed / renders * 1000, len(queries) / renders
+
+    def handle(self, *args, **options):
+        renders = options['renders']
+        for cached in (False, True):
+            EmployeeForm.use_cached_choices = cached
+            ms, queries = self.render(renders)
+            self.stdout.write('{:<10} {:8.3f} ms/render {:6.2f} queries/render'.format(
+                'cached' if cached else 'uncached', ms, queries))
+        EmployeeForm.use_cached_choices = True
@@ -0,0 +1,20 @@
+import sys
+
+from django.core.management import BaseCommand
+
+from employee_register.bulk import export_rows
+
+
+class Command(BaseCommand):
+    # Show this when the user types help
+    help = "Streams every employee to a csv file, or stdout when no path is given"
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_path', nargs='?')
+
+    def handle(self, *args, **options):
+        if options['csv_path']:
+            with open(options['csv_path'], 'w', newline='', encoding='utf-8') as csv_file:
+                csv_file.writelines(export_rows())
+        else:
+            sys.stdout.writelines(export_rows())
@@ -0,0 +1,24 @@
+from django.core.management import BaseCommand, CommandError
+
+from employee_register.bulk import BATCH_SIZE, import_employees
+
+
+class Command(BaseCommand):
+    # Show this when the user types help
+    help = "Creates or updates employees from a csv file keyed on emp_code"
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_path', help='csv with fullname,emp_code,mobile,position columns')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            csv_file = open(options['csv_path'], newline='', encoding='utf-8')
+        except OSError as exc:
+            raise CommandError(exc)
+        with csv_file:
+            created, updated, errors = import_employees(csv_file, options['batch_size'])
+        for line, row_errors in errors:
+            self.stderr.write('line {}: {}'.format(line, row_errors))
+        self.stdout.write('Created {}, updated {}, skipped {} employees'.format(
+            created, updated, len(errors)))
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.25 on 2026-10-19 08:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee_register', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='employee',
+            name='emp_code',
+            field=models.CharField(db_index=True, max_length=3),
+        ),
+    ]
@@ -9,6 +9,6 @@ class Position(models.Model):
 
 class Employee(models.Model):
     fullname = models.CharField(max_length=100)
-    emp_code = models.CharField(max_length=3)
+    emp_code = models.CharField(max_length=3, db_index=True)
     mobile = models.CharField(max_length=15)
     position = models.ForeignKey(Position, on_delete=models.CASCADE)    
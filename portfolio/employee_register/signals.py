@@ -0,0 +1,13 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .choices import bump_version
+from .models import Position
+
+
+@receiver(post_save, sender=Position)
+@receiver(post_delete, sender=Position)
+def position_changed(sender, **kwargs):
+    # only once committed, so no worker can cache the old rows under the new version
+    transaction.on_commit(bump_version)
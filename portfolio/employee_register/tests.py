@@ -1,3 +1,117 @@
+import io
+import json
+from unittest import mock
+from urllib.parse import urlencode
+
+from django.contrib.auth.models import User
+from django.core.handlers.asgi import ASGIHandler
+from django.middleware.csrf import _get_new_csrf_token
+from django.db import connection
 from django.test import TestCase
 
+from . import bulk
+from .models import Employee, Position
+
 # Create your tests here.
+
+class ASGIStreamingTests(TestCase):
+    """
+    the streamed exports served by Django's ASGI handler, not the test
+    client, which reads streaming bodies in a thread of its own
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        position = Position.objects.create(position='Engineer')
+        Employee.objects.bulk_create([
+            Employee(fullname='Employee {}'.format(i), emp_code='{:03}'.format(i),
+                     mobile='555', position=position)
+            for i in range(25)
+        ])
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+
+    def setUp(self):
+        # the database is not reachable from the async tests themselves
+        self.client.force_login(self.admin)
+        self.session = self.client.cookies['sessionid'].value
+        self.ids = list(Employee.objects.order_by('id').values_list('id', flat=True))
+
+    async def request(self, method, path, query='', body=b'', headers=()):
+        messages = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': body, 'more_body': False}
+
+        async def send(message):
+            messages.append(message)
+
+        await ASGIHandler()({
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+            'method': method, 'scheme': 'http', 'path': path, 'raw_path': path.encode(),
+            'query_string': query.encode(), 'root_path': '',
+            'headers': [(b'host', b'testserver')] + list(headers),
+            'client': ('127.0.0.1', 0), 'server': ('testserver', 80),
+        }, receive, send)
+        status = messages[0]['status']
+        return status, b''.join(message.get('body', b'') for message in messages[1:])
+
+    async def test_employee_stream(self):
+        status, body = await self.request('GET', '/api/employees', 'stream=1&fields=emp_code')
+        self.assertEqual(status, 200)
+        rows = [json.loads(line) for line in body.decode().splitlines()]
+        self.assertEqual(rows, [{'emp_code': '{:03}'.format(i)} for i in range(25)])
+
+    async def test_admin_csv_export(self):
+        token = _get_new_csrf_token()
+        cookies = 'sessionid={}; csrftoken={}'.format(self.session, token)
+        body = urlencode([
+            ('csrfmiddlewaretoken', token), ('action', 'export_csv'), ('index', '0'),
+        ] + [('_selected_action', pk) for pk in self.ids])
+        status, content = await self.request(
+            'POST', '/admin/employee_register/employee/', body=body.encode(), headers=[
+                (b'cookie', cookies.encode()),
+                (b'content-type', b'application/x-www-form-urlencoded'),
+            ])
+        self.assertEqual(status, 200)
+        lines = content.decode().splitlines()
+        self.assertEqual(len(lines), 26)
+        self.assertEqual(lines[1], 'Employee 0,000,555,Engineer')
+
+
+class ImportEmployeesTests(TestCase):
+    def setUp(self):
+        self.engineer = Position.objects.create(position='Engineer')
+
+    def employee(self, fullname, emp_code):
+        return Employee.objects.create(fullname=fullname, emp_code=emp_code, mobile='555',
+                                       position=self.engineer)
+
+    def run_import(self, *lines):
+        csv_file = io.StringIO('\n'.join(('fullname,emp_code,mobile,position',) + lines) + '\n')
+        return bulk.import_employees(csv_file)
+
+    def test_known_codes_update_in_place(self):
+        kept = self.employee('Ann', '001')
+        created, updated, errors = self.run_import('Ann Lee,001,556,Manager', 'Bob,002,557,Engineer')
+        self.assertEqual((created, updated, errors), (1, 1, []))
+        kept.refresh_from_db()
+        self.assertEqual((kept.fullname, kept.mobile, kept.position.position),
+                         ('Ann Lee', '556', 'Manager'))
+
+    def test_bulk_update_path(self):
+        # the path of every backend but SQLite
+        kept = self.employee('Ann', '001')
+        with mock.patch.object(connection, 'vendor', 'postgresql'):
+            self.assertEqual(self.run_import('Ann Lee,001,556,Engineer'), (0, 1, []))
+        kept.refresh_from_db()
+        self.assertEqual((kept.fullname, kept.mobile), ('Ann Lee', '556'))
+
+    def test_duplicated_code_is_reported(self):
+        self.employee('Ann', '001')
+        self.employee('Bob', '001')
+        created, updated, errors = self.run_import('Ann Lee,001,556,Engineer', 'Cid,003,557,Engineer')
+        self.assertEqual((created, updated), (1, 0))
+        self.assertEqual([line for line, _ in errors], [2])
+        self.assertIn('emp_code', errors[0][1])
+        self.assertEqual(set(Employee.objects.filter(emp_code='001').values_list('fullname', flat=True)),
+                         {'Ann', 'Bob'})
@@ -1,14 +1,21 @@
+from django.db import transaction
+from django.http import JsonResponse
 from django.shortcuts import render, redirect
+from django.views.decorators.http import require_POST
+from portfolio.asyncdb import asgi_view
 from .forms import EmployeeForm
-from .models import Employee
+from .models import Employee, Position
 
 # Create your views here.
-def employee_get(request):
+def _employee_get(request):
     context = {
-        'employee_list': Employee.objects.all(),
+        # the list shows every employee's position
+        'employee_list': Employee.objects.select_related('position'),
     }
     return render(request, "emp_reg/emp_list.html", context)
 
+employee_get = asgi_view(_employee_get)
+
 def employee_add(request, id=0):
     if request.method == 'GET':
         if id == 0:
@@ -31,3 +38,36 @@ def employee_delete(request, id):
     employee = Employee.objects.get(pk=id)
     employee.delete()
     return redirect('empget')
+
+
+def _posted_ids(request):
+    """
+    ids from a repeated `ids` field, a comma separated value is also accepted
+    """
+    ids = []
+    for value in request.POST.getlist('ids'):
+        ids.extend(part for part in value.split(',') if part.strip())
+    return [int(part) for part in ids]
+
+@require_POST
+def employee_bulk_delete(request):
+    try:
+        ids = _posted_ids(request)
+    except ValueError:
+        return JsonResponse({'error': 'ids must be integers'}, status=400)
+    with transaction.atomic():
+        deleted, _ = Employee.objects.filter(pk__in=ids).delete()
+    return JsonResponse({'deleted': deleted})
+
+@require_POST
+def employee_bulk_update(request):
+    try:
+        ids = _posted_ids(request)
+        position_id = int(request.POST.get('position', ''))
+    except ValueError:
+        return JsonResponse({'error': 'ids and position must be integers'}, status=400)
+    with transaction.atomic():
+        if not Position.objects.filter(pk=position_id).exists():
+            return JsonResponse({'error': 'unknown position'}, status=400)
+        updated = Employee.objects.filter(pk__in=ids).update(position_id=position_id)
+    return JsonResponse({'updated': updated})
@@ -0,0 +1,100 @@
+"""
+Full response caching for the public job pages.
+
+Every cached page is keyed on a version of the Job table that signals
+replace whenever a job or its image renditions change, so a stale page
+is never served and nothing has to be deleted, and on the build id so
+a deploy does not serve pages of the old templates. The ETag is derived
+from the same versions, a browser or proxy revalidating gets a 304
+without the view, the template or the database being touched.
+"""
+
+import asyncio
+import hashlib
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response, patch_cache_control
+
+from portfolio.versioning import Version, build_id
+
+# seconds a browser or reverse proxy may reuse a page before revalidating
+MAX_AGE = getattr(settings, 'JOBS_PAGE_MAX_AGE', 60)
+# seconds a rendered page is kept, versions make it unreachable much sooner on a change
+TIMEOUT = 24 * 3600
+
+version = Version('jobs:version')
+# marks every cached page stale
+bump_version = version.bump
+current_version = version.current
+
+
+def _lookup(request):
+    """
+    (etag, cache key, response), the response is a 304 or the cached
+    page, None when the view has to run
+    """
+    path = request.get_full_path()
+    tag = hashlib.md5('{}:{}:{}'.format(build_id(), current_version(), path).encode()).hexdigest()
+    etag = '"{}"'.format(tag)
+    key = 'jobs:page:' + tag
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = cache.get(key)
+    return etag, key, response
+
+
+def _cacheable(response):
+    return response.status_code == 200 and not response.streaming
+
+
+def _store(key, response):
+    if hasattr(response, 'render'):
+        response.render()
+    cache.set(key, response, TIMEOUT)
+
+
+def _finish(response, etag):
+    response['ETag'] = etag
+    patch_cache_control(response, public=True, max_age=MAX_AGE)
+    return response
+
+
+def cache_on_jobs(view):
+    """
+    serves GET and HEAD requests for `view` from the cache while the Job
+    table is unchanged, only 200 responses are stored, async views get
+    an async wrapper that reads and writes the cache off the event loop
+    """
+    if asyncio.iscoroutinefunction(view):
+        # file cache reads and writes, any thread will do
+        lookup = sync_to_async(_lookup, thread_sensitive=False)
+        store = sync_to_async(_store, thread_sensitive=False)
+
+        @wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return await view(request, *args, **kwargs)
+            etag, key, response = await lookup(request)
+            if response is None:
+                response = await view(request, *args, **kwargs)
+                if not _cacheable(response):
+                    return response
+                await store(key, response)
+            return _finish(response, etag)
+        return async_wrapper
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return view(request, *args, **kwargs)
+        etag, key, response = _lookup(request)
+        if response is None:
+            response = view(request, *args, **kwargs)
+            if not _cacheable(response):
+                return response
+            _store(key, response)
+        return _finish(response, etag)
+    return wrapper
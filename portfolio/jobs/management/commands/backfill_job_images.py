@@ -0,0 +1,36 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.core.management import BaseCommand
+
+from jobs.caching import bump_version
+from jobs.models import Job
+from jobs.renditions import generate, is_rendered
+
+
+class Command(BaseCommand):
+    # Show this when the user types help
+    help = "Generates the srcset renditions for existing Job images"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count())
+        parser.add_argument('--force', action='store_true', help='regenerate existing renditions')
+
+    def handle(self, *args, **options):
+        names = set(Job.objects.exclude(image='').values_list('image', flat=True))
+        if not options['force']:
+            names = {name for name in names if not is_rendered(name)}
+        written = failed = 0
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            futures = {executor.submit(generate, name): name for name in names}
+            for future in as_completed(futures):
+                try:
+                    written += future.result()
+                except (OSError, ValueError) as exc:
+                    failed += 1
+                    self.stderr.write('{}: {}'.format(futures[future], exc))
+        if names:
+            # cached pages still point at the originals
+            bump_version()
+        self.stdout.write('Rendered {} images ({} bytes), {} failed'.format(
+            len(names) - failed, written, failed))
@@ -0,0 +1,71 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management import BaseCommand
+from django.urls import path
+
+from jobs import views
+from jobs.caching import bump_version
+from jobs.models import Job
+from portfolio import urls
+from portfolio.benchmarks import bench_server, fetch, opener, summary
+
+BENCH_ROLE = 'Bench role'
+
+# the project's urls, the templates reverse them, plus the page without its cache
+urlpatterns = [
+    path('uncached', views._experience),
+] + urls.urlpatterns
+
+MODES = [
+    # (label, url, invalidate before every request, send the etag back)
+    ('uncached', 'uncached', False, False),
+    ('cold cache', '', True, False),
+    ('warm cache', '', False, False),
+    ('revalidate', '', False, True),
+]
+
+
+class Command(BaseCommand):
+    # Show this when the user types help
+    help = "Requests per second on the experience page, uncached and with a cold and warm page cache"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--requests', type=int, default=400)
+        parser.add_argument('--jobs', type=int, default=30,
+                            help='jobs to have in the table, missing ones are created')
+
+    def run(self, base, label, url, invalidate, revalidate, options):
+        url = '{}/{}'.format(base, url)
+        headers = {}
+        with opener.open(url) as response:
+            if revalidate:
+                headers['If-None-Match'] = response.headers['ETag']
+
+        def request(_):
+            if invalidate:
+                bump_version()
+            return fetch(url, headers)
+
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+            start = time.perf_counter()
+            results = list(executor.map(request, range(options['requests'])))
+            elapsed = time.perf_counter() - start
+        statuses = sorted({status for _, status, _ in results})
+        self.stdout.write('{:<11} {} status {}'.format(
+            label, summary([latency for latency, _, _ in results], elapsed), statuses))
+
+    def handle(self, *args, **options):
+        Job.objects.bulk_create([
+            Job(roleName='{} {}'.format(BENCH_ROLE, i), roleKeySkills='python, django',
+                roleLocation='Remote', roleDescription='benchmark job ' * 20)
+            for i in range(Job.objects.count(), options['jobs'])
+        ])
+        try:
+            with bench_server(__name__) as base:
+                for mode in MODES:
+                    self.run(base, *mode, options)
+        finally:
+            Job.objects.filter(roleName__startswith=BENCH_ROLE).delete()
+            bump_version()
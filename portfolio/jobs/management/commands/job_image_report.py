@@ -0,0 +1,27 @@
+from django.core.files.storage import default_storage
+from django.core.management import BaseCommand
+
+from jobs.models import Job
+from jobs.renditions import FORMATS, WIDTHS, rendition_name
+
+
+class Command(BaseCommand):
+    # Show this when the user types help
+    help = "Reports image bytes per home page load, originals against each rendition"
+
+    def handle(self, *args, **options):
+        names = [name for name in Job.objects.values_list('image', flat=True) if name]
+        original = sum(default_storage.size(name) for name in names)
+        self.stdout.write('{} job images on the home page'.format(len(names)))
+        self.stdout.write('{:<14} {:>12}'.format('original', original))
+        for fmt in FORMATS:
+            for width in WIDTHS:
+                try:
+                    total = sum(default_storage.size(rendition_name(name, width, fmt))
+                                for name in names)
+                except OSError:
+                    self.stdout.write('{:<14} {:>12}'.format('{} {}w'.format(fmt, width), 'missing'))
+                    continue
+                saved = original - total
+                self.stdout.write('{:<14} {:>12} saves {} bytes ({:.0%})'.format(
+                    '{} {}w'.format(fmt, width), total, saved, saved / original if original else 0))
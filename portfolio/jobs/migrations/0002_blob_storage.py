@@ -0,0 +1,19 @@
+# Generated by Django 3.2.25 on 2026-10-19 08:56
+
+from django.db import migrations, models
+import portfolio.storage
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='job',
+            name='image',
+            field=models.ImageField(storage=portfolio.storage.ContentAddressedStorage(), upload_to='images/'),
+        ),
+    ]
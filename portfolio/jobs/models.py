@@ -1,8 +1,10 @@
 from django.db import models
 
+from portfolio.storage import blob_storage
+
 # Create your models here.
 class Job(models.Model):
-    image = models.ImageField(upload_to='images/')
+    image = models.ImageField(upload_to='images/', storage=blob_storage)
     roleName = models.CharField(max_length=100)
     roleKeySkills = models.CharField(max_length=100)
     roleLocation = models.CharField(max_length=100)
@@ -0,0 +1,78 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, features
+
+# widths offered in srcset, the card grid is at most a third of a 1320px container
+WIDTHS = (320, 640, 960)
+FORMATS = ('webp', 'jpeg') if features.check('webp') else ('jpeg',)
+QUALITY = 80
+
+# pillow drops the gil while resizing and encoding so threads are enough
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='renditions')
+_pending = set()
+
+
+def rendition_name(name, width, fmt):
+    """
+    images/app.jpg -> images/app.640w.webp, stored next to the original
+    """
+    root, _ = os.path.splitext(name)
+    return '{}.{}w.{}'.format(root, width, 'jpg' if fmt == 'jpeg' else fmt)
+
+
+def rendition_names(name):
+    return [rendition_name(name, width, fmt) for fmt in FORMATS for width in WIDTHS]
+
+
+def is_rendered(name, storage=default_storage):
+    # the last rendition written is the marker for a complete set
+    return storage.exists(rendition_names(name)[-1])
+
+
+def generate(name, storage=default_storage):
+    """
+    writes every width and format for one original, never upscaling,
+    returns the total bytes written
+    """
+    with storage.open(name, 'rb') as original:
+        image = Image.open(original)
+        image.load()
+    if image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+    written = 0
+    for fmt in FORMATS:
+        for width in WIDTHS:
+            resized = image.copy()
+            resized.thumbnail((width, width * 10), Image.LANCZOS)
+            buffer = BytesIO()
+            resized.save(buffer, fmt.upper(), quality=QUALITY, optimize=True)
+            target = rendition_name(name, width, fmt)
+            if storage.exists(target):
+                storage.delete(target)
+            storage.save(target, ContentFile(buffer.getvalue()))
+            written += buffer.tell()
+    return written
+
+
+def _generate_and_release(name):
+    try:
+        if not is_rendered(name):
+            return generate(name)
+        return 0
+    finally:
+        _pending.discard(name)
+
+
+def schedule(name):
+    """
+    queues rendition generation in the background, at most once per
+    original at a time
+    """
+    if not name or name in _pending:
+        return None
+    _pending.add(name)
+    return _executor.submit(_generate_and_release, name)
@@ -0,0 +1,28 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .caching import bump_version
+from .models import Job
+
+
+def schedule_renditions(name):
+    # imported here, pillow would otherwise load with the app registry
+    from .renditions import schedule
+    future = schedule(name)
+    if future is not None:
+        # pages cached meanwhile fall back to the original image
+        future.add_done_callback(lambda _: bump_version())
+
+
+@receiver(post_save, sender=Job)
+def job_saved(sender, instance, **kwargs):
+    transaction.on_commit(bump_version)
+    if instance.image:
+        name = instance.image.name
+        transaction.on_commit(lambda: schedule_renditions(name))
+
+
+@receiver(post_delete, sender=Job)
+def job_deleted(sender, instance, **kwargs):
+    transaction.on_commit(bump_version)
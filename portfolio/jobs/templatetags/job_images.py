@@ -0,0 +1,36 @@
+from django import template
+from django.core.files.storage import default_storage
+from django.utils.html import format_html, format_html_join
+
+from jobs.renditions import FORMATS, WIDTHS, is_rendered, rendition_name
+from jobs.signals import schedule_renditions
+
+register = template.Library()
+
+# matches the row-cols-1 row-cols-sm-2 row-cols-md-3 album grid
+CARD_SIZES = '(min-width: 768px) 33vw, (min-width: 576px) 50vw, 100vw'
+
+
+def _srcset(name, fmt):
+    return ', '.join('{} {}w'.format(default_storage.url(rendition_name(name, width, fmt)), width)
+                     for width in WIDTHS)
+
+
+@register.simple_tag
+def job_picture(image, alt='', sizes=CARD_SIZES):
+    """
+    <picture> with webp and jpeg srcsets for a Job image, renditions are
+    made lazily so until they exist the original is served and queued,
+    cached pages are dropped once they are done
+    """
+    if not image:
+        return ''
+    if not is_rendered(image.name):
+        schedule_renditions(image.name)
+        return format_html('<img src="{}" alt="{}" loading="lazy"/>', image.url, alt)
+    sources = format_html_join('', '<source type="image/{}" srcset="{}" sizes="{}">',
+                               ((fmt, _srcset(image.name, fmt), sizes)
+                                for fmt in FORMATS if fmt != 'jpeg'))
+    return format_html('<picture>{}<img src="{}" srcset="{}" sizes="{}" alt="{}" loading="lazy"/></picture>',
+                       sources, default_storage.url(rendition_name(image.name, WIDTHS[0], 'jpeg')),
+                       _srcset(image.name, 'jpeg'), sizes, alt)
@@ -1,14 +1,22 @@
 from django.shortcuts import render, get_object_or_404
+from portfolio.asyncdb import asgi_view
+from .caching import cache_on_jobs
 from .models import Job
 
 # Create your views here.
-def experience(request):
+# async under ASGI so the server does not tie a thread to each request,
+# the queries and the template still run in a thread, see portfolio.asyncdb
+def _experience(request):
     jobs = Job.objects
     return render(request, 'experience/exp.html', {'jobs':jobs})
 
-def details(request, job_id):
+def _details(request, job_id):
     """
     first argument is class, second stands for primary key
     """
     job_detail = get_object_or_404(Job, pk=job_id)
-    return render(request, 'experience/detail.html', { 'job': job_detail })
\ No newline at end of file
+    return render(request, 'experience/detail.html', { 'job': job_detail })
+
+experience = cache_on_jobs(asgi_view(_experience))
+
+details = cache_on_jobs(asgi_view(_details))
\ No newline at end of file
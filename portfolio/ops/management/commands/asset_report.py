@@ -0,0 +1,85 @@
+import gzip
+from html.parser import HTMLParser
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.management import BaseCommand
+from django.test import Client
+from django.test.utils import override_settings
+
+from jobs.caching import bump_version
+from jobs.models import Job
+from portfolio import assets
+
+PAGES = ['/', '/jobs/{job}', '/discuss', '/conversation', '/login', '/signup', '/list']
+
+
+class AssetParser(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.urls = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'link' and attrs.get('rel') == 'stylesheet':
+            self.urls.append(attrs['href'])
+        elif tag == 'script' and attrs.get('src'):
+            self.urls.append(attrs['src'])
+
+
+def asset_bytes(url):
+    """
+    (bytes, gzipped bytes) of a linked file, None when it cannot be found,
+    such as a CDN file that is not vendored
+    """
+    if url.startswith(settings.STATIC_URL):
+        path = finders.find(url[len(settings.STATIC_URL):])
+    else:
+        path = None
+        for name, (vendor_url, _) in assets.VENDOR.items():
+            if vendor_url.split('//', 1)[1] == url.split('//', 1)[1]:
+                path = assets.source_path('vendor/' + name)
+    try:
+        with open(path, 'rb') as linked:
+            data = linked.read()
+    except (TypeError, OSError):
+        return None
+    return len(data), len(gzip.compress(data, 9))
+
+
+class Command(BaseCommand):
+    # Show this when the user types help
+    help = "Requests and bytes each page loads, with every source linked on its own and bundled"
+
+    def page_assets(self, client, url):
+        # the job pages are cached on the Job table alone
+        bump_version()
+        response = client.get(url)
+        parser = AssetParser()
+        parser.feed(response.content.decode())
+        return response, parser.urls
+
+    def handle(self, *args, **options):
+        job = Job.objects.order_by('pk').first()
+        pages = [page.format(job=job.pk if job else 0) for page in PAGES]
+        self.stdout.write('{:<14} {:<10} {:>8} {:>8} {:>12} {:>12}'.format(
+            'page', 'mode', 'requests', 'external', 'bytes', 'gzip bytes'))
+        for page in pages:
+            for mode, bundle in (('unbundled', False), ('bundled', True)):
+                with override_settings(ASSETS_BUNDLE=bundle, DEBUG=True, ALLOWED_HOSTS=['testserver']):
+                    response, urls = self.page_assets(Client(), page)
+                raw = zipped = 0
+                unknown = 0
+                for url in urls:
+                    sizes = asset_bytes(url)
+                    if sizes is None:
+                        unknown += 1
+                        continue
+                    raw += sizes[0]
+                    zipped += sizes[1]
+                raw += len(response.content)
+                zipped += len(gzip.compress(response.content, 9))
+                external = sum(1 for url in urls if not url.startswith(settings.STATIC_URL))
+                self.stdout.write('{:<14} {:<10} {:>8} {:>8} {:>12} {:>12}{}'.format(
+                    page, mode, 1 + len(urls), external, raw, zipped,
+                    '  +{} not found'.format(unknown) if unknown else ''))
@@ -0,0 +1,187 @@
+import asyncio
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management import BaseCommand
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.test import RequestFactory, override_settings
+from django.urls import path
+
+from discuss import views as discuss_views
+from employee_register import views as employee_views
+from jobs import views
+from jobs.caching import bump_version, cache_on_jobs
+from jobs.models import Job
+from portfolio import urls
+from portfolio.asyncdb import async_view
+from portfolio.benchmarks import summary
+
+BENCH_ROLE = 'Bench role'
+
+# the read routes as sync views under sync/ and as async views under
+# async/, whatever ASYNC_VIEWS says, the site's own routes are there for
+# the templates to reverse
+urlpatterns = [
+    path('sync/', cache_on_jobs(views._experience)),
+    path('sync/jobs/<int:job_id>', cache_on_jobs(views._details)),
+    path('sync/conversation', discuss_views._conversation),
+    path('sync/list', employee_views._employee_get),
+    path('async/', cache_on_jobs(async_view(views._experience))),
+    path('async/jobs/<int:job_id>', cache_on_jobs(async_view(views._details))),
+    path('async/conversation', async_view(discuss_views._conversation)),
+    path('async/list', async_view(employee_views._employee_get)),
+] + urls.urlpatterns
+
+ROUTES = {
+    'experience': '/',
+    'details': '/jobs/{job}',
+    'conversation': '/conversation',
+    'list': '/list',
+}
+
+
+class Command(BaseCommand):
+    # Show this when the user types help
+    help = ("Throughput and latency of the read routes with sync and async views, served "
+            "the WSGI way by a fixed pool of threads and the ASGI way by one event loop, "
+            "to many clients that are slow to read their responses")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=200,
+                            help='clients sending requests at the same time')
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument('--threads', type=int, default=16,
+                            help='request threads of the WSGI worker')
+        parser.add_argument('--client-delay', type=float, default=0.05,
+                            help='seconds a client takes to read a response')
+        parser.add_argument('--routes', default='experience,details,conversation',
+                            help='comma separated, of {}'.format(', '.join(ROUTES)))
+        parser.add_argument('--query-latency', type=float, default=0.002,
+                            help='seconds added to every query, the round trip to a database server')
+        parser.add_argument('--jobs', type=int, default=30,
+                            help='jobs to have in the table, missing ones are created')
+
+    def delay_query(self, execute, sql, params, many, context):
+        time.sleep(self.query_latency)
+        return execute(sql, params, many, context)
+
+    def add_latency(self, connection, **kwargs):
+        # a thread keeps its connection object across reconnects
+        if self.delay_query not in connection.execute_wrappers:
+            connection.execute_wrappers.append(self.delay_query)
+
+    def wsgi(self, paths, options):
+        """
+        a gthread style worker, each of its threads handles a request and
+        then writes it out to the slow client before taking the next one,
+        the time a request waits for a free thread counts as latency
+        """
+        handler = WSGIHandler()
+        factory = RequestFactory()
+
+        def handle(path):
+            statuses = []
+            body = handler(factory.get(path).environ, lambda status, headers: statuses.append(status))
+            try:
+                for _ in body:
+                    time.sleep(options['client_delay'])
+            finally:
+                body.close()
+            return int(statuses[0][:3])
+
+        with ThreadPoolExecutor(max_workers=options['threads']) as worker, \
+                ThreadPoolExecutor(max_workers=options['clients']) as clients:
+            def request(path):
+                start = time.perf_counter()
+                status = worker.submit(handle, path).result()
+                return time.perf_counter() - start, status
+
+            start = time.perf_counter()
+            results = list(clients.map(request, paths))
+            return results, time.perf_counter() - start
+
+    def asgi(self, paths, options):
+        """
+        an ASGI server's event loop, the handler awaits every send to a
+        slow client without holding a thread
+        """
+        handler = ASGIHandler()
+
+        async def request(path):
+            start = time.perf_counter()
+            statuses = []
+
+            async def receive():
+                return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    statuses.append(message['status'])
+                else:
+                    await asyncio.sleep(options['client_delay'])
+
+            await handler({
+                'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+                'method': 'GET', 'scheme': 'http', 'path': path, 'raw_path': path.encode(),
+                'query_string': b'', 'root_path': '', 'headers': [(b'host', b'testserver')],
+                'client': ('127.0.0.1', 0), 'server': ('testserver', 80),
+            }, receive, send)
+            return time.perf_counter() - start, statuses[0]
+
+        async def client(queue, results):
+            for path in queue:
+                results.append(await request(path))
+
+        async def run():
+            queue, results = iter(paths), []
+            start = time.perf_counter()
+            await asyncio.gather(*(client(queue, results) for _ in range(options['clients'])))
+            return results, time.perf_counter() - start
+
+        return asyncio.run(run())
+
+    def run(self, label, serve, paths, options):
+        results, elapsed = serve(paths, options)
+        statuses = sorted({status for _, status in results})
+        self.stdout.write('{:<12} {} status {}'.format(
+            label, summary([latency for latency, _ in results], elapsed), statuses))
+        self.stdout.flush()
+
+    def handle(self, *args, **options):
+        Job.objects.bulk_create([
+            Job(roleName='{} {}'.format(BENCH_ROLE, i), roleKeySkills='python, django',
+                roleLocation='Remote', roleDescription='benchmark job ' * 20)
+            for i in range(Job.objects.count(), options['jobs'])
+        ])
+        ids = itertools.cycle(Job.objects.values_list('id', flat=True)[:options['jobs']])
+        routes = [ROUTES[name] for name in options['routes'].split(',')]
+        paths = [route.format(job=next(ids)) for route, _ in zip(itertools.cycle(routes), range(options['requests']))]
+
+        self.stdout.write('{} requests over {}, {} clients reading for {} s, {} WSGI threads, '
+                          'queries take {} s more'.format(
+                              options['requests'], options['routes'], options['clients'],
+                              options['client_delay'], options['threads'], options['query_latency']))
+        # the connections of request threads are opened from here on
+        connections.close_all()
+        self.query_latency = options['query_latency']
+        connection_created.connect(self.add_latency)
+        try:
+            with override_settings(ROOT_URLCONF=__name__, DEBUG=False, ALLOWED_HOSTS=['*'],
+                                   STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage'):
+                # one pass to fill the page cache and open connections, every mode then starts warm
+                warm = paths[:len(routes) * options['jobs']]
+                self.wsgi(['/sync' + path for path in warm] + ['/async' + path for path in warm],
+                          dict(options, client_delay=0))
+                self.run('wsgi sync', self.wsgi, ['/sync' + path for path in paths], options)
+                self.run('wsgi async', self.wsgi, ['/async' + path for path in paths], options)
+                self.run('asgi sync', self.asgi, ['/sync' + path for path in paths], options)
+                self.run('asgi async', self.asgi, ['/async' + path for path in paths], options)
+        finally:
+            connection_created.disconnect(self.add_latency)
+            connections.close_all()
+            Job.objects.filter(roleName__startswith=BENCH_ROLE).delete()
+            bump_version()
@@ -0,0 +1,63 @@
+import statistics
+import threading
+import time
+
+from django.core.management import BaseCommand, CommandError
+from django.core.signals import request_finished, request_started
+from django.db import connection, connections
+
+MODES = [
+    ('per request', {'CONN_MAX_AGE': 0, 'OPTIONS': {}}),
+    ('persistent', {'CONN_MAX_AGE': 60, 'OPTIONS': {'health_checks': True}}),
+    ('pool', {'CONN_MAX_AGE': 0, 'OPTIONS': {'health_checks': True,
+                                             'pool': {'min_size': 5, 'max_size': 20}}}),
+]
+
+
+class Command(BaseCommand):
+    # Show this when the user types help
+    help = ("Runs the request connection lifecycle from concurrent clients against the "
+            "configured postgres database, per request connections, persistent ones and the pool")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=50)
+        parser.add_argument('--requests', type=int, default=100, help='requests per client')
+
+    def client(self, requests, latencies, pids):
+        for _ in range(requests):
+            start = time.perf_counter()
+            # the same hooks django runs around every request
+            request_started.send(sender=self.__class__)
+            with connections['default'].cursor() as cursor:
+                cursor.execute('SELECT pg_backend_pid()')
+                pids.add(cursor.fetchone()[0])
+                cursor.execute('SELECT count(*) FROM jobs_job')
+            request_finished.send(sender=self.__class__)
+            latencies.append(time.perf_counter() - start)
+        connections.close_all()
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('bench_db_connections needs the postgresql database')
+        settings_dict = connections.databases['default']
+        original = {key: settings_dict[key] for key in ('CONN_MAX_AGE', 'OPTIONS')}
+        try:
+            for name, mode in MODES:
+                settings_dict.update(mode)
+                latencies, pids = [], set()
+                # fresh threads get fresh connection wrappers built from the settings above
+                threads = [threading.Thread(target=self.client,
+                                            args=(options['requests'], latencies, pids))
+                           for _ in range(options['clients'])]
+                start = time.perf_counter()
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+                elapsed = time.perf_counter() - start
+                latencies.sort()
+                self.stdout.write('{:<12} {:8.1f} req/s p50 {:6.2f} ms p99 {:6.2f} ms {:6} connections opened'.format(
+                    name, len(latencies) / elapsed, statistics.median(latencies) * 1000,
+                    latencies[int(len(latencies) * 0.99) - 1] * 1000, len(pids)))
+        finally:
+            settings_dict.update(original)
@@ -0,0 +1,55 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management import BaseCommand
+from django.urls import re_path
+from django.views.static import serve
+
+from portfolio.benchmarks import bench_server, fetch, summary
+from portfolio.media import serve_media
+
+BENCH_FILE = 'bench/5mb.jpg'
+
+# both views side by side, the debug static view and the media view
+urlpatterns = [
+    re_path(r'^static-view/(?P<path>.*)$', serve, {'document_root': settings.MEDIA_ROOT}),
+    re_path(r'^media-view/(?P<path>.*)$', serve_media),
+]
+
+
+class Command(BaseCommand):
+    # Show this when the user types help
+    help = ("Compares the debug static view with the media view on a 5 MB file under "
+            "concurrency, the in process server has no sendfile so run the media view "
+            "under gunicorn to see the zero copy path")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=16)
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--size', type=int, default=5 * 1024 * 1024)
+
+    def run(self, base, prefix, headers, options):
+        url = '{}/{}/{}'.format(base, prefix, BENCH_FILE)
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+            start = time.perf_counter()
+            results = list(executor.map(lambda _: fetch(url, headers), range(options['requests'])))
+            elapsed = time.perf_counter() - start
+        sent = sum(size for _, _, size in results)
+        self.stdout.write('{:<12} {:<14} {} {:8.1f} MB/s'.format(
+            prefix, headers.get('Range', 'full'),
+            summary([latency for latency, _, _ in results], elapsed), sent / elapsed / 2 ** 20))
+
+    def handle(self, *args, **options):
+        path = os.path.join(settings.MEDIA_ROOT, BENCH_FILE)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as bench_file:
+            bench_file.write(os.urandom(options['size']))
+        try:
+            with bench_server(__name__) as base:
+                for headers in ({}, {'Range': 'bytes=0-65535'}):
+                    for prefix in ('static-view', 'media-view'):
+                        self.run(base, prefix, headers, options)
+        finally:
+            os.remove(path)
@@ -0,0 +1,79 @@
+import multiprocessing
+import tempfile
+import time
+
+from django.core.management import BaseCommand, CommandError
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from django.urls import resolve
+
+from portfolio import metrics
+
+BUDGET_US = 50
+
+
+def record(args):
+    directory, view, count = args
+    recorder = metrics.Recorder(directory)
+    for i in range(count):
+        recorder.started()
+        recorder.finished(view, 'GET', 200, i / count)
+    return count
+
+
+class Command(BaseCommand):
+    # Show this when the user types help
+    help = ("Overhead per request of the metrics middleware, and a check that "
+            "several processes recording at once add up in the /metrics output")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=100000)
+        parser.add_argument('--processes', type=int, default=4)
+
+    def time_calls(self, handler, request, count):
+        start = time.perf_counter()
+        for _ in range(count):
+            handler(request)
+        return (time.perf_counter() - start) / count * 1e6
+
+    def overhead(self, directory, count):
+        response = HttpResponse()
+        request = RequestFactory().get('/')
+        request.resolver_match = resolve('/')
+
+        def view(request):
+            return response
+        middleware = metrics.MetricsMiddleware(view)
+        with override_settings(METRICS_DIR=directory):
+            # the first request of a series allocates its slots
+            middleware(request)
+            bare = self.time_calls(view, request, count)
+            measured = self.time_calls(middleware, request, count)
+        return measured - bare
+
+    def aggregate(self, directory, processes, count):
+        with multiprocessing.Pool(processes) as pool:
+            pool.map(record, [(directory, 'experience', count)] * processes)
+        text = metrics.exposition(metrics.collect(directory))
+        expected = 'http_request_duration_seconds_count{{view="experience",method="GET"}} {}'.format(
+            processes * count)
+        if expected not in text.splitlines():
+            raise CommandError('processes did not add up, expected {!r} in\n{}'.format(expected, text))
+        return text
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as directory:
+            overhead = self.overhead(directory, options['requests'])
+        self.stdout.write('middleware overhead {:.2f} us/request (budget {} us)'.format(overhead, BUDGET_US))
+
+        with tempfile.TemporaryDirectory() as directory:
+            text = self.aggregate(directory, options['processes'], options['requests'] // options['processes'])
+        self.stdout.write('{} processes x {} requests add up:'.format(
+            options['processes'], options['requests'] // options['processes']))
+        for line in text.splitlines():
+            if 'experience' in line and ('le="0.5"' in line or '_count' in line or '_sum' in line):
+                self.stdout.write('    ' + line)
+
+        if overhead > BUDGET_US:
+            raise CommandError('metrics cost {:.2f} us per request, over the {} us budget'.format(
+                overhead, BUDGET_US))
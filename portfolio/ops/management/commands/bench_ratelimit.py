@@ -0,0 +1,181 @@
+import multiprocessing
+import os
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+
+from jobs.caching import bump_version
+from portfolio import ratelimit
+from portfolio.benchmarks import summary
+
+BUDGET_US = 50
+
+# DEBUG off as in production, the manifest storage would need a collectstatic run
+SERVING = {'ALLOWED_HOSTS': ['*'], 'DEBUG': False,
+           'STATICFILES_STORAGE': 'django.contrib.staticfiles.storage.StaticFilesStorage'}
+
+# what the clients of each kind request in turn, every post of a real user
+# comes from an address of its own, a spammer sends them all from one
+READS = ['/', '/conversation', '/discuss']
+DISCUSS = {'recruiterName': 'Bench', 'recruiterEmail': 'bench@example.com', 'jobDetails': 'bench post'}
+SIGNUP = {'username': 'bench', 'first_name': 'Bench', 'last_name': 'User', 'password': 'bench',
+          'confirm_password': 'bench', 'phone': '5550000000', 'email': 'bench@example.com',
+          'address': '1 main st', 'city': 'Austin', 'state': 'TX', 'zipcode': '78701',
+          'title': 'Engineer', 'employed_at': 'Bench'}
+
+
+def take(args):
+    path, slots, count, capacity = args
+    table = ratelimit.BucketTable(path, slots)
+    # refills too slowly to matter while the processes run
+    return sum(1 for _ in range(count) if not table.take('discuss:203.0.113.1', capacity, 1e-9))
+
+
+def client(kind, number, duration, rate):
+    """
+    a real user reading pages and posting now and then, back to back, or
+    a spammer posting `rate` times a second, returns (latency, status)
+    of every request
+    """
+    # a failed request counts as a 500 instead of ending the thread
+    client = Client(raise_request_exception=False)
+    start = time.perf_counter()
+    samples = []
+    for i in range(10 ** 9):
+        now = time.perf_counter()
+        if now >= start + duration:
+            return kind, samples
+        if rate and now < start + i / rate:
+            time.sleep(start + i / rate - now)
+        if kind == 'user':
+            address = '10.{}.{}.{}'.format(number, i // 250 % 250, i % 250)
+            if i % 10 == 9:
+                path, form = '/discuss', DISCUSS
+            else:
+                path, form = READS[i % len(READS)], None
+        else:
+            address = '203.0.113.{}'.format(number)
+            path, form = ('/discuss', DISCUSS) if i % 2 else ('/signup', SIGNUP)
+        request_start = time.perf_counter()
+        if form:
+            response = client.post(path, form, REMOTE_ADDR=address)
+        else:
+            response = client.get(path, REMOTE_ADDR=address)
+        samples.append((time.perf_counter() - request_start, response.status_code))
+
+
+def statuses(values):
+    return ', '.join('{} x{}'.format(status, count) for status, count in sorted(Counter(values).items()))
+
+
+class Command(BaseCommand):
+    # Show this when the user types help
+    help = ("Cost of a rate limit check, that worker processes share one budget, and the latency "
+            "of real users while spammers flood discuss and signup, with and without the limits")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--checks', type=int, default=100000)
+        parser.add_argument('--processes', type=int, default=4)
+        parser.add_argument('--users', type=int, default=4, help='threads of real users')
+        parser.add_argument('--spammers', type=int, default=8, help='threads posting spam')
+        parser.add_argument('--spam-rate', type=float, default=200, help='spam posts per second, all spammers together')
+        parser.add_argument('--duration', type=float, default=8, help='seconds per phase')
+
+    def cost(self, directory, count):
+        """
+        microseconds per check with the table empty and with every slot taken
+        """
+        table = ratelimit.BucketTable(os.path.join(directory, 'cost'), settings.RATELIMIT_SLOTS)
+        keys = ['discuss:10.0.{}.{}'.format(i // 250, i % 250) for i in range(1000)]
+        timings = []
+        for fill in (0, settings.RATELIMIT_SLOTS):
+            for i in range(fill):
+                table.take('signup:fill{}'.format(i), 3, 1.0)
+            start = time.perf_counter()
+            for i in range(count):
+                table.take(keys[i % len(keys)], 5, 1.0)
+            timings.append((time.perf_counter() - start) / count * 1e6)
+        return timings
+
+    def shared(self, directory, processes, capacity):
+        path = os.path.join(directory, 'shared')
+        with multiprocessing.get_context('fork').Pool(processes) as pool:
+            allowed = pool.map(take, [(path, 1024, capacity, capacity)] * processes)
+        if sum(allowed) != capacity:
+            raise CommandError('{} processes let {} posts through a budget of {}'.format(
+                processes, sum(allowed), capacity))
+        return allowed
+
+    def spam_cost(self, directory, count):
+        """
+        milliseconds of server time per spam post to discuss, let through
+        and turned away, without the http server and client around it
+        """
+        timings = []
+        for limits in ({}, settings.RATELIMITS):
+            with override_settings(RATELIMITS=limits, RATELIMIT_FILE=os.path.join(directory, 'spam'), **SERVING):
+                client = Client()
+                client.post('/discuss', DISCUSS)
+                start = time.perf_counter()
+                for _ in range(count):
+                    client.post('/discuss', DISCUSS)
+                timings.append((time.perf_counter() - start) / count * 1000)
+        return timings
+
+    def flood(self, spammers, options):
+        """
+        latencies of the real users' requests and the statuses spam got
+        """
+        jobs = [('user', n, options['duration'], 0) for n in range(options['users'])]
+        jobs += [('spam', n, options['duration'], options['spam_rate'] / spammers) for n in range(spammers)]
+        users, spam = [], Counter()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+            for kind, samples in executor.map(lambda job: client(*job), jobs):
+                if kind == 'user':
+                    users.extend(samples)
+                else:
+                    spam.update(status for _, status in samples)
+        return users, spam, time.perf_counter() - start
+
+    def phase(self, label, spammers, options):
+        users, spam, elapsed = self.flood(spammers, options)
+        self.stdout.write('{:<16} users {} status {}, spam {}'.format(
+            label, summary([latency for latency, _ in users], elapsed), statuses(status for _, status in users),
+            statuses(spam.elements()) or 'none'))
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as directory:
+            empty, full = self.cost(directory, options['checks'])
+            allowed = self.shared(directory, options['processes'], 1000)
+        self.stdout.write('check {:.2f} us with the table empty, {:.2f} us after {} other keys '
+                          '(budget {} us)'.format(empty, full, settings.RATELIMIT_SLOTS, BUDGET_US))
+        self.stdout.write('{} processes shared a budget of 1000 posts: {} let through'.format(
+            options['processes'], ' + '.join(map(str, allowed))))
+
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            with tempfile.TemporaryDirectory() as scratch:
+                accepted, rejected = self.spam_cost(scratch, 200)
+                self.stdout.write('server time per spam post {:.2f} ms let through, {:.2f} ms turned away'.format(
+                    accepted, rejected))
+                caches = {'default': dict(settings.CACHES['default'], LOCATION=os.path.join(scratch, 'cache'))}
+                for label, limits, spammers in (('no spam', settings.RATELIMITS, 0),
+                                                ('spam, no limits', {}, options['spammers']),
+                                                ('spam, limited', settings.RATELIMITS, options['spammers'])):
+                    # a fresh table per phase, budgets spent in one do not carry over
+                    with override_settings(RATELIMITS=limits, CACHES=caches, METRICS_DIR=os.path.join(scratch, 'metrics'),
+                                           RATELIMIT_FILE=os.path.join(scratch, label.replace(' ', '')), **SERVING):
+                        bump_version()
+                        self.phase(label, spammers, options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        if full > BUDGET_US:
+            raise CommandError('a rate limit check cost {:.2f} us, over the {} us budget'.format(full, BUDGET_US))
@@ -0,0 +1,118 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+
+# what a gunicorn worker does before its first response: load the app, then the URLconf
+WORKER_BOOT = (
+    "from portfolio.wsgi import application\n"
+    "from django.urls import resolve\n"
+    "resolve('/')\n"
+)
+
+TARGETS = {
+    'check': ['manage.py', 'check'],
+    'worker': ['-c', WORKER_BOOT],
+}
+
+
+def parse_importtime(stderr):
+    """
+    (self, cumulative) milliseconds per imported module from `-X importtime`
+    output, cumulative includes the imports the module triggered
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = (int(own) / 1000, int(cumulative) / 1000)
+    return modules
+
+
+class Command(BaseCommand):
+    # Show this when the user types help
+    help = ("Times manage.py check and a worker boot in fresh interpreters, with -X importtime "
+            "per module, and fails when either got slower or imports more than the saved baseline")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5)
+        parser.add_argument('--baseline', default=os.path.join(settings.BASE_DIR, 'startup_baseline.json'))
+        parser.add_argument('--save', action='store_true', help='write the results as the new baseline')
+        parser.add_argument('--tolerance', type=float, default=0.2,
+                            help='fraction a time may grow by before it counts as a regression')
+        parser.add_argument('--slack', type=float, default=5,
+                            help='milliseconds any time may grow by regardless of --tolerance')
+        parser.add_argument('--top', type=int, default=10)
+
+    def measure(self, argv, runs):
+        env = dict(os.environ)
+        # bytecode is always cached in production, compiling would dominate
+        env.pop('PYTHONDONTWRITEBYTECODE', None)
+        command = [sys.executable, '-X', 'importtime'] + argv
+        subprocess.run(command, cwd=settings.BASE_DIR, env=env, capture_output=True, check=True)
+        walls, imports = [], []
+        for _ in range(runs):
+            start = time.perf_counter()
+            result = subprocess.run(command, cwd=settings.BASE_DIR, env=env, capture_output=True,
+                                    text=True, check=True)
+            walls.append((time.perf_counter() - start) * 1000)
+            imports.append(parse_importtime(result.stderr))
+        names = set().union(*imports)
+
+        def median(name, field):
+            return statistics.median(run[name][field] if name in run else 0 for run in imports)
+        return {
+            'wall_ms': statistics.median(walls),
+            'self_ms': {name: median(name, 0) for name in names},
+            'cumulative_ms': {name: median(name, 1) for name in names},
+        }
+
+    def regressed(self, before, now, options):
+        return now > before * (1 + options['tolerance']) + options['slack']
+
+    def handle(self, *args, **options):
+        results = {name: self.measure(argv, options['runs']) for name, argv in TARGETS.items()}
+        baseline = None
+        if os.path.exists(options['baseline']):
+            with open(options['baseline']) as saved:
+                baseline = json.load(saved)
+
+        regressions = []
+        for name, result in results.items():
+            before = (baseline or {}).get(name)
+            self.stdout.write('{:<7} {:8.1f} ms{}'.format(
+                name, result['wall_ms'],
+                '  (baseline {:.1f} ms)'.format(before['wall_ms']) if before else ''))
+            if before and self.regressed(before['wall_ms'], result['wall_ms'], options):
+                regressions.append('{} took {:.1f} ms, baseline {:.1f} ms'.format(
+                    name, result['wall_ms'], before['wall_ms']))
+            cumulative = sorted(result['cumulative_ms'].items(), key=lambda item: -item[1])
+            for module, ms in cumulative[:options['top']]:
+                was = before['cumulative_ms'].get(module) if before else None
+                self.stdout.write('    {:<44} {:7.1f} ms{}'.format(
+                    module, ms, '' if was is None else '  (was {:.1f})'.format(was)))
+            if not before:
+                continue
+            # per module times move around with import order, whatever imports a
+            # dependency first pays for it, so only imports that are new are judged
+            added = [module for module in result['self_ms'] if module not in before['self_ms']]
+            added_ms = sum(result['self_ms'][module] for module in added)
+            if added_ms > options['slack']:
+                heaviest = sorted(added, key=lambda module: -result['cumulative_ms'][module])
+                regressions.append('{}: {} new imports took {:.1f} ms, heaviest {}'.format(
+                    name, len(added), added_ms, ', '.join(heaviest[:5])))
+
+        if options['save']:
+            with open(options['baseline'], 'w') as saved:
+                json.dump(results, saved, indent=2, sort_keys=True)
+            self.stdout.write('Saved baseline to {}'.format(options['baseline']))
+        elif baseline is None:
+            self.stdout.write('No baseline at {}, run with --save to record one'.format(options['baseline']))
+        if regressions and not options['save']:
+            raise CommandError('Startup regressed:\n' + '\n'.join(regressions))
@@ -0,0 +1,35 @@
+import os
+import time
+
+from django.core.management import BaseCommand
+
+from portfolio.storage import blob_storage
+
+
+class Command(BaseCommand):
+    # Show this when the user types help
+    help = "Deletes content addressed blobs, and their derivatives, that no row references"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--grace', type=int, default=3600,
+                            help='seconds a new blob is kept unreferenced, covers uploads in flight')
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        counts = blob_storage.reference_counts()
+        cutoff = time.time() - options['grace']
+        kept = removed = freed = 0
+        for names, files in blob_storage.blobs():
+            if any(counts[name] for name in names):
+                kept += 1
+                continue
+            if any(os.path.getmtime(path) > cutoff for path in files):
+                kept += 1
+                continue
+            removed += 1
+            for path in files:
+                freed += os.path.getsize(path)
+                if not options['dry_run']:
+                    os.remove(path)
+        self.stdout.write('{} {} unreferenced blobs ({} bytes), kept {}'.format(
+            'Would remove' if options['dry_run'] else 'Removed', removed, freed, kept))
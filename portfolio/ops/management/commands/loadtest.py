@@ -0,0 +1,269 @@
+import json
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+from collections import defaultdict
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import BaseCommand, CommandError
+from django.db import connection
+
+from discuss.models import opportunity
+from employee_register.models import Employee, Position
+from jobs.caching import bump_version
+from jobs.models import Job
+from portfolio.benchmarks import bench_server, fetch, opener, percentile
+from register.models import Registration
+
+USERNAME = 'loadtest'
+PASSWORD = 'loadtest-password'
+
+# route -> (method, path and form data for a request), ids come from the seeded data
+ROUTES = {
+    'experience': lambda data: ('GET', '/', None),
+    'details': lambda data: ('GET', '/jobs/{}'.format(random.choice(data['jobs'])), None),
+    'discuss': lambda data: ('GET', '/discuss', None),
+    'discuss:post': lambda data: ('POST', '/discuss', {
+        'recruiterName': 'Load Test', 'recruiterEmail': 'load@example.com',
+        'jobDetails': 'posted by loadtest'}),
+    'conversation': lambda data: ('GET', '/conversation?page={}'.format(
+        random.randint(1, data['conversation_pages'])), None),
+    'login': lambda data: ('GET', '/login', None),
+    'login:post': lambda data: ('POST', '/login', {'username': USERNAME, 'password': PASSWORD}),
+    'signup': lambda data: ('GET', '/signup', None),
+    'empget': lambda data: ('GET', '/list', None),
+    'empshowup': lambda data: ('GET', '/{}'.format(random.choice(data['employees'])), None),
+    'apiemployees': lambda data: ('GET', '/api/employees?' + urlencode({
+        'limit': 50, 'after': random.choice(data['employees'])}), None),
+    'apipositions': lambda data: ('GET', '/api/positions', None),
+}
+
+# mix -> route weights, --mix also takes route=weight,route=weight
+MIXES = {
+    'browse': {'experience': 10, 'details': 6, 'discuss': 2, 'conversation': 3, 'login': 1, 'signup': 1},
+    'employees': {'empget': 2, 'empshowup': 4, 'apiemployees': 6, 'apipositions': 2},
+    'release': {'experience': 10, 'details': 6, 'discuss': 2, 'discuss:post': 1, 'conversation': 3,
+                'login': 2, 'login:post': 1, 'signup': 1, 'empget': 1, 'empshowup': 2,
+                'apiemployees': 3, 'apipositions': 1},
+}
+
+WORDS = ('python django postgres redis docker kubernetes react typescript aws terraform '
+         'celery nginx linux graphql kafka spark airflow pandas golang rust').split()
+CITIES = ['Austin', 'Denver', 'Seattle', 'Boston', 'Chicago', 'Portland', 'Atlanta', 'Phoenix']
+STATES = ['TX', 'CO', 'WA', 'MA', 'IL', 'OR', 'GA', 'AZ']
+
+
+def words(count):
+    return ' '.join(random.choice(WORDS) for _ in range(count))
+
+
+def client(job):
+    """
+    one client sending requests back to back, picking routes by weight,
+    returns what it measured after the warmup
+    """
+    base, mix, data, post_headers, warmup, duration, seed = job
+    random.seed(seed)
+    routes, weights = zip(*mix.items())
+    samples = defaultdict(list)
+    measure_from = time.perf_counter() + warmup
+    stop_at = measure_from + duration
+    while True:
+        now = time.perf_counter()
+        if now >= stop_at:
+            return dict(samples)
+        route = random.choices(routes, weights)[0]
+        method, path, form = ROUTES[route](data)
+        body = urlencode(form).encode() if method == 'POST' else None
+        latency, status, _ = fetch(base + path, post_headers if body else None, body)
+        if now >= measure_from:
+            samples[route].append((latency, status))
+
+
+def parse_mix(value):
+    if value in MIXES:
+        return MIXES[value]
+    mix = {}
+    for part in value.split(','):
+        route, _, weight = part.partition('=')
+        if route not in ROUTES:
+            raise CommandError('unknown route {!r}, one of {}'.format(route, ', '.join(ROUTES)))
+        mix[route] = float(weight or 1)
+    return mix
+
+
+class Command(BaseCommand):
+    # Show this when the user types help
+    help = ("Seeds a fresh test database, drives a mix of the portfolio routes at a given concurrency "
+            "and reports throughput and latency percentiles per route against a saved baseline")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mix', default='browse',
+                            help='{} or route=weight,... with routes {}'.format(
+                                ', '.join(MIXES), ', '.join(ROUTES)))
+        parser.add_argument('--concurrency', type=int, default=8, help='clients sending requests')
+        parser.add_argument('--threads', type=int, default=8, help='server request threads')
+        parser.add_argument('--duration', type=float, default=20, help='seconds measured')
+        parser.add_argument('--warmup', type=float, default=3, help='seconds run before measuring')
+        parser.add_argument('--scale', type=float, default=1, help='multiplies the seeded row counts')
+        parser.add_argument('--keepdb', action='store_true', help='keep the seeded test database for the next run')
+        parser.add_argument('--baseline', default=os.path.join(settings.BASE_DIR, 'loadtest_baseline.json'))
+        parser.add_argument('--save', action='store_true', help='write the results as the new baseline')
+        parser.add_argument('--tolerance', type=float, default=0.25,
+                            help='fraction p99 may grow or throughput may drop by before failing')
+        parser.add_argument('--slack', type=float, default=2,
+                            help='milliseconds p99 may grow by regardless of --tolerance')
+        parser.add_argument('--min-samples', type=int, default=50,
+                            help='routes with fewer requests are reported but not gated')
+
+    def seed(self, scale):
+        """
+        tops the tables up to the seeded sizes, returns the ids requests pick from
+        """
+        counts = {name: int(count * scale) for name, count in
+                  (('jobs', 40), ('opportunities', 500), ('registrations', 2000),
+                   ('positions', 25), ('employees', 3000))}
+        Job.objects.bulk_create([
+            Job(roleName='{} engineer'.format(random.choice(WORDS).title()), roleKeySkills=words(4),
+                roleLocation=random.choice(CITIES), roleDescription=words(60))
+            for _ in range(Job.objects.count(), counts['jobs'])
+        ])
+        opportunity.objects.bulk_create([
+            opportunity(recruiterName='Recruiter {}'.format(i), recruiterEmail='recruiter{}@example.com'.format(i),
+                        jobDetails=words(40))
+            for i in range(opportunity.objects.count(), counts['opportunities'])
+        ], batch_size=500)
+        Registration.objects.bulk_create([
+            Registration(username='user{}'.format(i), name='user{}'.format(i), first_name='First',
+                         last_name='Last {}'.format(i), phone='555{:07d}'.format(i),
+                         email='user{}@example.com'.format(i), address='{} main st'.format(i),
+                         city=random.choice(CITIES), state=random.choice(STATES), zipcode='{:05d}'.format(i),
+                         title=words(2), employed_at=random.choice(WORDS).title())
+            for i in range(Registration.objects.count(), counts['registrations'])
+        ], batch_size=500)
+        Position.objects.bulk_create([
+            Position(position='{} {}'.format(random.choice(WORDS).title(), i))
+            for i in range(Position.objects.count(), counts['positions'])
+        ])
+        positions = list(Position.objects.values_list('id', flat=True))
+        Employee.objects.bulk_create([
+            Employee(fullname='Employee {}'.format(i), emp_code='{:03d}'.format(i % 1000),
+                     mobile='555{:07d}'.format(i), position_id=random.choice(positions))
+            for i in range(Employee.objects.count(), counts['employees'])
+        ], batch_size=500)
+        if not User.objects.filter(username=USERNAME).exists():
+            User.objects.create_user(USERNAME, password=PASSWORD)
+        # bulk_create sends no signals
+        bump_version()
+        return {
+            'jobs': list(Job.objects.values_list('id', flat=True)),
+            'employees': list(Employee.objects.values_list('id', flat=True)),
+            'conversation_pages': max(1, opportunity.objects.count() // 5),
+        }
+
+    def csrf_headers(self, base):
+        with opener.open(base + '/login') as response:
+            cookie = SimpleCookie()
+            for header in response.headers.get_all('Set-Cookie') or []:
+                cookie.load(header)
+        token = cookie[settings.CSRF_COOKIE_NAME].value
+        return {'Cookie': '{}={}'.format(settings.CSRF_COOKIE_NAME, token), 'X-CSRFToken': token}
+
+    def drive(self, base, mix, data, options):
+        """
+        route -> [(latency, status)] of every client, the clients run in
+        their own processes so they do not compete with the server for the GIL
+        """
+        job = (base, mix, data, self.csrf_headers(base), options['warmup'], options['duration'])
+        with multiprocessing.get_context('fork').Pool(options['concurrency']) as pool:
+            per_client = pool.map(client, [job + (seed,) for seed in range(options['concurrency'])])
+        results = defaultdict(list)
+        for samples in per_client:
+            for route, route_samples in samples.items():
+                results[route].extend(route_samples)
+        return results
+
+    def report(self, results, elapsed):
+        self.stdout.write('{:<14} {:>7} {:>9} {:>9} {:>9} {:>9} {:>9} {:>7}'.format(
+            'route', 'count', 'req/s', 'p50 ms', 'p90 ms', 'p99 ms', 'max ms', 'errors'))
+        summary = {}
+        everything = [sample for samples in results.values() for sample in samples]
+        for route, samples in sorted(results.items()) + [('total', everything)]:
+            latencies = [latency for latency, _ in samples]
+            errors = sum(1 for _, status in samples if status >= 400)
+            summary[route] = {
+                'count': len(samples),
+                'rps': len(samples) / elapsed,
+                'p50_ms': percentile(latencies, 0.5) * 1000,
+                'p90_ms': percentile(latencies, 0.9) * 1000,
+                'p99_ms': percentile(latencies, 0.99) * 1000,
+                'max_ms': max(latencies) * 1000,
+                'errors': errors,
+            }
+            self.stdout.write('{:<14} {count:>7} {rps:>9.1f} {p50_ms:>9.2f} {p90_ms:>9.2f} {p99_ms:>9.2f} '
+                              '{max_ms:>9.2f} {errors:>7}'.format(route, **summary[route]))
+        return summary
+
+    def regressions(self, summary, baseline, options):
+        found = []
+        for route, now in summary.items():
+            before = baseline['routes'].get(route)
+            if before is None or min(now['count'], before['count']) < options['min_samples']:
+                continue
+            if now['p99_ms'] > before['p99_ms'] * (1 + options['tolerance']) + options['slack']:
+                found.append('{}: p99 {:.2f} ms, baseline {:.2f} ms'.format(route, now['p99_ms'], before['p99_ms']))
+            if now['rps'] < before['rps'] * (1 - options['tolerance']):
+                found.append('{}: {:.1f} req/s, baseline {:.1f} req/s'.format(route, now['rps'], before['rps']))
+            if now['errors'] > before['errors']:
+                found.append('{}: {} errors, baseline {}'.format(route, now['errors'], before['errors']))
+        return found
+
+    def handle(self, *args, **options):
+        mix = parse_mix(options['mix'])
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=options['keepdb'])
+        try:
+            data = self.seed(options['scale'])
+            # a private cache, metrics directory and rate limit table, the run must not touch or read the real ones
+            with tempfile.TemporaryDirectory() as scratch:
+                caches = {'default': dict(settings.CACHES['default'], LOCATION=os.path.join(scratch, 'cache'))}
+                # DEBUG off as in production, it also caches compiled templates, the
+                # manifest storage would need a collectstatic run to resolve static urls
+                with bench_server(threads=options['threads'], DEBUG=False, CACHES=caches,
+                                  METRICS_DIR=os.path.join(scratch, 'metrics'),
+                                  # every client posts from 127.0.0.1, limits would turn the posts into 429s
+                                  RATELIMITS={}, RATELIMIT_FILE=os.path.join(scratch, 'ratelimit'),
+                                  STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage') as base:
+                    bump_version()
+                    results = self.drive(base, mix, data, options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options['keepdb'])
+
+        self.stdout.write('mix {} at concurrency {}, {} server threads, {:.0f} s'.format(
+            options['mix'], options['concurrency'], options['threads'], options['duration']))
+        summary = self.report(results, options['duration'])
+        run = {'mix': mix, 'concurrency': options['concurrency'], 'threads': options['threads'],
+               'routes': summary}
+
+        if options['save']:
+            with open(options['baseline'], 'w') as saved:
+                json.dump(run, saved, indent=2, sort_keys=True)
+            self.stdout.write('Saved baseline to {}'.format(options['baseline']))
+            return
+        if not os.path.exists(options['baseline']):
+            self.stdout.write('No baseline at {}, run with --save to record one'.format(options['baseline']))
+            return
+        with open(options['baseline']) as saved:
+            baseline = json.load(saved)
+        if (baseline['mix'], baseline['concurrency'], baseline['threads']) != (mix, options['concurrency'],
+                                                                               options['threads']):
+            raise CommandError('The baseline was recorded with another mix or concurrency, '
+                               'compare like with like or --save a new one')
+        found = self.regressions(summary, baseline, options)
+        if found:
+            raise CommandError('Load test regressed:\n' + '\n'.join(found))
+        self.stdout.write('No regressions against {}'.format(options['baseline']))
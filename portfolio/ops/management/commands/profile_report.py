@@ -0,0 +1,69 @@
+import glob
+import io
+import os
+import pstats
+from collections import Counter
+
+from django.conf import settings
+from django.core.management import BaseCommand
+
+REPORT_DIR = 'report'
+
+
+class Command(BaseCommand):
+    # Show this when the user types help
+    help = ("Merges the profiled requests of each view into <view>.folded (flamegraph.pl, speedscope) "
+            "and <view>.prof (pstats, snakeviz) and prints where the time went")
+
+    def add_arguments(self, parser):
+        parser.add_argument('views', nargs='*', help='only these url names, all by default')
+        parser.add_argument('--top', type=int, default=15)
+        parser.add_argument('--clear', action='store_true', help='delete the merged artifacts afterwards')
+
+    def folded(self, view, paths, output):
+        stacks = Counter()
+        for path in paths:
+            with open(path) as artifact:
+                for line in artifact:
+                    stack, _, count = line.rstrip('\n').rpartition(' ')
+                    stacks[stack] += int(count)
+        with open(output, 'w') as merged:
+            for stack, count in stacks.most_common():
+                merged.write('{} {}\n'.format(stack, count))
+
+        # a sample lands in the innermost frame of its stack
+        own = Counter()
+        for stack, count in stacks.items():
+            own[stack.rpartition(';')[2]] += count
+        total = sum(stacks.values())
+        self.stdout.write('{}: {} sampled requests, {} samples -> {}'.format(view, len(paths), total, output))
+        for frame, count in own.most_common(self.top):
+            self.stdout.write('    {:5.1f}%  {}'.format(100 * count / total, frame))
+
+    def prof(self, view, paths, output):
+        table = io.StringIO()
+        stats = pstats.Stats(*paths, stream=table)
+        stats.dump_stats(output)
+        self.stdout.write('{}: {} profiled requests -> {}'.format(view, len(paths), output))
+        stats.sort_stats('cumulative').print_stats(self.top)
+        self.stdout.write(table.getvalue())
+
+    def handle(self, *args, **options):
+        self.top = options['top']
+        if not os.path.isdir(settings.PROFILING_DIR):
+            self.stdout.write('Nothing profiled yet, {} does not exist'.format(settings.PROFILING_DIR))
+            return
+        report_dir = os.path.join(settings.PROFILING_DIR, REPORT_DIR)
+        os.makedirs(report_dir, exist_ok=True)
+        views = options['views'] or sorted(
+            name for name in os.listdir(settings.PROFILING_DIR) if name != REPORT_DIR)
+        for view in views:
+            directory = os.path.join(settings.PROFILING_DIR, view)
+            for extension, merge in (('.folded', self.folded), ('.prof', self.prof)):
+                paths = sorted(glob.glob(os.path.join(directory, '*' + extension)))
+                if not paths:
+                    continue
+                merge(view, paths, os.path.join(report_dir, view + extension))
+                if options['clear']:
+                    for path in paths:
+                        os.remove(path)
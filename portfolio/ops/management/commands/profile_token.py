@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.core.management import BaseCommand
+
+from portfolio.profiling import HEADER, MODES, make_token
+
+
+class Command(BaseCommand):
+    # Show this when the user types help
+    help = "Prints an X-Profile header that has the request it is sent with profiled"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mode', choices=MODES, default='sample')
+
+    def handle(self, *args, **options):
+        self.stdout.write('{}: {}'.format(HEADER, make_token(options['mode'])))
+        self.stdout.write('valid for {} hours, the response names the artifact in X-Profile-Artifact'.format(
+            settings.PROFILING_TOKEN_MAX_AGE // 3600))
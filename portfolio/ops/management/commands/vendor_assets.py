@@ -0,0 +1,34 @@
+import os
+import urllib.request
+
+from django.core.management import BaseCommand, CommandError
+
+from portfolio import assets
+
+
+class Command(BaseCommand):
+    # Show this when the user types help
+    help = ("Downloads the third party files the asset bundles are built from into assets/vendor "
+            "and checks every vendored file against its hash pinned in assets.VENDOR")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='download files already vendored again')
+
+    def handle(self, *args, **options):
+        for name, (url, pinned) in assets.VENDOR.items():
+            path = assets.source_path('vendor/' + name)
+            if os.path.exists(path) and not options['force']:
+                with open(path, 'rb') as vendored:
+                    digest = assets.integrity(vendored.read())
+                if digest != pinned:
+                    raise CommandError('{} does not match its pinned hash, got {}, fetch it again '
+                                       'with --force'.format(path, digest))
+                continue
+            with urllib.request.urlopen(url, timeout=30) as response:
+                data = response.read()
+            digest = assets.integrity(data)
+            if digest != pinned:
+                raise CommandError('{} does not match its pinned hash, got {}'.format(url, digest))
+            with open(path, 'wb') as vendored:
+                vendored.write(data)
+            self.stdout.write('{:<32} {:8d} bytes {}'.format(name, len(data), digest))
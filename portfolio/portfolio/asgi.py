@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'portfolio.settings')
+# served the ASGI way, the read views go async, see portfolio.asyncdb
+os.environ.setdefault('ASYNC_VIEWS', '1')
 
 application = get_asgi_application()
@@ -0,0 +1,195 @@
+"""
+Self-hosted front-end bundles.
+
+Third party files are vendored into assets/vendor/ by the vendor_assets
+command, which checks each against its pinned hash in VENDOR, our own
+css lives in assets/src/. A vendored file missing with
+ASSETS_CDN_FALLBACK off fails the staticfiles check and the {% asset %}
+tag instead of loading from the CDN. BUNDLES concatenates them
+into one file per page type, BundleFinder exposes the result under
+bundles/ so collectstatic hashes it like any other static file, and the
+storage below writes gzip (and brotli, when installed) variants next to
+every hashed file for the front end server to send as they are.
+
+Templates link bundles with {% load assets %}{% asset 'site.css' %}.
+"""
+
+import base64
+import gzip
+import hashlib
+import os
+import re
+
+from django.conf import settings
+from django.contrib.staticfiles.finders import BaseFinder
+from django.core import checks
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.storage import FileSystemStorage
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ASSETS_DIR = os.path.join(settings.BASE_DIR, 'assets')
+BUILD_DIR = os.path.join(ASSETS_DIR, 'build')
+
+# vendored file -> (url it was fetched from, subresource integrity), the
+# lock vendor_assets fetches and verifies against
+VENDOR = {
+    'bootstrap-5.0.2.min.css': (
+        'https://cdn.jsdelivr.net/npm/bootstrap@5.0.2/dist/css/bootstrap.min.css',
+        'sha384-EVSTQN3/azprG1Anm3QDgpJLIm9Nao0Yz1ztcQTwFspd3yD65VohhpuuCOmLASjC'),
+    'bootstrap-5.0.2.bundle.min.js': (
+        'https://cdn.jsdelivr.net/npm/bootstrap@5.0.2/dist/js/bootstrap.bundle.min.js',
+        'sha384-MrcW6ZMFYlzcLA8Nl+NtUVF0sA7MsXsP1UyJoMp4YLEuNSfAP+JcXn/tWtIaxVXM'),
+    'bootstrap-4.1.1.min.css': (
+        'https://maxcdn.bootstrapcdn.com/bootstrap/4.1.1/css/bootstrap.min.css',
+        'sha384-WskhaSGFgHYWDcbwN70/dfYBj47jz9qbsMId/iRN3ewGhXQFZCSftd1LZCfmhktB'),
+    'bootstrap-4.3.1.min.css': (
+        'https://stackpath.bootstrapcdn.com/bootstrap/4.3.1/css/bootstrap.min.css',
+        'sha384-ggOyR0iXCbMQv3Xipma34MD+dH/1fQ784/j6cY/iJTQUOhcWr7x9JvoRxT2MZw1T'),
+    'bootstrap-4.3.1.min.js': (
+        'https://stackpath.bootstrapcdn.com/bootstrap/4.3.1/js/bootstrap.min.js',
+        'sha384-JjSmVgyd0p3pXB1rRibZUAYoIIy6OrQ6VrjIEaFf/nJGzIxFDsf4x0xIM+B07jRM'),
+    'jquery-3.3.1.slim.min.js': (
+        'https://code.jquery.com/jquery-3.3.1.slim.min.js',
+        'sha384-q8i/X+965DzO0rT7abK41JStQIAqVgRVzpbzo5smXKp4YfRvH+8abtTE1Pi6jizo'),
+    'popper-1.14.7.min.js': (
+        'https://cdnjs.cloudflare.com/ajax/libs/popper.js/1.14.7/umd/popper.min.js',
+        'sha384-UO2eT0CpHqdSJQ6hJty5KVphtPhzWj9WO1clHTMGa3JDZwrnQq4sF86dIHNDz0W1'),
+}
+
+# bundle -> sources under ASSETS_DIR, in load order
+BUNDLES = {
+    'site.css': ['vendor/bootstrap-5.0.2.min.css', 'src/site.css'],
+    'site.js': ['vendor/bootstrap-5.0.2.bundle.min.js'],
+    # the account pages have always stacked bootstrap 4 on top of 5
+    'accounts.css': ['vendor/bootstrap-5.0.2.min.css', 'vendor/bootstrap-4.1.1.min.css'],
+    'employees.css': ['vendor/bootstrap-4.3.1.min.css'],
+    'employees.js': ['vendor/jquery-3.3.1.slim.min.js', 'vendor/popper-1.14.7.min.js',
+                     'vendor/bootstrap-4.3.1.min.js'],
+}
+
+# static url prefix of each source directory, see STATICFILES_DIRS
+STATIC_PREFIXES = {'src': 'assets', 'vendor': 'vendor'}
+
+# the maps describe the single files, not the bundle
+SOURCE_MAP_RE = re.compile(rb'\n?(/\*# sourceMappingURL=[^*]*\*/|//# sourceMappingURL=\S*)\s*$')
+
+COMPRESS_EXTENSIONS = ('.css', '.js', '.svg', '.json', '.txt', '.xml', '.html')
+COMPRESS_MIN_SIZE = 256
+
+
+def integrity(data):
+    return 'sha384-' + base64.b64encode(hashlib.sha384(data).digest()).decode()
+
+
+def source_path(source):
+    return os.path.join(ASSETS_DIR, *source.split('/'))
+
+
+def missing(bundle):
+    """
+    sources of `bundle` not on disk, vendored files vendor_assets has not fetched yet
+    """
+    return [source for source in BUNDLES[bundle] if not os.path.exists(source_path(source))]
+
+
+def missing_error(bundle):
+    return 'vendored files of {} are missing: {}, fetch them with manage.py vendor_assets'.format(
+        bundle, ', '.join(missing(bundle)))
+
+
+def source_url(source):
+    """
+    (static path or CDN url, integrity) to load one source on its own
+    """
+    directory, name = source.split('/', 1)
+    if os.path.exists(source_path(source)):
+        return STATIC_PREFIXES[directory] + '/' + name, None
+    return VENDOR[name]
+
+
+def build(bundle):
+    """
+    writes `bundle` to BUILD_DIR unless it is newer than all its sources,
+    returns its path
+    """
+    target = os.path.join(BUILD_DIR, bundle)
+    paths = [source_path(source) for source in BUNDLES[bundle]]
+    if os.path.exists(target) and os.path.getmtime(target) >= max(map(os.path.getmtime, paths)):
+        return target
+    # a statement left open by one script must not swallow the next
+    separator = b'\n' if bundle.endswith('.css') else b';\n'
+    parts = []
+    for path in paths:
+        with open(path, 'rb') as source:
+            parts.append(SOURCE_MAP_RE.sub(b'', source.read()).rstrip())
+    os.makedirs(BUILD_DIR, exist_ok=True)
+    tmp_path = target + '.tmp'
+    with open(tmp_path, 'wb') as output:
+        output.write(separator.join(parts) + b'\n')
+    os.replace(tmp_path, target)
+    return target
+
+
+class BundleFinder(BaseFinder):
+    """
+    finds the bundles as bundles/<name>, building them on demand, bundles
+    with a source still missing are left out
+    """
+    prefix = 'bundles'
+
+    def check(self, **kwargs):
+        if settings.ASSETS_CDN_FALLBACK:
+            return []
+        return [checks.Error(missing_error(bundle), id='assets.E001')
+                for bundle in BUNDLES if missing(bundle)]
+
+    def find(self, path, all=False):
+        directory, _, bundle = path.partition('/')
+        if directory != self.prefix or bundle not in BUNDLES or missing(bundle):
+            return []
+        found = build(bundle)
+        return [found] if all else found
+
+    def list(self, ignore_patterns):
+        storage = FileSystemStorage(location=BUILD_DIR)
+        storage.prefix = self.prefix
+        for bundle in BUNDLES:
+            if not missing(bundle):
+                build(bundle)
+                yield bundle, storage
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    ManifestStaticFilesStorage that also leaves <file>.gz and <file>.br
+    beside every hashed text file, for nginx gzip_static/brotli_static
+    or any server that negotiates precompressed files
+    """
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for name in set(self.hashed_files.values()):
+            if name.endswith(COMPRESS_EXTENSIONS):
+                self.compress(self.path(name))
+
+    def compress(self, path):
+        with open(path, 'rb') as original:
+            data = original.read()
+        if len(data) < COMPRESS_MIN_SIZE:
+            return
+        variants = [('.gz', lambda: gzip.compress(data, 9, mtime=0))]
+        if brotli is not None:
+            variants.append(('.br', lambda: brotli.compress(data)))
+        for suffix, compress in variants:
+            # hashed names change with the content, an existing variant is current
+            if os.path.exists(path + suffix):
+                continue
+            compressed = compress()
+            if len(compressed) < len(data):
+                with open(path + suffix, 'wb') as output:
+                    output.write(compressed)
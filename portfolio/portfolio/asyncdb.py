@@ -0,0 +1,84 @@
+"""
+ORM work for async views.
+
+Django 3.2 has no async ORM, an async view has to hand its queries to a
+thread. sync_to_async's default, thread_sensitive, runs every such call
+of every request on one shared thread under the 3.2 ASGI handler, which
+puts the whole site back in single file. database_sync_to_async uses a
+pool of ASYNC_DB_THREADS threads instead, so at most that many
+connections are open per process, and as request_finished never runs in
+those threads, closes their connections once CONN_MAX_AGE is up or they
+broke, the way the handler does for its own thread.
+
+Keep a view's queries and template rendering in one call: querysets are
+lazy and templates evaluate them, outside the call they would raise
+SynchronousOnlyOperation. The same goes for streamed bodies, the 3.2
+ASGI handler iterates them on the event loop, see streaming_response.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import close_old_connections
+from django.http import HttpResponse, StreamingHttpResponse
+
+from .profiling import run_profiled
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(settings.ASYNC_DB_THREADS, thread_name_prefix='asyncdb')
+    return _executor
+
+
+def database_sync_to_async(function):
+    @wraps(function)
+    def run(*args, **kwargs):
+        close_old_connections()
+        try:
+            return run_profiled(function, *args, **kwargs)
+        finally:
+            close_old_connections()
+    return sync_to_async(run, thread_sensitive=False, executor=executor())
+
+
+def async_view(function):
+    """
+    an async view running the sync view `function` in the pool
+    """
+    run = database_sync_to_async(function)
+
+    @wraps(function)
+    async def view(*args, **kwargs):
+        return await run(*args, **kwargs)
+    return view
+
+
+def asgi_view(function):
+    """
+    async_view(function) when ASYNC_VIEWS is on, as portfolio.asgi turns
+    it on, and `function` itself otherwise, a WSGI server would run the
+    async view through an event loop of its own on every request
+    """
+    return async_view(function) if settings.ASYNC_VIEWS else function
+
+
+def streaming_response(request, content, **kwargs):
+    """
+    a StreamingHttpResponse of `content` under WSGI, under ASGI the body
+    is read here into a plain HttpResponse, the 3.2 handler iterates a
+    streamed body on the event loop where any query in it raises
+    SynchronousOnlyOperation after the headers are out
+    """
+    if isinstance(request, ASGIRequest):
+        return HttpResponse(content, **kwargs)
+    return StreamingHttpResponse(content, **kwargs)
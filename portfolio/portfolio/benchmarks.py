@@ -0,0 +1,103 @@
+"""
+Helpers shared by the bench_* management commands: an in-process HTTP
+server for a given URLconf and latency summaries.
+"""
+
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+from django.core.wsgi import get_wsgi_application
+from django.test.utils import override_settings
+
+
+class BenchServer(ThreadedWSGIServer):
+    request_queue_size = 128
+
+
+class PooledBenchServer(BenchServer):
+    """
+    handles requests on a fixed number of threads, like a gthread worker
+    """
+    def __init__(self, *args, threads=8, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool = ThreadPoolExecutor(max_workers=threads)
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self.process_request_thread, request, client_address)
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=False)
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+@contextmanager
+def bench_server(urlconf=None, threads=None, **settings):
+    """
+    serves the project, or `urlconf`, on an ephemeral port and yields its
+    base url, `threads` bounds the request threads
+    """
+    if urlconf is not None:
+        settings['ROOT_URLCONF'] = urlconf
+    settings.setdefault('ALLOWED_HOSTS', ['*'])
+    with override_settings(**settings):
+        if threads:
+            server = PooledBenchServer(('127.0.0.1', 0), QuietHandler, threads=threads)
+        else:
+            server = BenchServer(('127.0.0.1', 0), QuietHandler)
+        server.set_app(get_wsgi_application())
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            yield 'http://127.0.0.1:{}'.format(server.server_port)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+class NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args):
+        return None
+
+
+opener = urllib.request.build_opener(NoRedirect)
+
+
+def fetch(url, headers=None, data=None):
+    """
+    (seconds, status, body bytes) for one request, error statuses and
+    redirects are returned rather than raised or followed
+    """
+    request = urllib.request.Request(url, headers=headers or {}, data=data)
+    start = time.perf_counter()
+    try:
+        with opener.open(request) as response:
+            status, size = response.status, len(response.read())
+    except urllib.error.HTTPError as error:
+        status, size = error.code, len(error.read())
+    return time.perf_counter() - start, status, size
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[max(0, min(len(values) - 1, int(len(values) * fraction) - 1))]
+
+
+def summary(latencies, elapsed):
+    """
+    one line of throughput and latency percentiles in milliseconds
+    """
+    if not latencies:
+        return 'no requests'
+    return '{:8.1f} req/s p50 {:7.2f} ms p99 {:7.2f} ms'.format(
+        len(latencies) / elapsed, statistics.median(latencies) * 1000,
+        percentile(latencies, 0.99) * 1000)
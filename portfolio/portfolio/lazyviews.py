@@ -0,0 +1,42 @@
+import asyncio
+
+from django.utils.module_loading import import_string
+
+
+class LazyView:
+    """
+    A view given by its dotted path and imported on its first request,
+    so loading the URLconf does not import every app's views.
+
+    The module and name are known up front for URL reversing by path,
+    any other attribute (csrf_exempt and the like) imports the view.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.__module__, self.__name__ = path.rsplit('.', 1)
+        self.__qualname__ = self.__name__
+        self._view = None
+
+    @property
+    def view(self):
+        if self._view is None:
+            self._view = import_string(self.path)
+        return self._view
+
+    @property
+    def _is_coroutine(self):
+        # the marker asyncio.iscoroutinefunction() looks for, so the handler awaits async views
+        return asyncio.coroutines._is_coroutine if asyncio.iscoroutinefunction(self.view) else None
+
+    def __call__(self, request, *args, **kwargs):
+        return self.view(request, *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.view, name)
+
+    def __repr__(self):
+        return '<LazyView {}>'.format(self.path)
+
+
+def lazy(path):
+    return LazyView(path)
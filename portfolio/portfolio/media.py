@@ -0,0 +1,139 @@
+"""
+Serves user uploads from MEDIA_ROOT.
+
+Full files go out as a FileResponse so WSGI servers with a file wrapper
+(gunicorn, uwsgi) hand them to os.sendfile, single byte ranges are
+honoured, and ETag/Last-Modified allow conditional requests. When
+MEDIA_ACCEL is set the body is left to the front end server through
+X-Accel-Redirect (nginx) or X-Sendfile (apache, lighttpd).
+"""
+
+import mimetypes
+import os
+import re
+import stat
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class FileRange:
+    """
+    read only view of one byte range of an open file, reads stop at the
+    range end for servers that iterate the body, while fileno() and the
+    file offset let a sendfile based file wrapper (gunicorn) send the
+    range straight from the kernel, bounded by Content-Length
+    """
+    def __init__(self, file, start, length):
+        self.file = file
+        self.name = file.name
+        self.remaining = length
+        file.seek(start)
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        chunk = self.file.read(size)
+        self.remaining -= len(chunk)
+        return chunk
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def parse_range(header, size):
+    """
+    (start, length) for a single `bytes=` range, None when the header is
+    absent or asks for several ranges, ValueError when unsatisfiable
+    """
+    match = RANGE_RE.match(header or '')
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # suffix range, the last n bytes
+        length = min(int(last), size)
+        if length == 0:
+            raise ValueError('empty suffix range')
+        return size - length, length
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        raise ValueError('range not satisfiable')
+    return start, end - start + 1
+
+
+def _accel_response(path, full_path):
+    response = HttpResponse()
+    # let the front end server pick the content type from the file
+    del response['Content-Type']
+    if settings.MEDIA_ACCEL == 'x-accel-redirect':
+        response['X-Accel-Redirect'] = settings.MEDIA_ACCEL_PREFIX + path
+    else:
+        response['X-Sendfile'] = full_path
+    return response
+
+
+@require_safe
+def serve_media(request, path):
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404('"{}" does not exist'.format(path))
+    try:
+        st = os.stat(full_path)
+    except OSError:
+        raise Http404('"{}" does not exist'.format(path))
+    if not stat.S_ISREG(st.st_mode):
+        raise Http404('"{}" does not exist'.format(path))
+
+    if settings.MEDIA_ACCEL:
+        return _accel_response(path, full_path)
+
+    etag = '"{:x}-{:x}"'.format(st.st_mtime_ns, st.st_size)
+    last_modified = http_date(st.st_mtime)
+    response = get_conditional_response(request, etag=etag, last_modified=int(st.st_mtime))
+    if response is not None:
+        if response.status_code == 304:
+            response['ETag'] = etag
+            response['Last-Modified'] = last_modified
+        return response
+
+    byte_range = None
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range or if_range in (etag, last_modified):
+        try:
+            byte_range = parse_range(request.META.get('HTTP_RANGE'), st.st_size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = 'bytes */{}'.format(st.st_size)
+            return response
+
+    content_type, encoding = mimetypes.guess_type(full_path)
+    content_type = content_type or 'application/octet-stream'
+    if byte_range is None:
+        response = FileResponse(open(full_path, 'rb'), content_type=content_type)
+    else:
+        start, length = byte_range
+        response = FileResponse(FileRange(open(full_path, 'rb'), start, length), status=206,
+                                content_type=content_type)
+        response['Content-Length'] = str(length)
+        response['Content-Range'] = 'bytes {}-{}/{}'.format(start, start + length - 1, st.st_size)
+    if encoding:
+        response['Content-Encoding'] = encoding
+    response['ETag'] = etag
+    response['Last-Modified'] = last_modified
+    response['Accept-Ranges'] = 'bytes'
+    return response
@@ -0,0 +1,364 @@
+"""
+Request latency metrics shared by every worker process.
+
+Each process records into its own memory mapped file under METRICS_DIR,
+one fixed 8 byte slot per series that is updated in place, so recording
+a request costs a few dict lookups and struct writes. The metrics view
+reads every file in the directory and sums them into the Prometheus text
+format. Counters and histograms of exited workers are kept so totals
+never go backwards, the in-flight gauge of an exited worker is dropped.
+Code outside the middleware records its own series with observe() and
+increment(), each name listed in HELP. /metrics answers only addresses
+in METRICS_ALLOWED_IPS and requests with the METRICS_TOKEN bearer token.
+
+METRICS_DIR should be emptied when the server starts, gunicorn's
+on_starting hook is the place for it, and can live on a tmpfs.
+"""
+
+import asyncio
+import bisect
+import glob
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.utils.crypto import constant_time_compare
+
+# seconds, the Prometheus client defaults
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float('inf'))
+
+METHODS = {'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'}
+
+DURATION = 'http_request_duration_seconds'
+RESPONSES = 'http_responses_total'
+IN_FLIGHT = 'http_requests_in_flight'
+HASH_DURATION = 'password_hash_duration_seconds'
+HASH_REJECTED = 'password_hash_rejected_total'
+
+HELP = {
+    DURATION: ('histogram', 'Time from the request reaching Django to the response leaving it.'),
+    RESPONSES: ('counter', 'Responses by view, method and status code.'),
+    IN_FLIGHT: ('gauge', 'Requests being handled right now.'),
+    HASH_DURATION: ('histogram', 'Time a password hash or check took on the hashing pool, by operation.'),
+    HASH_REJECTED: ('counter', 'Password hashing calls turned away, by reason.'),
+}
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+INITIAL_SIZE = 64 * 1024
+HEADER = struct.Struct('<I4x')
+LENGTH = struct.Struct('<I')
+VALUE = struct.Struct('<d')
+
+
+def entries(data, used):
+    """
+    (key, value, value offset) of every slot in a metrics file, a slot is
+    the key length, the utf-8 key padded to 8 bytes and a double
+    """
+    offset = HEADER.size
+    while offset < used:
+        length = LENGTH.unpack_from(data, offset)[0]
+        key = bytes(data[offset + LENGTH.size:offset + LENGTH.size + length]).decode()
+        offset += LENGTH.size + length
+        offset += -offset % 8
+        yield key, VALUE.unpack_from(data, offset)[0], offset
+        offset += VALUE.size
+
+
+class ProcessFile:
+    """
+    the metrics file of the current process, slots are appended as new
+    series show up and never move, the used size in the header is only
+    raised once a slot is complete so readers never see half of one
+    """
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'a+b')
+        size = os.fstat(self._file.fileno()).st_size
+        if size == 0:
+            self._file.truncate(INITIAL_SIZE)
+            size = INITIAL_SIZE
+        self._map = mmap.mmap(self._file.fileno(), size)
+        self._used = HEADER.unpack_from(self._map, 0)[0] or HEADER.size
+        self.slots = {key: offset for key, _, offset in entries(self._map, self._used)}
+
+    def slot(self, key):
+        """
+        offset of the value for `key`, allocating the slot on first use
+        """
+        offset = self.slots.get(key)
+        if offset is None:
+            encoded = key.encode()
+            offset = self._used + LENGTH.size + len(encoded)
+            offset += -offset % 8
+            end = offset + VALUE.size
+            if end > len(self._map):
+                self._grow(end)
+            LENGTH.pack_into(self._map, self._used, len(encoded))
+            self._map[self._used + LENGTH.size:self._used + LENGTH.size + len(encoded)] = encoded
+            VALUE.pack_into(self._map, offset, 0.0)
+            self._used = end
+            HEADER.pack_into(self._map, 0, end)
+            self.slots[key] = offset
+        return offset
+
+    def _grow(self, needed):
+        size = len(self._map)
+        while size < needed:
+            size *= 2
+        self._map.close()
+        self._file.truncate(size)
+        self._map = mmap.mmap(self._file.fileno(), size)
+
+    def add(self, offset, amount):
+        VALUE.pack_into(self._map, offset, VALUE.unpack_from(self._map, offset)[0] + amount)
+
+    def set(self, offset, value):
+        VALUE.pack_into(self._map, offset, value)
+
+
+def series_key(name, labels):
+    return json.dumps([name, labels])
+
+
+class Recorder:
+    """
+    records requests of one process into its file in `directory`
+    """
+    def __init__(self, directory):
+        self.directory = directory
+        self.pid = os.getpid()
+        os.makedirs(directory, exist_ok=True)
+        self.file = ProcessFile(os.path.join(directory, '{}.db'.format(self.pid)))
+        self.lock = threading.Lock()
+        # (view, method, status, bucket) -> value offsets, skips building keys per request
+        self._offsets = {}
+        with self.lock:
+            self._in_flight = self.file.slot(series_key(IN_FLIGHT, []))
+            # left over by an earlier process with the same pid
+            self.file.set(self._in_flight, 0)
+
+    def started(self):
+        with self.lock:
+            self.file.add(self._in_flight, 1)
+
+    def finished(self, view, method, status, seconds):
+        if method not in METHODS:
+            method = 'other'
+        bucket = bisect.bisect_left(BUCKETS, seconds)
+        series = (view, method, status, bucket)
+        with self.lock:
+            offsets = self._offsets.get(series)
+            if offsets is None:
+                offsets = self._offsets[series] = self._allocate(*series)
+            bucket_offset, sum_offset, status_offset = offsets
+            self.file.add(bucket_offset, 1)
+            self.file.add(sum_offset, seconds)
+            self.file.add(status_offset, 1)
+            self.file.add(self._in_flight, -1)
+
+    def _allocate(self, view, method, status, bucket):
+        labels = [['view', view], ['method', method]]
+        return (
+            self.file.slot(series_key(DURATION + '_bucket', labels + [['bucket', bucket]])),
+            self.file.slot(series_key(DURATION + '_sum', labels)),
+            self.file.slot(series_key(RESPONSES, labels + [['status', str(status)]])),
+        )
+
+    def observe(self, name, seconds, labels=()):
+        """
+        adds `seconds` to the histogram `name`, labels are (name, value) pairs
+        """
+        bucket = bisect.bisect_left(BUCKETS, seconds)
+        series = (name, labels, bucket)
+        with self.lock:
+            offsets = self._offsets.get(series)
+            if offsets is None:
+                pairs = [list(pair) for pair in labels]
+                offsets = self._offsets[series] = (
+                    self.file.slot(series_key(name + '_bucket', pairs + [['bucket', bucket]])),
+                    self.file.slot(series_key(name + '_sum', pairs)),
+                )
+            self.file.add(offsets[0], 1)
+            self.file.add(offsets[1], seconds)
+
+    def increment(self, name, labels=(), amount=1):
+        series = (name, labels)
+        with self.lock:
+            offset = self._offsets.get(series)
+            if offset is None:
+                offset = self._offsets[series] = self.file.slot(series_key(name, [list(pair) for pair in labels]))
+            self.file.add(offset, amount)
+
+
+# directory -> Recorder of this process, one per file so the in-flight
+# gauge is only zeroed when the process first opens its file
+_recorders = {}
+_recorders_lock = threading.Lock()
+
+
+def recorder():
+    """
+    the Recorder of this process, created again after a fork
+    """
+    directory = settings.METRICS_DIR
+    current = _recorders.get(directory)
+    if current is None or current.pid != os.getpid():
+        # the first requests of a threaded worker arrive together
+        with _recorders_lock:
+            current = _recorders.get(directory)
+            if current is None or current.pid != os.getpid():
+                current = _recorders[directory] = Recorder(directory)
+    return current
+
+
+def view_name(request):
+    match = request.resolver_match
+    return match.view_name if match is not None else 'unmatched'
+
+
+class MetricsMiddleware:
+    """
+    times every request from the top of the middleware stack, put it first
+    in MIDDLEWARE, the time to send a streamed body is not included
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            # the handler awaits this middleware instead of running it in a thread
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics = recorder()
+        metrics.started()
+        start = time.perf_counter()
+        status = 500
+        try:
+            response = self.get_response(request)
+            status = response.status_code
+            return response
+        finally:
+            metrics.finished(view_name(request), request.method, status, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        metrics = recorder()
+        metrics.started()
+        start = time.perf_counter()
+        status = 500
+        try:
+            response = await self.get_response(request)
+            status = response.status_code
+            return response
+        finally:
+            metrics.finished(view_name(request), request.method, status, time.perf_counter() - start)
+
+
+def alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def collect(directory):
+    """
+    series key -> value summed over the files of every process
+    """
+    totals = defaultdict(float)
+    for path in glob.glob(os.path.join(directory, '*.db')):
+        pid = int(os.path.basename(path)[:-len('.db')])
+        with open(path, 'rb') as process_file:
+            data = process_file.read()
+        if len(data) < HEADER.size:
+            continue
+        live = alive(pid)
+        for key, value, _ in entries(data, HEADER.unpack_from(data, 0)[0]):
+            if live or not key.startswith('["{}"'.format(IN_FLIGHT)):
+                totals[key] += value
+    return totals
+
+
+def format_value(value):
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join('{}="{}"'.format(
+        name, str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n'))
+        for name, value in labels) + '}'
+
+
+def exposition(totals):
+    """
+    the Prometheus text format of collected totals, histogram buckets are
+    stored by index with a count each and made cumulative here
+    """
+    series = defaultdict(list)
+    # histogram name -> (formatted labels, labels) -> count per bucket
+    histograms = defaultdict(lambda: defaultdict(lambda: [0.0] * len(BUCKETS)))
+    sums = {}
+    for key, value in totals.items():
+        name, labels = json.loads(key)
+        base, _, suffix = name.rpartition('_')
+        if suffix == 'bucket' and base in HELP:
+            histograms[base][format_labels(labels[:-1]), tuple(map(tuple, labels[:-1]))][labels[-1][1]] += value
+        elif suffix == 'sum' and base in HELP:
+            sums[base, format_labels(labels)] = value
+        else:
+            series[name].append((format_labels(labels), value))
+    series.setdefault(IN_FLIGHT, [('', 0.0)])
+
+    lines = []
+    for name, (kind, text) in HELP.items():
+        lines.append('# HELP {} {}'.format(name, text))
+        lines.append('# TYPE {} {}'.format(name, kind))
+        if kind == 'histogram':
+            for (formatted, labels), counts in sorted(histograms[name].items()):
+                cumulative = 0
+                for le, count in zip(BUCKETS, counts):
+                    cumulative += count
+                    le = '+Inf' if le == float('inf') else repr(le)
+                    lines.append('{}_bucket{} {}'.format(
+                        name, format_labels(list(labels) + [('le', le)]), format_value(cumulative)))
+                lines.append('{}_sum{} {!r}'.format(name, formatted, sums.get((name, formatted), 0.0)))
+                lines.append('{}_count{} {}'.format(name, formatted, format_value(cumulative)))
+        else:
+            for formatted, value in sorted(series[name]):
+                lines.append('{}{} {}'.format(name, formatted, format_value(value)))
+    return '\n'.join(lines) + '\n'
+
+
+def allowed(request):
+    """
+    a request from an address in METRICS_ALLOWED_IPS or carrying the
+    METRICS_TOKEN bearer token, the address is the peer's, a reverse
+    proxy on the same host would make everyone look local
+    """
+    if request.META.get('REMOTE_ADDR') in settings.METRICS_ALLOWED_IPS:
+        return True
+    token = settings.METRICS_TOKEN
+    return bool(token) and constant_time_compare(request.headers.get('Authorization', ''), 'Bearer ' + token)
+
+
+def metrics_view(request):
+    if not allowed(request):
+        # the same answer as a missing page, nothing to probe for
+        raise Http404
+    return HttpResponse(exposition(collect(settings.METRICS_DIR)), content_type=CONTENT_TYPE)
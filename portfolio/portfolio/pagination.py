@@ -0,0 +1,49 @@
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+def estimate_count(queryset):
+    """
+    the planner's row estimate for `queryset`, None when the backend has
+    no cheap estimate for it
+    """
+    connection = connections[queryset.db]
+    query = queryset.query
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            if not query.where:
+                cursor.execute('SELECT reltuples FROM pg_class WHERE oid = %s::regclass',
+                               [queryset.model._meta.db_table])
+                row = cursor.fetchone()
+                # -1 until the table was first analyzed
+                return int(row[0]) if row and row[0] >= 0 else None
+            sql, params = query.sql_with_params()
+            cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+            return int(cursor.fetchone()[0][0]['Plan']['Plan Rows'])
+        pk = queryset.model._meta.pk
+        if not query.where and pk.get_internal_type() in ('AutoField', 'BigAutoField'):
+            # ids only grow, the highest one bounds the row count
+            cursor.execute('SELECT MAX({}) FROM {}'.format(
+                connection.ops.quote_name(pk.column),
+                connection.ops.quote_name(queryset.model._meta.db_table)))
+            return cursor.fetchone()[0] or 0
+    return None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator trusting the database's row estimate for large results, an
+    exact COUNT(*) over millions of rows costs more than the page itself.
+    Results estimated under `exact_below` rows are still counted exactly.
+    """
+    exact_below = 10000
+
+    @cached_property
+    def count(self):
+        estimate = None
+        if hasattr(self.object_list, 'query'):
+            estimate = estimate_count(self.object_list)
+        if estimate is None or estimate < self.exact_below:
+            return super().count
+        return estimate
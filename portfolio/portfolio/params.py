@@ -0,0 +1,28 @@
+"""
+Query parameters of the json apis, a value that can't be used raises
+BadRequest for the view to answer with a 400.
+"""
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+
+class BadRequest(ValueError):
+    pass
+
+
+def int_param(request, name, default=None):
+    value = request.GET.get(name)
+    if value in (None, ''):
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise BadRequest('{} must be an integer'.format(name))
+
+
+def limit_param(request):
+    """
+    the page size asked for, clamped to 1..MAX_LIMIT
+    """
+    return max(1, min(int_param(request, 'limit', DEFAULT_LIMIT), MAX_LIMIT))
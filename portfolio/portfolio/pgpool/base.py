@@ -0,0 +1,142 @@
+"""
+PostgreSQL backend with connection health checks and an optional
+in-process connection pool.
+
+Set ENGINE to 'portfolio.pgpool' and configure it through OPTIONS:
+
+    'health_checks': True
+        ping a reused connection before its first query in a request and
+        reconnect if the server went away, meant for CONN_MAX_AGE > 0
+    'pool': {'min_size': 2, 'max_size': 20, 'timeout': 10}
+        share connections between the threads of a worker, Django returns
+        them to the pool at the end of each request (use CONN_MAX_AGE = 0),
+        a thread waits up to `timeout` seconds when all are checked out
+"""
+
+import os
+import threading
+from collections import deque
+
+from django.db.backends.postgresql import base
+from psycopg2 import extensions
+
+Database = base.Database
+
+# one pool per database per process, created lazily so forked workers never share sockets
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class ConnectionPool:
+    def __init__(self, connect, min_size=1, max_size=10, timeout=10, health_checks=True):
+        self.connect = connect
+        self.timeout = timeout
+        self.health_checks = health_checks
+        self.pid = os.getpid()
+        self._idle = deque()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_size)
+        for _ in range(min_size):
+            self._idle.append(connect())
+
+    def is_usable(self, connection):
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+        except Database.Error:
+            return False
+        return True
+
+    def getconn(self):
+        if not self._slots.acquire(timeout=self.timeout):
+            raise Database.OperationalError(
+                'connection pool exhausted, no connection freed within {}s'.format(self.timeout))
+        try:
+            while True:
+                with self._lock:
+                    connection = self._idle.pop() if self._idle else None
+                if connection is None:
+                    return self.connect()
+                if not connection.closed and (not self.health_checks or self.is_usable(connection)):
+                    return connection
+                connection.close()
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def putconn(self, connection):
+        try:
+            if connection.closed:
+                return
+            status = connection.info.transaction_status
+            if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+                connection.close()
+                return
+            if status != extensions.TRANSACTION_STATUS_IDLE:
+                connection.rollback()
+            with self._lock:
+                self._idle.append(connection)
+        finally:
+            self._slots.release()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.health_check_pending = False
+
+    @property
+    def pool_options(self):
+        return self.settings_dict['OPTIONS'].get('pool')
+
+    @property
+    def health_checks(self):
+        return self.settings_dict['OPTIONS'].get('health_checks', False)
+
+    def get_connection_params(self):
+        conn_params = super().get_connection_params()
+        conn_params.pop('pool', None)
+        conn_params.pop('health_checks', None)
+        return conn_params
+
+    def get_pool(self, conn_params):
+        key = (self.alias, self.settings_dict['NAME'])
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None or pool.pid != os.getpid():
+                options = self.pool_options
+                pool = _pools[key] = ConnectionPool(
+                    lambda: super(DatabaseWrapper, self).get_new_connection(conn_params),
+                    min_size=options.get('min_size', 1),
+                    max_size=options.get('max_size', 10),
+                    timeout=options.get('timeout', 10),
+                    health_checks=self.health_checks,
+                )
+        return pool
+
+    def get_new_connection(self, conn_params):
+        if not self.pool_options:
+            return super().get_new_connection(conn_params)
+        self.isolation_level = self.settings_dict['OPTIONS'].get(
+            'isolation_level', extensions.ISOLATION_LEVEL_READ_COMMITTED)
+        return self.get_pool(conn_params).getconn()
+
+    def _close(self):
+        if self.connection is not None and self.pool_options:
+            with self.wrap_database_errors:
+                return self.get_pool(self.get_connection_params()).putconn(self.connection)
+        return super()._close()
+
+    def close_if_unusable_or_obsolete(self):
+        super().close_if_unusable_or_obsolete()
+        # runs at the start and end of each request, the ping itself waits
+        # for the first query so requests that never touch the db skip it
+        if self.connection is not None and self.health_checks:
+            self.health_check_pending = True
+
+    def ensure_connection(self):
+        if self.health_check_pending and self.connection is not None:
+            self.health_check_pending = False
+            if not self.in_atomic_block and not self.is_usable():
+                self.close()
+        super().ensure_connection()
@@ -0,0 +1,271 @@
+"""
+On demand profiling of single requests in production.
+
+ProfilingMiddleware profiles a PROFILING_SAMPLE_RATE fraction of all
+requests, and any request carrying an X-Profile header made with
+`manage.py profile_token`. The header is signed with SECRET_KEY and
+expires, so it can be handed out without letting anyone slow the site
+down at will.
+
+Two modes:
+- 'sample' (the default) wakes a thread every PROFILING_INTERVAL
+  seconds that records the stack of the profiled request, written as
+  collapsed stacks (<view>/<id>.folded), ready for flamegraph.pl or
+  speedscope. It barely slows the request down.
+- 'cprofile' traces every call with cProfile and writes pstats
+  (<view>/<id>.prof), exact call counts at several times the cost.
+
+`manage.py profile_report` merges the artifacts of each view.
+"""
+
+import asyncio
+import contextvars
+import cProfile
+import marshal
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core import signing
+
+from .metrics import view_name
+
+HEADER = 'X-Profile'
+SALT = 'portfolio.profiling'
+MODES = ('sample', 'cprofile')
+EXTENSIONS = {'sample': '.folded', 'cprofile': '.prof'}
+
+
+def make_token(mode='sample'):
+    """
+    a value for the X-Profile header, valid for PROFILING_TOKEN_MAX_AGE seconds
+    """
+    if mode not in MODES:
+        raise ValueError('unknown profiling mode {!r}'.format(mode))
+    return signing.dumps({'mode': mode}, salt=SALT)
+
+
+def requested_mode(request):
+    """
+    the mode a valid X-Profile header asks for, None without one
+    """
+    token = request.headers.get(HEADER)
+    if not token:
+        return None
+    try:
+        mode = signing.loads(token, salt=SALT, max_age=settings.PROFILING_TOKEN_MAX_AGE)['mode']
+    except (signing.BadSignature, KeyError, TypeError):
+        return None
+    return mode if mode in MODES else None
+
+
+def frame_name(frame):
+    return '{}:{}'.format(frame.f_globals.get('__name__', '?'), frame.f_code.co_name)
+
+
+class StackSampler:
+    """
+    counts the collapsed stacks of the attached threads, each below the
+    frame it was attached at, every `interval` seconds until stopped
+    """
+    def __init__(self, interval):
+        self.interval = interval
+        self.stacks = Counter()
+        # thread id -> frame the stacks of that thread are cut at
+        self.threads = {}
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+
+    def attach(self, top):
+        self.threads[threading.get_ident()] = top
+
+    def detach(self):
+        self.threads.pop(threading.get_ident(), None)
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            frames = sys._current_frames()
+            for thread_id, top in list(self.threads.items()):
+                frame = frames.get(thread_id)
+                names = []
+                while frame is not None and frame is not top:
+                    names.append(frame_name(frame))
+                    frame = frame.f_back
+                if names:
+                    self.stacks[';'.join(reversed(names))] += 1
+
+    def write(self, output):
+        for stack, count in self.stacks.most_common():
+            output.write('{} {}\n'.format(stack, count).encode())
+
+
+class CProfiler:
+    """
+    cProfile of the attached threads, cProfile only traces the thread that
+    enabled it, so every thread gets a profile of its own and they are
+    merged with pstats when written
+    """
+    def __init__(self):
+        # thread id -> [profile or None, attach depth]
+        self.threads = {}
+        self.profiles = []
+        self._lock = threading.Lock()
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def attach(self, top):
+        entry = self.threads.get(threading.get_ident())
+        if entry is not None:
+            # run_profiled on the thread the middleware already attached
+            entry[1] += 1
+            return
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # python 3.12+ allows one active profiler per process, the one
+            # already enabled sees the calls of every thread
+            profile = None
+        self.threads[threading.get_ident()] = [profile, 1]
+
+    def detach(self):
+        entry = self.threads.get(threading.get_ident())
+        if entry is None:
+            return
+        entry[1] -= 1
+        if entry[1]:
+            return
+        del self.threads[threading.get_ident()]
+        if entry[0] is not None:
+            entry[0].disable()
+            with self._lock:
+                self.profiles.append(entry[0])
+
+    def write(self, output):
+        with self._lock:
+            profiles = list(self.profiles)
+        stats = pstats.Stats(*profiles).stats if profiles else {}
+        output.write(marshal.dumps(stats))
+
+
+# the profiler of the request being handled, async views carry it into the
+# threads that run their sync code
+_current = contextvars.ContextVar('profiler', default=None)
+
+
+def run_profiled(function, *args, **kwargs):
+    """
+    calls `function`, in the profile of the current request if that is
+    being profiled, for code an async view hands to another thread
+    """
+    profiler = _current.get()
+    if profiler is None:
+        return function(*args, **kwargs)
+    profiler.attach(sys._getframe())
+    try:
+        return function(*args, **kwargs)
+    finally:
+        profiler.detach()
+
+
+def artifact_path(view, mode):
+    """
+    a new file for one profiled request of `view`, ordered by time
+    """
+    directory = os.path.join(settings.PROFILING_DIR, view.replace(os.sep, '_'))
+    os.makedirs(directory, exist_ok=True)
+    name = '{}-{}-{}{}'.format(time.time_ns(), os.getpid(), threading.get_ident(), EXTENSIONS[mode])
+    return os.path.join(directory, name)
+
+
+class ProfilingMiddleware:
+    """
+    profiles sampled or X-Profile requests, one at a time per process so
+    an unlucky run of samples can not stack the overhead up, under ASGI
+    only the sync code run through portfolio.asyncdb is profiled
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.busy = threading.Lock()
+        if asyncio.iscoroutinefunction(get_response):
+            # the handler awaits this middleware instead of running it in a thread
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def start(self, request):
+        """
+        (profiler, mode, triggered) for a request to profile, None for the rest
+        """
+        mode = requested_mode(request)
+        triggered = mode is not None
+        if mode is None and settings.PROFILING_SAMPLE_RATE and random.random() < settings.PROFILING_SAMPLE_RATE:
+            mode = settings.PROFILING_MODE
+        if mode is None or not self.busy.acquire(blocking=False):
+            return None
+        profiler = StackSampler(settings.PROFILING_INTERVAL) if mode == 'sample' else CProfiler()
+        profiler.start()
+        return profiler, mode, triggered
+
+    def finish(self, request, response, profiler, mode, triggered):
+        profiler.stop()
+        self.busy.release()
+        path = artifact_path(view_name(request), mode)
+        with open(path + '.tmp', 'wb') as output:
+            profiler.write(output)
+        os.replace(path + '.tmp', path)
+        if triggered:
+            response['X-Profile-Artifact'] = os.path.relpath(path, settings.PROFILING_DIR)
+        return response
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self):
+            return self.__acall__(request)
+        profiling = self.start(request)
+        if profiling is None:
+            return self.get_response(request)
+        profiler = profiling[0]
+        token = _current.set(profiler)
+        profiler.attach(sys._getframe())
+        try:
+            response = self.get_response(request)
+        except BaseException:
+            profiler.stop()
+            self.busy.release()
+            raise
+        finally:
+            profiler.detach()
+            _current.reset(token)
+        return self.finish(request, response, *profiling)
+
+    async def __acall__(self, request):
+        profiling = self.start(request)
+        if profiling is None:
+            return await self.get_response(request)
+        token = _current.set(profiling[0])
+        try:
+            response = await self.get_response(request)
+        except BaseException:
+            profiling[0].stop()
+            self.busy.release()
+            raise
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, *profiling)
@@ -0,0 +1,147 @@
+"""
+Per client budgets for the routes anyone can post to.
+
+RateLimitMiddleware keeps a token bucket per url name and client address
+for the url names in RATELIMITS. A client may send a burst of `requests`
+posts, after that one more every `seconds / requests`. Past its budget
+a post gets a 429 with Retry-After before the csrf check, the body
+parsing or the view run.
+
+The buckets live in a fixed size table in RATELIMIT_FILE that every
+worker process on the host maps, so a budget holds however the requests
+are spread over the workers. A check hashes its key to a slot and looks
+at PROBES slots from there under a lock on just those bytes, its cost
+does not depend on how many clients there are and the file never grows.
+A new key takes an empty slot or the one idle the longest, with more than
+RATELIMIT_SLOTS clients posting at once an evicted client starts over
+with a full bucket.
+"""
+
+import hashlib
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.deprecation import MiddlewareMixin
+
+try:
+    import fcntl
+except ImportError:
+    # windows, where only the single process development server runs
+    fcntl = None
+
+LIMITED_METHODS = {'POST', 'PUT', 'PATCH', 'DELETE'}
+
+# slots looked at per key
+PROBES = 4
+# hash of the key, tokens left, time.time() they were counted at
+SLOT = struct.Struct('<Qdd')
+
+
+def key_hash(key):
+    # 0 marks an empty slot
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), 'little') or 1
+
+
+class BucketTable:
+    """
+    token buckets of up to `slots` keys in the file at `path`, shared with
+    every process that maps the same file
+    """
+    def __init__(self, path, slots):
+        self.path = path
+        self.slots = slots
+        self.pid = os.getpid()
+        self._file = open(path, 'a+b')
+        # the probes of the last slot run past it instead of wrapping around
+        size = (slots + PROBES - 1) * SLOT.size
+        if os.fstat(self._file.fileno()).st_size < size:
+            self._file.truncate(size)
+        self._map = mmap.mmap(self._file.fileno(), size)
+        # fcntl locks belong to the process, its threads queue up here first
+        self.lock = threading.Lock()
+
+    def take(self, key, capacity, per_second, now=None):
+        """
+        spends a token from the bucket of `key`, returns 0 if it had one
+        and otherwise the seconds until it will
+        """
+        now = time.time() if now is None else now
+        digest = key_hash(key)
+        start = digest % self.slots * SLOT.size
+        length = PROBES * SLOT.size
+        with self.lock:
+            if fcntl is not None:
+                fcntl.lockf(self._file, fcntl.LOCK_EX, length, start)
+            try:
+                offset, tokens = self._find(digest, start, length, now, capacity, per_second)
+                if tokens >= 1:
+                    SLOT.pack_into(self._map, offset, digest, tokens - 1, now)
+                    return 0
+                SLOT.pack_into(self._map, offset, digest, tokens, now)
+                return (1 - tokens) / per_second
+            finally:
+                if fcntl is not None:
+                    fcntl.lockf(self._file, fcntl.LOCK_UN, length, start)
+
+    def _find(self, digest, start, length, now, capacity, per_second):
+        """
+        (offset, tokens now) of the slot for `digest`, an empty or the
+        longest idle slot with a full bucket if it has none
+        """
+        idle, idle_since = start, None
+        for offset in range(start, start + length, SLOT.size):
+            slot_digest, tokens, counted = SLOT.unpack_from(self._map, offset)
+            if slot_digest == digest:
+                return offset, min(capacity, tokens + (now - counted) * per_second)
+            # an empty slot was counted at 0
+            if idle_since is None or counted < idle_since:
+                idle, idle_since = offset, counted
+        return idle, capacity
+
+
+_table = None
+
+
+def table():
+    """
+    the BucketTable of this process, opened again after a fork
+    """
+    global _table
+    if _table is None or _table.pid != os.getpid() or _table.path != settings.RATELIMIT_FILE:
+        _table = BucketTable(settings.RATELIMIT_FILE, settings.RATELIMIT_SLOTS)
+    return _table
+
+
+def client_address(request):
+    header = settings.RATELIMIT_CLIENT_HEADER
+    address = request.META.get(header) if header else None
+    return address or request.META.get('REMOTE_ADDR', '')
+
+
+class RateLimitMiddleware(MiddlewareMixin):
+    """
+    turns away posts over their route's budget, put it ahead of
+    CsrfViewMiddleware so a rejected request is never parsed
+    """
+    def process_view(self, request, view, args, kwargs):
+        if request.method not in LIMITED_METHODS:
+            return None
+        name = request.resolver_match.view_name
+        budget = settings.RATELIMITS.get(name)
+        if budget is None:
+            return None
+        requests, seconds = budget
+        wait = table().take('{}:{}'.format(name, client_address(request)), requests, requests / seconds)
+        if not wait:
+            return None
+        retry_after = math.ceil(wait)
+        response = HttpResponse('Too many requests, please try again in {} seconds\n'.format(retry_after),
+                                status=429, content_type='text/plain; charset=utf-8')
+        response['Retry-After'] = str(retry_after)
+        return response
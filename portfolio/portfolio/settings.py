@@ -46,19 +46,24 @@ INSTALLED_APPS = [
     'employee_register',
     'register',
     'product',
+    'ops',
     'fontawesomefree'
 ]
 
 CRISPY_TEMPLATE_PACK = 'bootstrap4'
 
 MIDDLEWARE = [
+    'portfolio.metrics.MetricsMiddleware',
+    'portfolio.profiling.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
+    'portfolio.ratelimit.RateLimitMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'register.middleware.HashingBusyMiddleware',
 ]
 
 ROOT_URLCONF = 'portfolio.urls'
@@ -75,6 +80,9 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
             ],
+            'libraries': {
+                'assets': 'portfolio.templatetags.assets',
+            },
         },
     },
 ]
@@ -85,17 +93,110 @@ WSGI_APPLICATION = 'portfolio.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/3.0/ref/settings/#databases
 
+# portfolio.pgpool is the postgresql backend plus connection health checks
+# and an optional in-process pool, to pool instead of keeping one persistent
+# connection per thread set CONN_MAX_AGE to 0 and add to OPTIONS
+#   'pool': {'min_size': 2, 'max_size': 20, 'timeout': 10}
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': 'portfolio.pgpool',
         'NAME': 'portfoliodb',
         'USER': 'postgres',
         'PASSWORD': 'learningdjango',
         'HOST': 'localhost',
-        'PORT': '5432'
+        'PORT': '5432',
+        'CONN_MAX_AGE': 60,
+        'OPTIONS': {
+            'health_checks': True,
+        },
     }
 }
 
+# threads async views run their queries on, each keeps its own connection
+ASYNC_DB_THREADS = 16
+# the read views are async only when this is on, portfolio.asgi turns it
+# on, under WSGI the sync views are faster
+ASYNC_VIEWS = os.environ.get('ASYNC_VIEWS', '') == '1'
+
+
+# Cache
+# https://docs.djangoproject.com/en/3.0/topics/cache/
+# file based so every worker process on the host shares it
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(BASE_DIR, '.cache'),
+    }
+}
+
+
+# Sessions and authentication
+# sessions are written through to the db and read from the cache, the
+# backend caches the logged in user until the user row changes
+
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+AUTHENTICATION_BACKENDS = ['register.backends.CachedModelBackend']
+
+# pbkdf2 runs on a bounded pool, logins beyond workers + queue are turned
+# away with a 503 instead of starving the other views
+PASSWORD_HASHERS = [
+    'register.hashers.PooledPBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+]
+
+PASSWORD_HASHING_WORKERS = 2
+PASSWORD_HASHING_QUEUE = 8
+PASSWORD_HASHING_TIMEOUT = 10
+
+# signup photos are streamed into storage and rejected past this size,
+# then scaled down to REGISTRATION_PHOTO_MAX_SIZE pixels in the background
+REGISTRATION_PHOTO_MAX_BYTES = 10 * 1024 * 1024
+REGISTRATION_PHOTO_MAX_SIZE = 1600
+
+# seconds browsers and reverse proxies may reuse the public job pages, they
+# revalidate with the ETag afterwards and get a 304 until a Job changes
+JOBS_PAGE_MAX_AGE = 60
+# names the release in cache keys and ETags of cached pages, so a deploy
+# never serves pages rendered by the old templates, left empty it is a
+# hash of the code, templates and static manifest
+BUILD_ID = os.environ.get('BUILD_ID', '')
+
+# every worker process records request metrics into its own file here,
+# served summed up at /metrics, empty it when the server starts
+METRICS_DIR = os.path.join(BASE_DIR, '.metrics')
+# /metrics answers the peer addresses listed here, such as the Prometheus
+# server's, and requests with an `Authorization: Bearer <METRICS_TOKEN>`
+# header, everyone else gets a 404
+METRICS_ALLOWED_IPS = []
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
+# fraction of requests profiled into PROFILING_DIR, requests with an
+# X-Profile header from `manage.py profile_token` are profiled regardless
+PROFILING_SAMPLE_RATE = 0
+PROFILING_MODE = 'sample'
+PROFILING_DIR = os.path.join(BASE_DIR, '.profiles')
+# the sampler can not look more often than the interpreter switches threads
+PROFILING_INTERVAL = 0.005
+PROFILING_TOKEN_MAX_AGE = 24 * 3600
+
+# posts a client may send to a url name, a burst of `requests` that refills
+# over `seconds`, counted per client address in RATELIMIT_FILE which every
+# worker on the host maps, /dev/shm keeps it off the disk
+RATELIMITS = {
+    'discuss': (5, 600),
+    'signup': (3, 3600),
+}
+RATELIMIT_FILE = os.path.join(BASE_DIR, '.ratelimit')
+RATELIMIT_SLOTS = 65536
+# the META key a reverse proxy passes the client address in, such as
+# 'HTTP_X_REAL_IP' behind nginx, REMOTE_ADDR is used without one
+RATELIMIT_CLIENT_HEADER = None
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.0/ref/settings/#auth-password-validators
@@ -140,8 +241,35 @@ USE_TZ = False
 STATIC_URL = '/static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'static')
 
+# our css and the vendored third party files, bundled by portfolio/assets.py
+STATICFILES_DIRS = [
+    ('assets', os.path.join(BASE_DIR, 'assets', 'src')),
+    ('vendor', os.path.join(BASE_DIR, 'assets', 'vendor')),
+]
+
+STATICFILES_FINDERS = [
+    'django.contrib.staticfiles.finders.FileSystemFinder',
+    'django.contrib.staticfiles.finders.AppDirectoriesFinder',
+    'portfolio.assets.BundleFinder',
+]
+
+# hashed names plus .gz/.br next to each file, see the nginx notes in the README
+STATICFILES_STORAGE = 'portfolio.assets.CompressedManifestStaticFilesStorage'
+
+# False links every source of a bundle on its own, for debugging
+ASSETS_BUNDLE = True
+# a vendored file that is missing loads from its CDN, in development only,
+# otherwise the staticfiles check and the {% asset %} tag fail
+ASSETS_CDN_FALLBACK = DEBUG
+
 MEDIA_URL = '/media/'
-MEDIA_ROOT = BASE_DIR
+MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+# Hand media bodies to the front end server instead of sending them from
+# django: None, 'x-accel-redirect' (nginx, MEDIA_ACCEL_PREFIX must be an
+# internal location aliased to MEDIA_ROOT) or 'x-sendfile' (apache, lighttpd)
+MEDIA_ACCEL = None
+MEDIA_ACCEL_PREFIX = '/protected-media/'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.AutoField'
 
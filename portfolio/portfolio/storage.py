@@ -0,0 +1,136 @@
+import hashlib
+import os
+import re
+import tempfile
+from collections import Counter
+
+from django.apps import apps
+from django.core.files.storage import FileSystemStorage
+from django.db import models
+from django.utils.deconstruct import deconstructible
+
+BLOB_RE = re.compile(r'^[0-9a-f]{64}(\.[A-Za-z0-9]+)?$')
+
+
+class BlobWriter:
+    """
+    writes one blob a chunk at a time, hashing as it goes, commit() moves
+    it under its digest and returns the stored name
+    """
+    def __init__(self, storage, ext):
+        self.storage = storage
+        self.ext = ext
+        self.size = 0
+        self.digest = hashlib.sha256()
+        directory = storage.path(storage.prefix)
+        os.makedirs(directory, exist_ok=True)
+        fd, self.tmp_path = tempfile.mkstemp(dir=directory, prefix='.upload-')
+        self.tmp = os.fdopen(fd, 'wb')
+
+    def write(self, chunk):
+        self.digest.update(chunk)
+        self.tmp.write(chunk)
+        self.size += len(chunk)
+
+    def commit(self):
+        try:
+            self.tmp.close()
+            blob = self.storage.blob_name(self.digest.hexdigest(), self.ext)
+            full_path = self.storage.path(blob)
+            try:
+                # a fresh mtime puts a stored blob back inside gc_blobs' grace
+                # period before the new row points at it
+                os.utime(full_path)
+            except FileNotFoundError:
+                os.makedirs(os.path.dirname(full_path), exist_ok=True)
+                if self.storage.file_permissions_mode is not None:
+                    os.chmod(self.tmp_path, self.storage.file_permissions_mode)
+                os.replace(self.tmp_path, full_path)
+            else:
+                os.remove(self.tmp_path)
+        except BaseException:
+            self.abort()
+            raise
+        return blob
+
+    def abort(self):
+        self.tmp.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Stores every upload once under the sha256 of its content.
+
+    Uploads are hashed while they are streamed to a temporary file and
+    land at blobs/ab/cd/<digest><ext>, so the same file uploaded twice is
+    one blob shared by both rows. A blob's reference count is the number
+    of rows pointing at it, delete() never removes a blob another row may
+    still use, unreferenced blobs are removed by the gc_blobs command.
+    """
+    prefix = 'blobs'
+
+    def blob_name(self, digest, ext):
+        return '/'.join((self.prefix, digest[:2], digest[2:4], digest + ext.lower()))
+
+    def get_available_name(self, name, max_length=None):
+        # the name is only used for its extension, the digest decides the rest
+        return name
+
+    def writer(self, ext):
+        return BlobWriter(self, ext)
+
+    def _save(self, name, content):
+        writer = self.writer(os.path.splitext(name)[1])
+        try:
+            for chunk in content.chunks():
+                writer.write(chunk)
+        except BaseException:
+            writer.abort()
+            raise
+        return writer.commit()
+
+    def delete(self, name):
+        # other rows may share the blob, gc_blobs removes it once unreferenced
+        pass
+
+    def file_fields(self):
+        for model in apps.get_models():
+            for field in model._meta.get_fields():
+                if isinstance(field, models.FileField) and isinstance(field.storage, ContentAddressedStorage):
+                    yield model, field
+
+    def reference_counts(self):
+        """
+        rows referencing each stored name, across every model field that
+        uses this storage
+        """
+        counts = Counter()
+        for model, field in self.file_fields():
+            rows = (model._default_manager.exclude(**{field.name: ''})
+                    .values_list(field.name, flat=True))
+            counts.update(rows.iterator())
+        return counts
+
+    def blobs(self):
+        """
+        (stored names, files) for each digest, a digest may be stored under
+        more than one extension and files includes the derivatives kept
+        beside the blob such as image renditions
+        """
+        for directory, _, filenames in os.walk(self.path(self.prefix)):
+            relative = os.path.relpath(directory, self.location).replace(os.sep, '/')
+            groups = {}
+            for filename in filenames:
+                names, files = groups.setdefault(filename[:64], ([], []))
+                if BLOB_RE.match(filename):
+                    names.append(relative + '/' + filename)
+                files.append(os.path.join(directory, filename))
+            for names, files in groups.values():
+                if names:
+                    yield names, files
+
+
+blob_storage = ContentAddressedStorage()
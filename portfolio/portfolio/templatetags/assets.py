@@ -0,0 +1,37 @@
+from django import template
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.templatetags.static import static
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+
+from portfolio import assets
+
+register = template.Library()
+
+
+def _tag(bundle, url, integrity):
+    if not url.startswith(('https://', '//')):
+        url = static(url)
+    extra = format_html(' integrity="{}" crossorigin="anonymous"', integrity) if integrity else ''
+    if bundle.endswith('.css'):
+        return format_html('<link href="{}" rel="stylesheet"{}>', url, extra)
+    return format_html('<script src="{}"{}></script>', url, extra)
+
+
+@register.simple_tag
+def asset(bundle):
+    """
+    the <link> or <script> tag for a bundle from assets.BUNDLES at its
+    hashed url, or one tag per source when ASSETS_BUNDLE is off, a
+    vendored source that was not fetched loads from its CDN only with
+    ASSETS_CDN_FALLBACK on
+    """
+    missing = assets.missing(bundle)
+    if missing and not settings.ASSETS_CDN_FALLBACK:
+        raise ImproperlyConfigured(assets.missing_error(bundle))
+    if getattr(settings, 'ASSETS_BUNDLE', True) and not missing:
+        tags = [_tag(bundle, 'bundles/' + bundle, None)]
+    else:
+        tags = [_tag(bundle, *assets.source_url(source)) for source in assets.BUNDLES[bundle]]
+    return mark_safe('\n'.join(tags))
@@ -0,0 +1,134 @@
+import tempfile
+import threading
+import time
+from unittest import mock
+
+from django.core.exceptions import ImproperlyConfigured
+from django.http import Http404, HttpResponse
+from django.template import Context, Template
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from portfolio import assets, metrics
+
+
+class RecorderTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        settings = override_settings(METRICS_DIR=self.directory)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.addCleanup(metrics._recorders.clear)
+        metrics._recorders.clear()
+
+    def totals(self):
+        totals = metrics.collect(self.directory)
+        responses = sum(value for key, value in totals.items() if key.startswith('["{}"'.format(metrics.RESPONSES)))
+        return responses, totals[metrics.series_key(metrics.IN_FLIGHT, [])]
+
+    def test_first_requests_share_one_recorder(self):
+        created = []
+        recorder_class = metrics.Recorder
+
+        def slow_recorder(directory):
+            # widens the window between the check and the assignment
+            time.sleep(0.05)
+            created.append(directory)
+            return recorder_class(directory)
+
+        barrier = threading.Barrier(8)
+        found = []
+
+        def first_request():
+            barrier.wait()
+            found.append(metrics.recorder())
+
+        with mock.patch.object(metrics, 'Recorder', side_effect=slow_recorder):
+            threads = [threading.Thread(target=first_request) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(len(created), 1)
+        self.assertEqual(len(set(map(id, found))), 1)
+
+    def test_in_flight_survives_switching_directories(self):
+        metrics.recorder().started()
+        with tempfile.TemporaryDirectory() as other, override_settings(METRICS_DIR=other):
+            metrics.recorder().started()
+        self.assertEqual(self.totals(), (0, 1))
+
+    def test_threaded_requests_are_all_counted(self):
+        middleware = metrics.MetricsMiddleware(lambda request: HttpResponse())
+        request = RequestFactory().get('/')
+        request.resolver_match = None
+        barrier = threading.Barrier(8)
+
+        def worker():
+            barrier.wait()
+            for _ in range(20):
+                middleware(request)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.totals(), (160, 0))
+
+
+class MetricsAccessTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings = override_settings(METRICS_DIR=directory.name, METRICS_ALLOWED_IPS=['10.0.0.5'],
+                                     METRICS_TOKEN='scrape-token')
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def get(self, **extra):
+        request = RequestFactory().get('/metrics', **extra)
+        try:
+            return metrics.metrics_view(request).status_code
+        except Http404:
+            return 404
+
+    def test_anonymous_request_is_refused(self):
+        self.assertEqual(self.get(), 404)
+        self.assertEqual(self.get(HTTP_AUTHORIZATION='Bearer wrong'), 404)
+
+    def test_allowed_address(self):
+        self.assertEqual(self.get(REMOTE_ADDR='10.0.0.5'), 200)
+
+    def test_bearer_token(self):
+        self.assertEqual(self.get(HTTP_AUTHORIZATION='Bearer scrape-token'), 200)
+
+    def test_empty_token_opens_nothing(self):
+        with override_settings(METRICS_TOKEN=''):
+            self.assertEqual(self.get(HTTP_AUTHORIZATION='Bearer '), 404)
+
+
+class MissingVendorTests(SimpleTestCase):
+    def setUp(self):
+        # no vendored file is there
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        patcher = mock.patch.object(assets, 'ASSETS_DIR', directory.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def render(self):
+        return Template("{% load assets %}{% asset 'employees.js' %}").render(Context())
+
+    @override_settings(ASSETS_CDN_FALLBACK=False)
+    def test_missing_file_is_an_error(self):
+        with self.assertRaises(ImproperlyConfigured):
+            self.render()
+        errors = assets.BundleFinder().check()
+        self.assertEqual({error.id for error in errors}, {'assets.E001'})
+
+    @override_settings(ASSETS_CDN_FALLBACK=True)
+    def test_cdn_fallback(self):
+        self.assertIn(assets.VENDOR['jquery-3.3.1.slim.min.js'][0], self.render())
+        self.assertEqual(assets.BundleFinder().check(), [])
@@ -14,29 +14,40 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path
+from django.urls import path, re_path
 import jobs.views
-import register.views
-import employee_register.views
-from discuss import views
 from django.conf import settings
 from django.conf.urls.static import static
+from .lazyviews import lazy
+from .media import serve_media
+from .metrics import metrics_view
 
+# every app but the home page is imported on its first request, which keeps
+# worker boot and manage.py commands from loading views they never serve
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', jobs.views.experience, name='experience'),
     path('jobs/<int:job_id>', jobs.views.details, name='details'),
-    path('discuss', views.oppos, name='discuss'),
-    path('conversation', views.conversation, name='conversation'),
-    path('login', register.views.loginPage, name='login'),
-    path('signup', register.views.signup, name='signup'),
-    path('logout', register.views.logout, name='logout'),
-    path('dashboard', register.views.dashboard, name='dashboard'),
-    path('lue', employee_register.views.employee_add, name='empshowup'),
-    path('list', employee_register.views.employee_get, name='empget'),
-    path('<int:id>', employee_register.views.employee_add, name='empshowup'),
-    path('demp/<int:id>', employee_register.views.employee_delete, name='empdel')
+    path('discuss', lazy('discuss.views.oppos'), name='discuss'),
+    path('conversation', lazy('discuss.views.conversation'), name='conversation'),
+    path('login', lazy('register.views.loginPage'), name='login'),
+    path('signup', lazy('register.views.signup'), name='signup'),
+    path('logout', lazy('register.views.logout'), name='logout'),
+    path('dashboard', lazy('register.views.dashboard'), name='dashboard'),
+    path('lue', lazy('employee_register.views.employee_add'), name='empshowup'),
+    path('list', lazy('employee_register.views.employee_get'), name='empget'),
+    path('<int:id>', lazy('employee_register.views.employee_add'), name='empshowup'),
+    path('demp/<int:id>', lazy('employee_register.views.employee_delete'), name='empdel'),
+    path('demp/bulk', lazy('employee_register.views.employee_bulk_delete'), name='empbulkdel'),
+    path('lue/bulk', lazy('employee_register.views.employee_bulk_update'), name='empbulkedit'),
+    path('api/employees', lazy('employee_register.api.employee_list'), name='apiemployees'),
+    path('api/positions', lazy('employee_register.api.position_list'), name='apipositions'),
+    path('api/products', lazy('product.views.product_list'), name='apiproducts'),
+    path('api/products/<int:product_id>', lazy('product.views.product_detail'), name='apiproduct'),
+    path('metrics', metrics_view, name='metrics'),
 ]
 
 urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+urlpatterns += [
+    re_path(r'^{}(?P<path>.*)$'.format(settings.MEDIA_URL.lstrip('/')), serve_media, name='media'),
+]
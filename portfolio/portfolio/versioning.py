@@ -0,0 +1,90 @@
+"""
+Versions shared by every worker process through the default cache.
+
+Data cached per process or per page is tagged with the version it was
+built for and built again once the version has moved, so nothing cached
+ever has to be deleted. A bump writes a random token instead of counting
+up, a version lost from the cache and recreated can never equal one a
+worker still holds. build_id() names the deployed code, templates and
+static files, for what has to change with a deploy as well.
+"""
+
+import hashlib
+import os
+import uuid
+from functools import lru_cache
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.cache import cache
+
+
+class Version:
+    """
+    the shared version stored under `key`
+    """
+    def __init__(self, key):
+        self.key = key
+
+    def bump(self):
+        """
+        marks everything built for the current version stale
+        """
+        cache.set(self.key, uuid.uuid4().hex, None)
+
+    def current(self):
+        version = cache.get(self.key)
+        if version is None:
+            cache.add(self.key, uuid.uuid4().hex, None)
+            version = cache.get(self.key)
+        return version
+
+
+class ProcessCache:
+    """
+    what `load()` returns, kept in this process and loaded again only when
+    `version` has moved since this process last read it
+    """
+    def __init__(self, version, load):
+        self.version = version
+        self.load = load
+        # (version, value) replaced as one, a thread never pairs a value with another version
+        self._entry = (None, None)
+
+    def get(self):
+        version = self.version.current()
+        built_for, value = self._entry
+        if built_for != version:
+            value = self.load()
+            self._entry = (version, value)
+        return value
+
+
+@lru_cache(maxsize=None)
+def build_id():
+    """
+    settings.BUILD_ID when the deploy sets one, otherwise a hash of the
+    code and templates of the project and its apps and of the static
+    manifest, the same on every host running the same release
+    """
+    if settings.BUILD_ID:
+        return settings.BUILD_ID
+    # the project package this module is in
+    roots = [os.path.dirname(os.path.abspath(__file__))]
+    roots += [config.path for config in apps.get_app_configs()
+              if os.path.abspath(config.path).startswith(os.path.abspath(settings.BASE_DIR))]
+    paths = []
+    for root in roots:
+        for directory, dirnames, filenames in os.walk(root):
+            dirnames[:] = [name for name in dirnames if name not in ('__pycache__', 'static', 'media')]
+            paths += [os.path.join(directory, name) for name in filenames if name.endswith(('.py', '.html'))]
+    manifest = getattr(staticfiles_storage, 'manifest_name', None)
+    if manifest and staticfiles_storage.exists(manifest):
+        paths.append(staticfiles_storage.path(manifest))
+    digest = hashlib.md5()
+    for path in sorted(set(paths)):
+        digest.update(os.path.relpath(path, settings.BASE_DIR).encode())
+        with open(path, 'rb') as source:
+            digest.update(source.read())
+    return digest.hexdigest()[:12]
@@ -1,3 +1,32 @@
 from django.contrib import admin
+from django.db import transaction
+
+from portfolio.pagination import EstimatedCountPaginator
+
+from .catalog import bump_version
+from .models import Product
 
 # Register your models here.
+
+@admin.register(Product)
+class ProductAdmin(admin.ModelAdmin):
+    list_display = ['name', 'description', 'launched']
+    list_filter = ['launched']
+    search_fields = ['name']
+    actions = ['launch', 'withdraw']
+    # the catalog runs to millions of rows, counting them all on every page is too slow
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def _set_launched(self, queryset, launched):
+        # update() sends no signals, the catalog is invalidated here instead
+        queryset.update(launched=launched)
+        transaction.on_commit(bump_version)
+
+    @admin.action(description='Launch selected products')
+    def launch(self, request, queryset):
+        self._set_launched(queryset, True)
+
+    @admin.action(description='Withdraw selected products')
+    def withdraw(self, request, queryset):
+        self._set_launched(queryset, False)
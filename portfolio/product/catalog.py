@@ -0,0 +1,46 @@
+import bisect
+
+from portfolio.versioning import ProcessCache, Version
+
+from .models import Product
+
+# fields every api response carries, rows are kept as tuples in this order
+FIELDS = ('id', 'name', 'description')
+
+version = Version('product:launched:version')
+# marks every worker's copy of the catalog stale
+bump_version = version.bump
+
+
+class Catalog:
+    """
+    launched products in id order, a keyset page is a binary search and a
+    slice, a detail a dict lookup
+    """
+    def __init__(self, rows):
+        self.rows = rows
+        self.ids = [row[0] for row in rows]
+        self.by_id = {row[0]: row for row in rows}
+
+    def page(self, after, limit):
+        start = 0 if after is None else bisect.bisect_right(self.ids, after)
+        return self.rows[start:start + limit]
+
+    def get(self, product_id):
+        return self.by_id.get(product_id)
+
+
+def load():
+    # read through the partial index on launched products
+    return Catalog(list(Product.objects.filter(launched=True).order_by('id').values_list(*FIELDS)))
+
+
+_catalog = ProcessCache(version, load)
+
+
+def launched_catalog():
+    """
+    the Catalog of this process, reloaded only when the shared version has
+    moved since this process last read it
+    """
+    return _catalog.get()
@@ -0,0 +1,117 @@
+import random
+import statistics
+import time
+from contextlib import contextmanager
+
+from django.core.management import BaseCommand
+from django.db import connection, transaction
+from django.test import RequestFactory
+
+from product import catalog
+from product.catalog import FIELDS
+from product.models import Product
+from product.views import product_detail, product_list
+
+INDEX = 'product_launched_idx'
+WORDS = 'steel oak linen wool glass copper cotton maple slate cedar'.split()
+
+
+@contextmanager
+def without_index():
+    """
+    drops the partial index for the duration, the drop is rolled back
+    """
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute('DROP INDEX {}'.format(connection.ops.quote_name(INDEX)))
+        yield
+        transaction.set_rollback(True)
+
+
+def launched():
+    return Product.objects.filter(launched=True).order_by('id')
+
+
+class Command(BaseCommand):
+    # Show this when the user types help
+    help = "Latency of the product list and detail api at a million products, 5% of them launched"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--products', type=int, default=1000000,
+                            help='products to have in the table, missing ones are created')
+        parser.add_argument('--launched', type=float, default=0.05, help='fraction of created products launched')
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--keepdb', action='store_true', help='keep the seeded test database for the next run')
+
+    def seed(self, total, fraction):
+        existing = Product.objects.count()
+        for start in range(existing, total, 10000):
+            Product.objects.bulk_create([
+                Product(name='Product {}'.format(i), description='{} {}'.format(*random.sample(WORDS, 2)),
+                        launched=random.random() < fraction)
+                for i in range(start, min(start + 10000, total))
+            ])
+        # bulk_create sends no signals
+        catalog.bump_version()
+        return max(total - existing, 0)
+
+    def time(self, label, function, repeat):
+        function()
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - start)
+        self.stdout.write('{:<38} {:9.3f} ms'.format(label, statistics.median(timings) * 1000))
+
+    def plan(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        explain = 'EXPLAIN QUERY PLAN ' if connection.vendor == 'sqlite' else 'EXPLAIN '
+        with connection.cursor() as cursor:
+            cursor.execute(explain + sql, params)
+            return ' / '.join(str(row[-1]) for row in cursor.fetchall())
+
+    def handle(self, *args, **options):
+        # a throwaway database, the products must not show up on the real api
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=options['keepdb'])
+        try:
+            self.bench(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options['keepdb'])
+            # workers drop any catalog loaded while the test database was in use
+            catalog.bump_version()
+
+    def bench(self, options):
+        created = self.seed(options['products'], options['launched'])
+        launched_count = launched().count()
+        self.stdout.write('{} products, {} launched, {} created'.format(
+            Product.objects.count(), launched_count, created))
+        repeat = options['repeat']
+        middle = launched().values_list('id', flat=True)[launched_count // 2]
+        deep = max(0, launched_count - 100)
+
+        def load_all():
+            list(launched().values_list(*FIELDS))
+
+        def keyset_page():
+            list(launched().filter(id__gt=middle).values_list(*FIELDS)[:100])
+
+        def offset_page():
+            list(launched().values_list(*FIELDS)[deep:deep + 100])
+
+        # without the index first, sqlite's statement cache would keep the indexed plans
+        with without_index():
+            self.stdout.write('plan without index: ' + self.plan(launched().filter(id__gt=middle)[:100]))
+            self.time('load launched set, no index', load_all, max(1, repeat // 4))
+            self.time('keyset page from db, no index', keyset_page, repeat)
+            self.time('last offset page from db, no index', offset_page, repeat)
+        self.stdout.write('plan: ' + self.plan(launched().filter(id__gt=middle)[:100]))
+        self.time('load launched set (cold catalog)', load_all, max(1, repeat // 4))
+        self.time('keyset page from db', keyset_page, repeat)
+        self.time('last offset page from db', offset_page, repeat)
+
+        factory = RequestFactory()
+        list_request = factory.get('/api/products', {'after': middle, 'limit': 100})
+        detail_request = factory.get('/api/products/{}'.format(middle))
+        self.time('api list page, warm catalog', lambda: product_list(list_request), repeat * 10)
+        self.time('api detail, warm catalog', lambda: product_detail(detail_request, middle), repeat * 10)
@@ -0,0 +1,17 @@
+# Generated by Django 3.2.25 on 2026-10-19 09:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(condition=models.Q(('launched', True)), fields=['id'], name='product_launched_idx'),
+        ),
+    ]
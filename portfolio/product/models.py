@@ -7,5 +7,11 @@ class Product(models.Model):
 
     launched = models.BooleanField(default=True)
 
+    class Meta:
+        indexes = [
+            # nearly every read is of launched products, in id order
+            models.Index(fields=['id'], name='product_launched_idx', condition=models.Q(launched=True)),
+        ]
+
     def __str__(self):
         return self.name
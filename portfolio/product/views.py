@@ -1,3 +1,35 @@
-from django.shortcuts import render
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
 
-# Create your views here.
+from portfolio.params import BadRequest, int_param, limit_param
+
+from .catalog import FIELDS, launched_catalog
+
+
+@require_GET
+def product_list(request):
+    """
+    launched products ordered by id, keyset paginated on `after`, the last
+    id of the previous page, served from the process local catalog
+    """
+    try:
+        after = int_param(request, 'after')
+        limit = limit_param(request)
+    except BadRequest as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
+    page = launched_catalog().page(after, limit + 1)
+    next_url = None
+    if len(page) > limit:
+        page = page[:limit]
+        params = request.GET.copy()
+        params['after'] = page[-1][0]
+        next_url = '{}?{}'.format(request.path, params.urlencode())
+    return JsonResponse({'results': [dict(zip(FIELDS, row)) for row in page], 'next': next_url})
+
+
+@require_GET
+def product_detail(request, product_id):
+    row = launched_catalog().get(product_id)
+    if row is None:
+        return JsonResponse({'error': 'product not found'}, status=404)
+    return JsonResponse(dict(zip(FIELDS, row)))
@@ -1,11 +1,52 @@
 from django.contrib import admin
+from django.core.cache import cache
+
+from portfolio.pagination import EstimatedCountPaginator
+from . import search
 from .models import Registration
 
+
+class CachedValues:
+    """
+    distinct values of a column, read from the cache when iterated so the
+    query only runs when the sidebar is rendered and at most once per timeout
+    """
+    def __init__(self, key, queryset, timeout):
+        self.key = key
+        self.queryset = queryset
+        self.timeout = timeout
+
+    def __iter__(self):
+        return iter(cache.get_or_set(self.key, lambda: list(self.queryset), self.timeout))
+
+
+class CachedValuesFieldListFilter(admin.AllValuesFieldListFilter):
+    """
+    AllValuesFieldListFilter without a DISTINCT scan per changelist view,
+    meant for low-cardinality columns
+    """
+    timeout = 600
+
+    def __init__(self, field, request, params, model, model_admin, field_path):
+        super().__init__(field, request, params, model, model_admin, field_path)
+        key = 'admin:values:{}:{}'.format(model._meta.label_lower, field_path)
+        self.lookup_choices = CachedValues(key, self.lookup_choices, self.timeout)
+
+
 # Register your models here.
 @admin.register(Registration)
 class RegistrationAdmin(admin.ModelAdmin):
     list_display = ('id','username','first_name','last_name','phone','email','address','city','state','zipcode','title','employed_at','achievements')
     list_display_link = ('id','name')
-    list_filter = ('name','email',)
-    search_fields = ('email','name','city','zipcode')
+    list_filter = (('state', CachedValuesFieldListFilter),)
+    search_fields = search.SEARCH_FIELDS
     list_per_page = 25
+    paginator = EstimatedCountPaginator
+    # the unfiltered total is another COUNT(*) over the whole table
+    show_full_result_count = False
+
+    def get_search_results(self, request, queryset, search_term):
+        results = search.search(queryset, search_term)
+        if results is None:
+            return super().get_search_results(request, queryset, search_term)
+        return results, False
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class RegisterConfig(AppConfig):
     name = 'register'
+
+    def ready(self):
+        from . import signals
@@ -0,0 +1,24 @@
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+USER_CACHE_TIMEOUT = 300
+
+
+def user_cache_key(user_id):
+    return 'register:user:{}'.format(user_id)
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    ModelBackend that keeps the logged in user in the cache, so an
+    authenticated request reads the session and the user without a
+    query, the entry is dropped whenever the user row changes
+    """
+    def get_user(self, user_id):
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, USER_CACHE_TIMEOUT)
+        return user
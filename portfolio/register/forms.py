@@ -3,6 +3,7 @@ from django.contrib.auth.forms import UserCreationForm
 from django import forms
 from django.contrib.auth.models import User
 from .models import Registration
+from . import uploads
  
 class CreateUserForm(UserCreationForm):
     class Meta:
@@ -12,6 +13,25 @@ class CreateUserForm(UserCreationForm):
 class RegistrationForm(forms.ModelForm):
     password = forms.CharField(widget=forms.PasswordInput)
     confirm_password = forms.CharField(widget=forms.PasswordInput)
+    # not an ImageField, validating one decodes the whole image during the request
+    photo = forms.FileField(required=False)
     class Meta:
         model = Registration
-        fields = ['username','first_name','last_name','password','confirm_password','phone','email','address','city','state','zipcode','title','employed_at','achievements']
+        fields = ['username','first_name','last_name','password','confirm_password','photo','phone','email','address','city','state','zipcode','title','employed_at','achievements']
+
+    def clean_photo(self):
+        photo = self.cleaned_data.get('photo')
+        if isinstance(photo, uploads.RejectedPhoto):
+            raise forms.ValidationError(photo.error)
+        if isinstance(photo, uploads.StoredPhoto):
+            # already in storage, keep the model from saving it again
+            return photo.stored_name
+        if photo:
+            # posted without PhotoUploadHandler
+            head = photo.read(uploads.SNIFF_BYTES)
+            photo.seek(0)
+            if not uploads.sniff(head):
+                raise forms.ValidationError(uploads.NOT_AN_IMAGE)
+            if photo.size > uploads.MAX_BYTES:
+                raise forms.ValidationError(uploads.TOO_LARGE)
+        return photo
@@ -0,0 +1,102 @@
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+from portfolio import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordHashingBusy(Exception):
+    """
+    raised instead of queueing when the hashing pool is saturated
+    """
+
+
+class HashingPool:
+    """
+    runs password hashing on a few dedicated threads, at most `queue`
+    calls wait behind the busy ones and anything beyond that is turned
+    away at once so a login spike cannot tie up every request thread,
+    pbkdf2 drops the gil so the other threads keep serving pages, hash
+    times and rejections are served on /metrics with the request metrics
+    """
+    def __init__(self, workers, queue, timeout):
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='hashing')
+        self._slots = threading.BoundedSemaphore(workers + queue)
+        self._local = threading.local()
+        # seconds spent hashing for the most recent calls
+        self.durations = deque(maxlen=1000)
+        self.rejected = 0
+        self._rejected_lock = threading.Lock()
+
+    def _timed(self, fn, args):
+        self._local.in_pool = True
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.durations.append(elapsed)
+            self._local.in_pool = False
+            metrics.recorder().observe(metrics.HASH_DURATION, elapsed, (('operation', fn.__name__),))
+
+    def _reject(self, reason, message):
+        with self._rejected_lock:
+            self.rejected += 1
+        metrics.recorder().increment(metrics.HASH_REJECTED, (('reason', reason),))
+        logger.warning(message)
+        return PasswordHashingBusy(message)
+
+    def run(self, fn, *args):
+        # verify() calls encode(), already on a pool thread it runs inline
+        if getattr(self._local, 'in_pool', False):
+            return fn(*args)
+        if not self._slots.acquire(blocking=False):
+            raise self._reject('queue_full', 'password hashing queue is full')
+        try:
+            future = self._executor.submit(self._timed, fn, args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(self.timeout)
+        except TimeoutError:
+            raise self._reject('timeout', 'password hashing took longer than {}s'.format(self.timeout))
+
+    def stats(self):
+        durations = sorted(self.durations)
+        if not durations:
+            return {'count': 0, 'rejected': self.rejected}
+        return {
+            'count': len(durations),
+            'rejected': self.rejected,
+            'mean_ms': sum(durations) / len(durations) * 1000,
+            'p99_ms': durations[int(len(durations) * 0.99) - 1 if len(durations) > 1 else 0] * 1000,
+        }
+
+
+pool = HashingPool(
+    workers=getattr(settings, 'PASSWORD_HASHING_WORKERS', 2),
+    queue=getattr(settings, 'PASSWORD_HASHING_QUEUE', 8),
+    timeout=getattr(settings, 'PASSWORD_HASHING_TIMEOUT', 10),
+)
+
+
+class PooledPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2PasswordHasher running on the hashing pool, same algorithm name
+    so every existing pbkdf2_sha256 hash keeps verifying
+    """
+    def encode(self, password, salt, iterations=None):
+        return pool.run(super().encode, password, salt, iterations)
+
+    def verify(self, password, encoded):
+        return pool.run(super().verify, password, encoded)
@@ -0,0 +1,60 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import BaseCommand
+from django.db import connection
+from django.http import HttpResponse
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import path
+
+BENCH_USERNAME = 'bench_auth'
+BENCH_PASSWORD = 'bench-auth-password'
+
+MODES = [
+    ('db sessions', {'SESSION_ENGINE': 'django.contrib.sessions.backends.db',
+                     'AUTHENTICATION_BACKENDS': ['django.contrib.auth.backends.ModelBackend']}),
+    ('cached', {'SESSION_ENGINE': settings.SESSION_ENGINE,
+                'AUTHENTICATION_BACKENDS': settings.AUTHENTICATION_BACKENDS}),
+]
+
+
+def whoami(request):
+    return HttpResponse(request.user.username)
+
+
+urlpatterns = [
+    path('whoami', whoami),
+]
+
+
+class Command(BaseCommand):
+    # Show this when the user types help
+    help = "Measures the session and user lookup overhead of an authenticated request"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        # the user with its published password only ever exists in a throwaway database
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            get_user_model().objects.create_user(BENCH_USERNAME, password=BENCH_PASSWORD)
+            self.bench(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def bench(self, options):
+        for name, mode in MODES:
+            with override_settings(ROOT_URLCONF=__name__, ALLOWED_HOSTS=['testserver'], **mode):
+                client = Client()
+                client.login(username=BENCH_USERNAME, password=BENCH_PASSWORD)
+                client.get('/whoami')
+                with CaptureQueriesContext(connection) as queries:
+                    start = time.perf_counter()
+                    for _ in range(options['requests']):
+                        client.get('/whoami')
+                    elapsed = time.perf_counter() - start
+                self.stdout.write('{:<12} {:8.3f} ms/request {:5.2f} queries/request'.format(
+                    name, elapsed / options['requests'] * 1000, len(queries) / options['requests']))
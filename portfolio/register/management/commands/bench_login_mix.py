@@ -0,0 +1,74 @@
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import BaseCommand
+from django.db import connection
+
+from portfolio.benchmarks import bench_server, fetch, summary
+from register.hashers import pool
+
+from .bench_auth import BENCH_PASSWORD, BENCH_USERNAME
+
+MODES = [
+    ('inline', ['django.contrib.auth.hashers.PBKDF2PasswordHasher']),
+    ('pooled', settings.PASSWORD_HASHERS),
+]
+
+
+class Command(BaseCommand):
+    # Show this when the user types help
+    help = ("Floods login with password checks while timing experience page views, "
+            "hashing inline on the request threads against the bounded hashing pool")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8, help='server request threads')
+        parser.add_argument('--logins', type=int, default=24, help='concurrent login clients')
+        parser.add_argument('--viewers', type=int, default=4, help='concurrent page clients')
+        parser.add_argument('--seconds', type=float, default=10)
+
+    def login_client(self, base, stop, statuses):
+        data = urlencode({'username': BENCH_USERNAME, 'password': BENCH_PASSWORD}).encode()
+        while not stop.is_set():
+            _, status, _ = fetch(base + '/login', data=data)
+            statuses[status] += 1
+
+    def page_client(self, base, stop, latencies):
+        while not stop.is_set():
+            latency, _, _ = fetch(base + '/')
+            latencies.append(latency)
+
+    def handle(self, *args, **options):
+        # the user with its published password only ever exists in a throwaway database
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            get_user_model().objects.create_user(BENCH_USERNAME, password=BENCH_PASSWORD)
+            self.bench(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def bench(self, options):
+        middleware = [name for name in settings.MIDDLEWARE if 'Csrf' not in name]
+        for name, hashers in MODES:
+            with bench_server(threads=options['threads'], PASSWORD_HASHERS=hashers,
+                              MIDDLEWARE=middleware) as base:
+                stop = threading.Event()
+                statuses, latencies = Counter(), []
+                threads = [threading.Thread(target=self.login_client, args=(base, stop, statuses))
+                           for _ in range(options['logins'])]
+                threads += [threading.Thread(target=self.page_client, args=(base, stop, latencies))
+                            for _ in range(options['viewers'])]
+                start = time.perf_counter()
+                for thread in threads:
+                    thread.start()
+                time.sleep(options['seconds'])
+                stop.set()
+                for thread in threads:
+                    thread.join()
+                elapsed = time.perf_counter() - start
+            self.stdout.write('{:<7} experience {} logins {}'.format(
+                name, summary(latencies, elapsed), dict(statuses)))
+        self.stdout.write('hashing pool {}'.format(pool.stats()))
@@ -0,0 +1,111 @@
+import random
+import statistics
+import string
+import time
+
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.core.management import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import path
+
+from register.admin import RegistrationAdmin
+from register.models import Registration
+
+BENCH_USERNAME = 'bench_admin'
+STATES = ['CA', 'NY', 'TX', 'WA', 'FL', 'IL', 'MA', 'CO', 'OR', 'GA']
+CITIES = ['Seattle', 'Austin', 'Boston', 'Denver', 'Portland', 'Chicago', 'Atlanta', 'Miami']
+
+
+class LegacyRegistrationAdmin(admin.ModelAdmin):
+    # the configuration before search was indexed
+    list_display = RegistrationAdmin.list_display
+    list_filter = ('name', 'email')
+    search_fields = ('email', 'name', 'city', 'zipcode')
+    list_per_page = 25
+
+
+legacy_site = admin.AdminSite(name='legacy')
+legacy_site.register(Registration, LegacyRegistrationAdmin)
+
+urlpatterns = [
+    path('legacy/', legacy_site.urls),
+    path('admin/', admin.site.urls),
+]
+
+QUERIES = [
+    ('page 1', {}),
+    ('page 200', {'p': '199'}),
+    ('state filter', {'state': 'WA'}),
+    ('search email', {'q': 'user12345'}),
+    ('search city', {'q': 'portland'}),
+    ('search 2 terms', {'q': 'denver 9801'}),
+]
+
+
+def word(length):
+    return ''.join(random.choice(string.ascii_lowercase) for _ in range(length))
+
+
+class Command(BaseCommand):
+    # Show this when the user types help
+    help = "Times the Registration admin changelist, legacy config against indexed search"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=200000,
+                            help='registrations to have in the table, missing ones are created')
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--keepdb', action='store_true', help='keep the seeded test database for the next run')
+
+    def seed(self, rows):
+        existing = Registration.objects.count()
+        batch = []
+        for i in range(existing, rows):
+            batch.append(Registration(
+                username='user{}'.format(i), name=word(8), first_name=word(6), last_name=word(8),
+                email='user{}@{}.com'.format(i, word(6)), phone='555{:07d}'.format(i),
+                address='{} {} st'.format(i % 999, word(7)), city=random.choice(CITIES),
+                state=random.choice(STATES), zipcode='{:05d}'.format(random.randrange(100000)),
+                title=word(10), employed_at=word(9),
+            ))
+            if len(batch) == 5000:
+                Registration.objects.bulk_create(batch)
+                batch = []
+        Registration.objects.bulk_create(batch)
+        return rows - existing
+
+    def handle(self, *args, **options):
+        # the fake registrations and the superuser go into a throwaway database
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=options['keepdb'])
+        try:
+            self.bench(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options['keepdb'])
+
+    def bench(self, options):
+        created = self.seed(options['rows'])
+        self.stdout.write('{} registrations, {} created'.format(
+            Registration.objects.count(), max(created, 0)))
+        user_model = get_user_model()
+        user = user_model.objects.filter(username=BENCH_USERNAME).first()
+        if user is None:
+            user = user_model.objects.create_superuser(BENCH_USERNAME, 'bench@example.com', None)
+
+        with override_settings(ROOT_URLCONF=__name__, ALLOWED_HOSTS=['testserver']):
+            client = Client()
+            client.force_login(user)
+            for label, params in QUERIES:
+                for prefix in ('legacy', 'admin'):
+                    url = '/{}/register/registration/'.format(prefix)
+                    response = client.get(url, params)
+                    timings = []
+                    with CaptureQueriesContext(connection) as queries:
+                        for _ in range(options['repeat']):
+                            start = time.perf_counter()
+                            client.get(url, params)
+                            timings.append(time.perf_counter() - start)
+                    self.stdout.write('{:<15} {:<7} {:8.2f} ms {:3d} queries  status {}'.format(
+                        label, prefix, statistics.median(timings) * 1000,
+                        len(queries) // options['repeat'], response.status_code))
@@ -0,0 +1,113 @@
+import statistics
+import time
+import tracemalloc
+from io import BytesIO
+
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.management import BaseCommand
+from django.db.models.signals import post_save
+from django.http import HttpResponse
+from django.shortcuts import redirect
+from django.test import RequestFactory
+from PIL import Image
+
+from register import photos
+from register.forms import RegistrationForm
+from register.models import Registration
+from register.signals import registration_saved
+from register.views import signup
+
+
+def buffered_signup(request):
+    """
+    the signup flow before streaming, default upload handlers and the
+    photo normalized during the request
+    """
+    form = RegistrationForm(request.POST, request.FILES)
+    if not form.is_valid():
+        return HttpResponse(form.errors.as_text(), status=400)
+    registration = form.save()
+    name = photos.normalize(registration.photo.name)
+    if name:
+        Registration.objects.filter(pk=registration.pk).update(photo=name)
+    return redirect('login')
+
+
+def make_photo(width, height):
+    gradient = Image.linear_gradient('L').resize((width, height))
+    noise = Image.effect_noise((width, height), 30)
+    image = Image.merge('RGB', (gradient, noise, gradient.transpose(Image.FLIP_LEFT_RIGHT)))
+    exif = image.getexif()
+    # orientation: rotate 90, plus a made up camera make
+    exif[0x0112] = 6
+    exif[0x010f] = 'BenchCam'
+    buffer = BytesIO()
+    image.save(buffer, 'JPEG', quality=92, exif=exif)
+    return buffer.getvalue()
+
+
+class Command(BaseCommand):
+    # Show this when the user types help
+    help = "Compares signup with a large photo, buffered and normalized in the request against streamed"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=10)
+        parser.add_argument('--width', type=int, default=4032)
+        parser.add_argument('--height', type=int, default=3024)
+
+    def request(self, factory, i, photo):
+        data = {
+            'username': 'bench{}'.format(i), 'first_name': 'bench', 'last_name': 'signup',
+            'password': 'x', 'confirm_password': 'x', 'phone': '5550000000',
+            'email': 'bench{}@example.com'.format(i), 'address': '1 main st', 'city': 'Austin',
+            'state': 'TX', 'zipcode': '78701', 'title': 'bench', 'employed_at': 'bench',
+            'photo': BytesIO(photo),
+        }
+        data['photo'].name = 'IMG_{}.jpg'.format(i)
+        request = factory.post('/signup', data)
+        request._dont_enforce_csrf_checks = True
+        request._messages = CookieStorage(request)
+        return request
+
+    def run(self, view, factory, photo, count):
+        timings, peaks = [], []
+        for i in range(count):
+            request = self.request(factory, i, photo)
+            tracemalloc.start()
+            start = time.perf_counter()
+            response = view(request)
+            timings.append(time.perf_counter() - start)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+            if response.status_code != 302:
+                raise RuntimeError('signup failed: {} {}'.format(response.status_code, response.content[:200]))
+        return statistics.median(timings), max(peaks)
+
+    def handle(self, *args, **options):
+        photo = make_photo(options['width'], options['height'])
+        self.stdout.write('photo {}x{} {:.1f} MB'.format(
+            options['width'], options['height'], len(photo) / 1024 / 1024))
+        factory = RequestFactory()
+        before = set(Registration.objects.values_list('pk', flat=True))
+
+        post_save.disconnect(registration_saved, sender=Registration)
+        try:
+            median, peak = self.run(buffered_signup, factory, photo, options['requests'])
+        finally:
+            post_save.connect(registration_saved, sender=Registration)
+        self.stdout.write('buffered  {:8.1f} ms/signup  python peak {:6.1f} MB'.format(
+            median * 1000, peak / 1024 / 1024))
+
+        median, peak = self.run(signup, factory, photo, options['requests'])
+        start = time.perf_counter()
+        photos._executor.submit(lambda: None).result()
+        self.stdout.write('streaming {:8.1f} ms/signup  python peak {:6.1f} MB  background drained in {:.1f} s'.format(
+            median * 1000, peak / 1024 / 1024, time.perf_counter() - start))
+
+        created = Registration.objects.exclude(pk__in=before)
+        sample = created.order_by('-pk').first()
+        with sample.photo.open('rb') as stored:
+            image = Image.open(stored)
+            self.stdout.write('stored {} {}x{} exif tags {}'.format(
+                sample.photo.name, image.width, image.height, len(image.getexif())))
+        created.delete()
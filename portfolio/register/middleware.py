@@ -0,0 +1,22 @@
+from django.http import HttpResponse
+from django.utils.deprecation import MiddlewareMixin
+
+from .hashers import PasswordHashingBusy
+
+# seconds a client is asked to wait, a queued hash takes well under that
+RETRY_AFTER = 1
+
+
+class HashingBusyMiddleware(MiddlewareMixin):
+    """
+    answers any view that hit a saturated hashing pool, the site's login,
+    the admin's, a password change or a signup, with a 503 and Retry-After
+    instead of a 500
+    """
+    def process_exception(self, request, exception):
+        if not isinstance(exception, PasswordHashingBusy):
+            return None
+        response = HttpResponse('Too many logins right now, please try again in {} seconds\n'.format(RETRY_AFTER),
+                                status=503, content_type='text/plain; charset=utf-8')
+        response['Retry-After'] = str(RETRY_AFTER)
+        return response
@@ -0,0 +1,19 @@
+# Generated by Django 3.2.25 on 2026-10-19 08:56
+
+from django.db import migrations, models
+import portfolio.storage
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('register', '0007_auto_20210829_0542'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='registration',
+            name='photo',
+            field=models.ImageField(storage=portfolio.storage.ContentAddressedStorage(), upload_to='photos/%Y/%m/%d'),
+        ),
+    ]
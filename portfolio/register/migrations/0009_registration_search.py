@@ -0,0 +1,31 @@
+# Generated by Django 3.2.25 on 2026-10-19 09:03
+
+from django.db import migrations, models
+
+from register import search
+
+
+def install_search(apps, schema_editor):
+    search.install(schema_editor.connection, concurrently=True)
+
+
+def uninstall_search(apps, schema_editor):
+    search.uninstall(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('register', '0008_blob_storage'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='registration',
+            name='state',
+            field=models.CharField(db_index=True, max_length=20),
+        ),
+        migrations.RunPython(install_search, uninstall_search),
+    ]
@@ -1,5 +1,7 @@
 from django.db import models
 
+from portfolio.storage import blob_storage
+
 # Create your models here.
 class Registration(models.Model):
     username = models.CharField(max_length=20, default='')
@@ -8,12 +10,12 @@ class Registration(models.Model):
     last_name = models.CharField(max_length=200)
     password = models.CharField(max_length=200, default='')
     confirm_password = models.CharField(max_length=200, default='')
-    photo = models.ImageField(upload_to='photos/%Y/%m/%d')
+    photo = models.ImageField(upload_to='photos/%Y/%m/%d', storage=blob_storage)
     phone = models.CharField(max_length=20)
     email = models.CharField(max_length=50)
     address = models.CharField(max_length=200)
     city = models.CharField(max_length=20)
-    state = models.CharField(max_length=20)
+    state = models.CharField(max_length=20, db_index=True)
     zipcode = models.CharField(max_length=200)
     title = models.CharField(max_length=50)
     employed_at = models.CharField(max_length=50)
@@ -0,0 +1,72 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections
+from PIL import Image, ImageOps
+
+from portfolio.storage import blob_storage
+
+logger = logging.getLogger(__name__)
+
+# longest side kept for a profile photo
+MAX_SIZE = getattr(settings, 'REGISTRATION_PHOTO_MAX_SIZE', 1600)
+QUALITY = 85
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='photos')
+_pending = set()
+
+
+def is_normalized(image):
+    return (image.format == 'JPEG' and max(image.size) <= MAX_SIZE
+            and 'exif' not in image.info and not image.getexif())
+
+
+def normalize(name, storage=blob_storage):
+    """
+    applies the EXIF orientation, drops the metadata, scales the photo
+    down to MAX_SIZE and re-encodes it as JPEG, returns the new stored
+    name or None when the photo already is normalized
+    """
+    with storage.open(name, 'rb') as original:
+        image = Image.open(original)
+        image.load()
+    if is_normalized(image):
+        return None
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+    image.thumbnail((MAX_SIZE, MAX_SIZE), Image.LANCZOS)
+    buffer = BytesIO()
+    # saved without exif= so location and camera details are dropped
+    image.save(buffer, 'JPEG', quality=QUALITY, optimize=True)
+    return storage.save('photo.jpg', ContentFile(buffer.getvalue()))
+
+
+def _normalize_row(pk, name):
+    from .models import Registration
+    close_old_connections()
+    try:
+        new_name = normalize(name)
+        if new_name:
+            # skip the row if it got another photo meanwhile, the old blob is left to gc_blobs
+            Registration.objects.filter(pk=pk, photo=name).update(photo=new_name)
+        return new_name
+    except Exception:
+        logger.exception('could not normalize photo %s of registration %s', name, pk)
+    finally:
+        _pending.discard((pk, name))
+        close_old_connections()
+
+
+def schedule(pk, name):
+    """
+    queues normalization of a registration's photo in the background, at
+    most once per photo at a time
+    """
+    if not name or (pk, name) in _pending:
+        return None
+    _pending.add((pk, name))
+    return _executor.submit(_normalize_row, pk, name)
@@ -0,0 +1,139 @@
+"""
+Indexes behind the Registration admin search.
+
+Admin search turns every term into `icontains` on each search field, a
+leading wildcard LIKE that no btree index can serve. On PostgreSQL a
+pg_trgm GIN index on UPPER(field::text), the exact expression Django
+compares, lets the planner answer those lookups from the index. SQLite
+gets an FTS5 table with the trigram tokenizer kept in sync by triggers,
+and searches of terms of three or more characters are answered from it.
+"""
+
+from django.db import connections
+from django.db.models.expressions import RawSQL
+from django.utils.text import smart_split, unescape_string_literal
+
+SEARCH_FIELDS = ('email', 'name', 'city', 'zipcode')
+
+TABLE = 'register_registration'
+FTS_TABLE = 'register_registration_fts'
+
+SQLITE_TRIGGERS = {
+    FTS_TABLE + '_ai': """
+        CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+            INSERT INTO {fts} (rowid, {columns}) VALUES (new.id, {new});
+        END""",
+    FTS_TABLE + '_ad': """
+        CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+            INSERT INTO {fts} ({fts}, rowid, {columns}) VALUES ('delete', old.id, {old});
+        END""",
+    FTS_TABLE + '_au': """
+        CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {table} BEGIN
+            INSERT INTO {fts} ({fts}, rowid, {columns}) VALUES ('delete', old.id, {old});
+            INSERT INTO {fts} (rowid, {columns}) VALUES (new.id, {new});
+        END""",
+}
+
+# aliases with a usable FTS table, checked once per process
+_fts_ready = {}
+
+
+def _format(sql):
+    return sql.format(
+        table=TABLE, fts=FTS_TABLE, columns=', '.join(SEARCH_FIELDS),
+        new=', '.join('new.' + field for field in SEARCH_FIELDS),
+        old=', '.join('old.' + field for field in SEARCH_FIELDS),
+    )
+
+
+def _install_postgresql(cursor, concurrently):
+    cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for field in SEARCH_FIELDS:
+        cursor.execute(
+            'CREATE INDEX {} IF NOT EXISTS {}_{}_trgm ON {} USING gin (UPPER({}::text) gin_trgm_ops)'.format(
+                'CONCURRENTLY' if concurrently else '', TABLE, field, TABLE, field))
+
+
+def _install_sqlite(cursor):
+    cursor.execute(_format(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        "{columns}, content='{table}', content_rowid='id', tokenize='trigram')"))
+    cursor.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = %s", [TABLE])
+    existing = {row[0] for row in cursor.fetchall()}
+    for sql in SQLITE_TRIGGERS.values():
+        cursor.execute(_format(sql))
+    # rebuilding the table drops its triggers, rows written meanwhile are missing
+    if not set(SQLITE_TRIGGERS) <= existing:
+        cursor.execute(_format("INSERT INTO {fts} ({fts}) VALUES ('rebuild')"))
+
+
+def install(connection, concurrently=False):
+    """
+    creates the search indexes for the connection's backend, safe to run
+    again, on SQLite it also restores triggers dropped by table rebuilds
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            _install_postgresql(cursor, concurrently)
+        elif connection.vendor == 'sqlite':
+            try:
+                _install_sqlite(cursor)
+            except connection.Database.OperationalError:
+                # no fts5 or no trigram tokenizer (sqlite < 3.34), search scans instead
+                pass
+    _fts_ready.pop(connection.alias, None)
+
+
+def repair(connection):
+    """
+    restores the SQLite triggers after a migration rebuilt the table,
+    does nothing unless the FTS table was installed
+    """
+    if connection.vendor == 'sqlite' and FTS_TABLE in connection.introspection.table_names():
+        with connection.cursor() as cursor:
+            _install_sqlite(cursor)
+
+
+def uninstall(connection):
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            for field in SEARCH_FIELDS:
+                cursor.execute('DROP INDEX IF EXISTS {}_{}_trgm'.format(TABLE, field))
+        elif connection.vendor == 'sqlite':
+            for trigger in SQLITE_TRIGGERS:
+                cursor.execute('DROP TRIGGER IF EXISTS {}'.format(trigger))
+            cursor.execute('DROP TABLE IF EXISTS {}'.format(FTS_TABLE))
+    _fts_ready.pop(connection.alias, None)
+
+
+def has_fts(connection):
+    if connection.alias not in _fts_ready:
+        _fts_ready[connection.alias] = (
+            connection.vendor == 'sqlite'
+            and FTS_TABLE in connection.introspection.table_names())
+    return _fts_ready[connection.alias]
+
+
+def search_terms(search_term):
+    for bit in smart_split(search_term):
+        if bit.startswith(('"', "'")) and bit[0] == bit[-1]:
+            bit = unescape_string_literal(bit)
+        yield bit
+
+
+def search(queryset, search_term):
+    """
+    `queryset` narrowed to the rows matching every term in some search
+    field, same as admin search, or None when the FTS table cannot answer
+    it and the ordinary icontains lookups should be used
+    """
+    if not has_fts(connections[queryset.db]):
+        return None
+    terms = list(search_terms(search_term))
+    # a trigram index only knows substrings of three characters or more
+    if not terms or any(len(term) < 3 for term in terms):
+        return None
+    match = ' AND '.join('"{}"'.format(term.replace('"', '""')) for term in terms)
+    return queryset.filter(pk__in=RawSQL(
+        'SELECT rowid FROM {0} WHERE {0} MATCH %s'.format(FTS_TABLE), (match,)))
@@ -0,0 +1,35 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connections, transaction
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import receiver
+
+from . import search
+from .backends import user_cache_key
+from .models import Registration
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def user_changed(sender, instance, **kwargs):
+    # a password change alters the session hash, so stale copies must go
+    # right away and again once committed in case a reader cached them meanwhile
+    key = user_cache_key(instance.pk)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+@receiver(post_migrate)
+def repair_search_index(sender, using, **kwargs):
+    if sender.name == 'register':
+        search.repair(connections[using])
+
+
+@receiver(post_save, sender=Registration)
+def registration_saved(sender, instance, **kwargs):
+    # the photo is normalized off the request once the row is visible to the worker
+    if instance.photo:
+        # imported here, pillow would otherwise load with the app registry
+        from .photos import schedule
+        pk, name = instance.pk, instance.photo.name
+        transaction.on_commit(lambda: schedule(pk, name))
@@ -1,3 +1,29 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
 from django.test import TestCase
 
+from . import hashers
+from .middleware import RETRY_AFTER
+
 # Create your tests here.
+
+class HashingBusyTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.create_superuser('admin', 'admin@example.com', 'password')
+
+    def setUp(self):
+        busy = mock.patch.object(hashers.pool, 'run', side_effect=hashers.PasswordHashingBusy('busy'))
+        busy.start()
+        self.addCleanup(busy.stop)
+
+    def assertBusy(self, response):
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], str(RETRY_AFTER))
+
+    def test_login(self):
+        self.assertBusy(self.client.post('/login', {'username': 'admin', 'password': 'password'}))
+
+    def test_admin_login(self):
+        self.assertBusy(self.client.post('/admin/login/', {'username': 'admin', 'password': 'password'}))
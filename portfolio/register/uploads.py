@@ -0,0 +1,136 @@
+"""
+Streams the signup photo straight into blob storage.
+
+Django's default handlers keep an upload in memory or a temporary file
+and the model save then copies it into storage. PhotoUploadHandler
+writes each chunk to the blob as it arrives instead, checks the leading
+bytes against known image signatures and stops keeping data once the
+upload passes REGISTRATION_PHOTO_MAX_BYTES. The form receives either a
+StoredPhoto naming the blob or a RejectedPhoto carrying the reason.
+"""
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, StopFutureHandlers
+
+from portfolio.storage import blob_storage
+
+MAX_BYTES = getattr(settings, 'REGISTRATION_PHOTO_MAX_BYTES', 10 * 1024 * 1024)
+
+# (leading bytes, offset, extension, content type)
+SIGNATURES = [
+    (b'\xff\xd8\xff', 0, '.jpg', 'image/jpeg'),
+    (b'\x89PNG\r\n\x1a\n', 0, '.png', 'image/png'),
+    (b'GIF87a', 0, '.gif', 'image/gif'),
+    (b'GIF89a', 0, '.gif', 'image/gif'),
+    (b'WEBP', 8, '.webp', 'image/webp'),
+]
+SNIFF_BYTES = 12
+
+NOT_AN_IMAGE = 'Upload a JPEG, PNG, GIF or WebP image'
+TOO_LARGE = 'Photos can be at most {} MB'.format(MAX_BYTES // (1024 * 1024))
+
+
+def sniff(head):
+    """
+    (extension, content type) of an image from its first bytes, None when
+    it is not a format we accept whatever the client claimed
+    """
+    for signature, offset, ext, content_type in SIGNATURES:
+        if head[offset:offset + len(signature)] == signature:
+            if ext == '.webp' and not head.startswith(b'RIFF'):
+                continue
+            return ext, content_type
+    return None
+
+
+class StoredPhoto(UploadedFile):
+    """
+    an upload already committed to storage under `stored_name`
+    """
+    def __init__(self, stored_name, name, content_type, size):
+        super().__init__(None, name, content_type, size)
+        self.stored_name = stored_name
+
+    def close(self):
+        pass
+
+
+class RejectedPhoto(UploadedFile):
+    def __init__(self, error, name, content_type, size):
+        super().__init__(None, name, content_type, size)
+        self.error = error
+
+    def close(self):
+        pass
+
+
+class PhotoUploadHandler(FileUploadHandler):
+    """
+    takes over the `field_name` file of a multipart request, other files
+    go on to the next handler
+    """
+    def __init__(self, request=None, field_name='photo', storage=blob_storage):
+        super().__init__(request)
+        self.field_name = field_name
+        self.storage = storage
+        self.active = False
+
+    def new_file(self, field_name, *args, **kwargs):
+        super().new_file(field_name, *args, **kwargs)
+        self.active = field_name == self.field_name
+        if not self.active:
+            return
+        self.head = b''
+        self.size = 0
+        self.kind = None
+        self.writer = None
+        self.error = None
+        raise StopFutureHandlers()
+
+    def reject(self, error):
+        self.error = error
+        if self.writer is not None:
+            self.writer.abort()
+            self.writer = None
+
+    def receive_data_chunk(self, raw_data, start):
+        if not self.active:
+            return raw_data
+        self.size += len(raw_data)
+        if self.error:
+            # the rest of the body still has to be read, it is just not kept
+            return None
+        if self.size > MAX_BYTES:
+            self.reject(TOO_LARGE)
+            return None
+        if self.writer is None:
+            self.head += raw_data
+            if len(self.head) < SNIFF_BYTES:
+                return None
+            self.kind = sniff(self.head)
+            if self.kind is None:
+                self.reject(NOT_AN_IMAGE)
+                return None
+            self.writer = self.storage.writer(self.kind[0])
+            raw_data, self.head = self.head, b''
+        self.writer.write(raw_data)
+        return None
+
+    def file_complete(self, file_size):
+        if not self.active:
+            return None
+        self.active = False
+        if self.writer is None and not self.error and self.size:
+            # shorter than a signature
+            self.reject(NOT_AN_IMAGE)
+        if self.error or not self.size:
+            return RejectedPhoto(self.error, self.file_name, self.content_type, self.size)
+        stored_name = self.writer.commit()
+        self.writer = None
+        return StoredPhoto(stored_name, self.file_name, self.kind[1], self.size)
+
+    def upload_interrupted(self):
+        if self.active and self.writer is not None:
+            self.writer.abort()
+            self.writer = None
@@ -2,23 +2,35 @@ from django.shortcuts import render, redirect
 from django.contrib import messages
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth import authenticate, login, logout
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
 from .forms import RegistrationForm
+from .uploads import PhotoUploadHandler
 
 # Create your views here.
 
+@csrf_exempt
 def signup(request):
+    # handlers must be in place before anything reads the body, so the
+    # csrf check runs in _signup after this
+    request.upload_handlers.insert(0, PhotoUploadHandler(request))
+    return _signup(request)
+
+
+@csrf_protect
+def _signup(request):
     form = RegistrationForm()
     context = {
         'form': form
     }
     
     if request.method == 'POST':
-        filled_form = RegistrationForm(request.POST)
+        filled_form = RegistrationForm(request.POST, request.FILES)
         if filled_form.is_valid():
             filled_form.save()
             user = filled_form.cleaned_data.get('username')
             messages.success(request, 'Registration Successful' + user)
             return redirect('login')
+        context['form'] = filled_form
     
     return render(request, 'accounts/register.html', context)
 
@@ -28,16 +40,13 @@ def loginPage(request):
         username = request.POST.get('username')
         password = request.POST.get('password')
 
-        print(request.POST.get('username'))
-
+        # a saturated hashing pool is answered by register.middleware
         user = authenticate(request, username=username, password=password)
 
         if user is not None:
             messages.success(request, 'Login Successful')
             login(request, user)
             return redirect('discuss')
-        else:
-            print("Nothing logged in")
     return render(request, 'accounts/login.html')
 
 
@@ -43,6 +43,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'wisdompets.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -124,4 +125,13 @@ STATIC_URL = '/static/'
 
 STATICFILES_DIRS = [
     os.path.join(BASE_DIR, 'static')
-]
\ No newline at end of file
+]
+
+# every worker process records request metrics into its own file here,
+# served summed up at /metrics, empty it when the server starts
+METRICS_DIR = os.path.join(BASE_DIR, '.metrics')
+# /metrics answers the peer addresses listed here, such as the Prometheus
+# server's, and requests with an `Authorization: Bearer <METRICS_TOKEN>`
+# header, everyone else gets a 404
+METRICS_ALLOWED_IPS = []
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
\ No newline at end of file
@@ -17,9 +17,11 @@ from django.contrib import admin
 from django.urls import path
 
 from adoptions import views
+from .metrics import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', views.home, name='home'),
-    path('adoptions/<int:pet_id>/', views.pet_detail, name='pet_detail')
+    path('adoptions/<int:pet_id>/', views.pet_detail, name='pet_detail'),
+    path('metrics', metrics_view, name='metrics'),
 ]